@@ -7,9 +7,13 @@ from typing import Dict, Optional, Self
 
 from .get_company_summary_benchmark import GetCompanySummaryBenchmark
 from .get_statistics import GetStatisticsBenchmark
+from .query_offers_first_page_benchmark import QueryOffersFirstPageBenchmark
 from .query_offers_sorted_by_activation_date_benchmark import (
     QueryOffersSortedByActivationDateBenchmark,
 )
+from .register_hours_worked_benchmark import RegisterHoursWorkedBenchmark
+from .render_line_plot_benchmark import RenderLinePlotBenchmark
+from .resolve_flask_view_benchmark import ResolveFlaskViewBenchmark
 from .runner import BenchmarkCatalog, BenchmarkResult, render_results_as_json
 from .show_prd_account_details_benchmark import ShowPrdAccountDetailsBenchmark
 from .show_r_account_details_benchmark import ShowRAccountDetailsBenchmark
@@ -27,6 +31,10 @@ def build_benchmark_catalog() -> BenchmarkCatalog:
         "query_offers_sorted_by_activation_date",
         QueryOffersSortedByActivationDateBenchmark,
     )
+    catalog.register_benchmark("query_offers_first_page", QueryOffersFirstPageBenchmark)
+    catalog.register_benchmark("register_hours_worked", RegisterHoursWorkedBenchmark)
+    catalog.register_benchmark("resolve_flask_view", ResolveFlaskViewBenchmark)
+    catalog.register_benchmark("render_line_plot", RenderLinePlotBenchmark)
     return catalog
 
 
@@ -0,0 +1,41 @@
+from dev.benchmark.dependency_injection import benchmark_injector
+from tests.data_generators import BasicServiceGenerator, PlanGenerator
+from tests.db.base_test_case import reset_test_db
+from workers_control.core.interactors import query_offers
+from workers_control.db.db import Database
+
+
+class QueryOffersFirstPageBenchmark:
+    """This benchmark measures the performance of the query_offers
+    interactor when only the first page of 15 offers out of 1000 plans
+    and 500 basic services is requested.
+    """
+
+    def __init__(self) -> None:
+        self.injector = benchmark_injector
+        reset_test_db()
+        self.db = self.injector.get(Database)
+
+        plan_generator = self.injector.get(PlanGenerator)
+        basic_service_generator = self.injector.get(BasicServiceGenerator)
+        self.query_offers = self.injector.get(query_offers.QueryOffersInteractor)
+        for _ in range(1000):
+            plan_generator.create_plan()
+        for _ in range(500):
+            basic_service_generator.create_basic_service()
+        self.request = query_offers.QueryOffersRequest(
+            query_string=None,
+            filter_category=query_offers.OfferFilter.by_offer_name,
+            sorting_category=query_offers.OfferSorting.by_activation,
+            include_expired_plans=False,
+            include_basic_services=True,
+            limit=15,
+            offset=0,
+        )
+        self.db.session.flush()
+
+    def tear_down(self) -> None:
+        self.db.session.remove()
+
+    def run(self) -> None:
+        self.query_offers.execute(self.request)
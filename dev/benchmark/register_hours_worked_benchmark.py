@@ -0,0 +1,55 @@
+from decimal import Decimal
+
+from dev.benchmark.dependency_injection import benchmark_injector
+from tests.data_generators import (
+    CompanyGenerator,
+    ConsumptionGenerator,
+    MemberGenerator,
+    PlanGenerator,
+)
+from tests.db.base_test_case import reset_test_db
+from workers_control.core.interactors import register_hours_worked
+from workers_control.db.db import Database
+
+
+class RegisterHoursWorkedBenchmark:
+    """This benchmark measures the performance of the
+    register_hours_worked interactor, which calculates the payout
+    factor, with 1000 approved plans and 1000 consumptions of basic
+    services.
+    """
+
+    def __init__(self) -> None:
+        self.injector = benchmark_injector
+        reset_test_db()
+        self.db = self.injector.get(Database)
+
+        plan_generator = self.injector.get(PlanGenerator)
+        consumption_generator = self.injector.get(ConsumptionGenerator)
+        self.register_hours_worked = self.injector.get(
+            register_hours_worked.RegisterHoursWorkedInteractor
+        )
+        for _ in range(500):
+            plan_generator.create_plan(is_public_service=True)
+        for _ in range(500):
+            plan_generator.create_plan(is_public_service=False)
+        for _ in range(1000):
+            consumption_generator.create_private_consumption_of_basic_service()
+        self.worker = self.injector.get(MemberGenerator).create_member()
+        self.company = self.injector.get(CompanyGenerator).create_company(
+            workers=[self.worker]
+        )
+        self.db.session.flush()
+
+    def tear_down(self) -> None:
+        self.db.session.remove()
+
+    def run(self) -> None:
+        response = self.register_hours_worked.execute(
+            register_hours_worked.RegisterHoursWorkedRequest(
+                company_id=self.company,
+                worker_id=self.worker,
+                hours_worked=Decimal(8),
+            )
+        )
+        assert not response.is_rejected
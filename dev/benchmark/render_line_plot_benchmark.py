@@ -0,0 +1,33 @@
+from datetime import UTC, datetime, timedelta
+from decimal import Decimal
+
+from tests.flask_integration.dependency_injection import FlaskTestConfiguration
+from workers_control.flask import create_app
+from workers_control.flask.dependency_injection import get_dependency_injector
+from workers_control.flask.plotter import GeneralPlotter
+
+
+class RenderLinePlotBenchmark:
+    """This benchmark measures rendering the line plot of an account
+    with 1,000,000 transfers, which is downsampled to the configured
+    maximum number of points before it is drawn.
+    """
+
+    def __init__(self) -> None:
+        self.app = create_app(dev_or_test_config=FlaskTestConfiguration.default())
+        self.request_context = self.app.test_request_context()
+        self.request_context.push()
+        start = datetime(2020, 1, 1, tzinfo=UTC)
+        self.timestamps = [start + timedelta(minutes=n) for n in range(1_000_000)]
+        volume = Decimal(0)
+        self.accumulated_volumes = []
+        for n in range(1_000_000):
+            volume += Decimal((n * 7919) % 201 - 100)
+            self.accumulated_volumes.append(volume)
+
+    def tear_down(self) -> None:
+        self.request_context.pop()
+
+    def run(self) -> None:
+        plotter = get_dependency_injector().get(GeneralPlotter)
+        plotter.create_line_plot(x=self.timestamps, y=self.accumulated_volumes)
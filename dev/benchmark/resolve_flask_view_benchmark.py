@@ -0,0 +1,23 @@
+from tests.flask_integration.dependency_injection import FlaskTestConfiguration
+from workers_control.flask import create_app
+from workers_control.flask.dependency_injection import get_dependency_injector
+from workers_control.flask.views.list_transfers import ListTransfersView
+
+
+class ResolveFlaskViewBenchmark:
+    """This benchmark measures the dependency injection overhead of
+    dispatching a request to a view, by resolving the transfer listing
+    view with all its dependencies 100 times.
+    """
+
+    def __init__(self) -> None:
+        self.app = create_app(dev_or_test_config=FlaskTestConfiguration.default())
+        self.request_context = self.app.test_request_context()
+        self.request_context.push()
+
+    def tear_down(self) -> None:
+        self.request_context.pop()
+
+    def run(self) -> None:
+        for _ in range(100):
+            get_dependency_injector().get(ListTransfersView)
@@ -12,10 +12,16 @@ from workers_control.core.injector import (
 )
 from workers_control.core.records import SocialAccounting
 from workers_control.core.repositories import DatabaseGateway
-from workers_control.core.services.payout_factor import PayoutFactorConfig
+from workers_control.core.services.payout_factor import (
+    PayoutFactorConfig,
+    PayoutFactorInputsCache,
+)
 from workers_control.db import get_social_accounting
 from workers_control.db.db import Database
-from workers_control.db.repositories import DatabaseGatewayImpl
+from workers_control.db.repositories import (
+    DatabaseGatewayImpl,
+    PayoutFactorInputsCacheImpl,
+)
 from workers_control.flask.payout_factor import PayoutFactorConfigImpl
 
 from . import development_server
@@ -29,6 +35,7 @@ class DatabaseDevModule(Module):
         )
         binder[DatabaseGateway] = AliasProvider(DatabaseGatewayImpl)
         binder[SocialAccounting] = CallableProvider(get_social_accounting)
+        binder[PayoutFactorInputsCache] = AliasProvider(PayoutFactorInputsCacheImpl)
 
     @staticmethod
     def provide_dev_database() -> Database:
@@ -42,6 +42,7 @@ class FlaskDevConfiguration:
     MAIL_PLUGIN = "dev.email:DebugMailService"
     MAIL_SENDER_PLUGIN = "dev.email:DebugMailSender"
     MAIL_ENCRYPTION_TYPE = "tls"
+    MAIL_MAX_MESSAGES_PER_CONNECTION = 100
 
     FLASK_PROFILER = {
         "enabled": True,
@@ -55,6 +56,12 @@ class FlaskDevConfiguration:
     LANGUAGES = {"en": "English", "de": "Deutsch", "es": "Español"}
     DEFAULT_USER_TIMEZONE = os.environ.get("DEFAULT_USER_TIMEZONE", "UTC")
     PAYOUT_FACTOR_CALCULATION_WINDOW = 180
+    LINE_PLOT_MAX_POINTS = 2000
+    PLOT_CACHE_SIZE = 256
+    PLOT_CACHE_DIRECTORY = ""
+    PLOT_CACHE_DIRECTORY_SIZE = 10000
+    PLOT_RENDERING_PROCESSES = 0
+    PLOT_RENDERING_TIMEOUT = 30
 
     SECURITY_PASSWORD_SALT = "dev password salt"
     SECRET_KEY = os.environ.get("DEV_SECRET_KEY", "dev secret key")
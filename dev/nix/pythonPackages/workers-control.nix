@@ -14,6 +14,7 @@
   flask-login,
   flask-wtf,
   matplotlib,
+  numpy,
   parameterized,
   pytest,
   setuptools,
@@ -55,6 +56,7 @@ buildPythonPackage {
     flask-login
     flask-wtf
     matplotlib
+    numpy
   ];
   buildDocsPhase = ''
     mkdir -p $doc/share/doc/workers-control
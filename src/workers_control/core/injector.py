@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import inspect
+from enum import Enum, auto
+from functools import cache
 from typing import (
     Any,
     Callable,
@@ -10,6 +12,7 @@ from typing import (
     List,
     Optional,
     Protocol,
+    Tuple,
     Type,
     TypeVar,
     get_type_hints,
@@ -21,6 +24,32 @@ T_cov = TypeVar("T_cov", covariant=True)
 CallableT = TypeVar("CallableT", bound=Callable)
 TypeT = TypeVar("TypeT", bound=Type)
 ProviderFunction = Callable[[Type[T]], "Provider[T]"]
+Factory = Callable[[], T]
+
+
+class Scope(Enum):
+    """How long an instance provided by dependency injection is reused.
+    Transient instances are created every time they are requested,
+    request scoped instances once per request and application scoped
+    instances (singletons) once per injector.
+    """
+
+    transient = auto()
+    request = auto()
+    application = auto()
+
+
+class RequestScope(Protocol):
+    def get_instances(self) -> Optional[Dict[Type, Any]]:
+        """Return the storage for the instances of the current request,
+        or None outside of a request. Request scoped instances are
+        transient outside of requests.
+        """
+
+
+class NoRequestScope:
+    def get_instances(self) -> Optional[Dict[Type, Any]]:
+        return None
 
 
 class Injector:
@@ -42,8 +71,7 @@ class Injector:
         return ClassProvider(cls)
 
     def get(self, cls: Type[T]) -> T:
-        provider = self.binder.get(cls)
-        return provider.provide(self.binder)
+        return self.binder.get_factory(cls)()
 
     def call_with_injection(
         self,
@@ -55,15 +83,10 @@ class Injector:
             args = []
         if kwargs is None:
             kwargs = {}
-        signature = inspect.signature(f)
-        bound_arguments = signature.bind_partial(*args)
+        bound_arguments = _get_signature(f).bind_partial(*args)
         dependencies = dict()
-        for key, value in get_type_hints(f).items():
-            if (
-                key != "return"
-                and key not in bound_arguments.arguments
-                and key not in kwargs
-            ):
+        for key, value in _get_dependencies(f):
+            if key not in bound_arguments.arguments and key not in kwargs:
                 dependencies[key] = self.get(value)
         dependencies.update(kwargs)
         return f(*bound_arguments.arguments.values(), **dependencies)
@@ -77,18 +100,21 @@ class Binder:
         self._default = default
         self._bindings: Dict[Type, Provider] = dict()
         self._instances: Dict[Type, Any] = dict()
+        self._factories: Dict[Type, Factory] = dict()
+        self.request_scope: RequestScope = NoRequestScope()
 
     def __getitem__(self, key: Type[T]) -> Provider[T]:
         return self._bindings[key]
 
     def __setitem__(self, key: Type[T], value: Provider[T]) -> None:
         self._bindings[key] = value
+        self._factories.clear()
 
     def __contains__(self, key: Type[T]) -> bool:
         return key in self._bindings
 
     def bind(self, cls: Type[T], to: Provider[T]) -> None:
-        self._bindings[cls] = to
+        self[cls] = to
 
     def get(self, cls: Type[T]) -> Provider[T]:
         if cls not in self:
@@ -96,10 +122,27 @@ class Binder:
         else:
             return self[cls]
 
+    def get_factory(self, cls: Type[T]) -> Factory[T]:
+        """Return a function that creates instances of `cls`. The
+        factory is compiled from the providers of `cls` and all its
+        dependencies the first time it is requested and reused until
+        the bindings change.
+        """
+        factory = self._factories.get(cls)
+        if factory is None:
+            factory = self.get(cls).compile(self)
+            self._factories[cls] = factory
+        return factory
+
 
 class Provider(Protocol, Generic[T_cov]):
     def provide(self, binder: Binder) -> T_cov: ...
 
+    def compile(self, binder: Binder) -> Factory[T_cov]:
+        """Return a function that provides instances without looking
+        up the bindings again.
+        """
+
 
 class AliasProvider(Generic[T]):
     """This provider provides instances by simply refering to another
@@ -114,6 +157,9 @@ class AliasProvider(Generic[T]):
         provider = binder.get(self.cls)
         return provider.provide(binder)
 
+    def compile(self, binder: Binder) -> Factory[T]:
+        return binder.get_factory(self.cls)
+
 
 class InstanceProvider(Provider[T]):
     """Provide an instance of of a class by specifying the concrete
@@ -126,6 +172,10 @@ class InstanceProvider(Provider[T]):
     def provide(self, binder: Binder) -> T:
         return self.instance
 
+    def compile(self, binder: Binder) -> Factory[T]:
+        instance = self.instance
+        return lambda: instance
+
 
 class ClassProvider(Provider[T]):
     """Provide an instance of a type by calling its constructor
@@ -137,27 +187,34 @@ class ClassProvider(Provider[T]):
     specified.
     """
 
-    def __init__(self, cls: Type[T]) -> None:
+    def __init__(self, cls: Type[T], scope: Optional[Scope] = None) -> None:
         self.cls = cls
+        self._scope = scope
 
     def provide(self, binder: Binder) -> T:
-        if self.is_singleton:
-            instance = binder._instances.get(self.cls)
-            if instance is not None:
-                return instance
-        args = get_type_hints(self.cls.__init__)
-        kwargs = dict()
-        for name, annotation in args.items():
-            if name == "return":
-                continue
-            kwargs[name] = binder.get(annotation).provide(binder)
-        try:
-            instance = self.cls(**kwargs)
-        except TypeError as e:
-            raise TypeError(f"Could not create instance of class {self.cls}") from e
-        if self.is_singleton:
-            binder._instances[self.cls] = instance
-        return instance
+        return self.compile(binder)()
+
+    def compile(self, binder: Binder) -> Factory[T]:
+        cls = self.cls
+        dependencies = [
+            (name, binder.get_factory(annotation))
+            for name, annotation in _get_dependencies(cls.__init__)
+        ]
+
+        def create() -> T:
+            kwargs = {name: factory() for name, factory in dependencies}
+            try:
+                return cls(**kwargs)
+            except TypeError as e:
+                raise TypeError(f"Could not create instance of class {cls}") from e
+
+        return _in_scope(binder, self.scope, cls, create)
+
+    @property
+    def scope(self) -> Scope:
+        if self._scope is not None:
+            return self._scope
+        return Scope.application if self.is_singleton else Scope.transient
 
     @property
     def is_singleton(self) -> bool:
@@ -169,25 +226,33 @@ class CallableProvider(Provider[T]):
     the function will be provide by dependency injection.
     """
 
-    def __init__(self, f: Callable[..., T], is_singleton: bool = False) -> None:
+    def __init__(
+        self,
+        f: Callable[..., T],
+        is_singleton: bool = False,
+        scope: Optional[Scope] = None,
+    ) -> None:
         self.f = f
-        self._is_singleton = is_singleton
+        if scope is None:
+            scope = Scope.application if is_singleton else Scope.transient
+        self.scope = scope
 
     def provide(self, binder: Binder) -> T:
-        if self._is_singleton:
-            instance = binder._instances.get(self.return_type)
-            if instance:
-                return instance
-        args = get_type_hints(self.f)
-        kwargs = dict()
-        for name, annotation in args.items():
-            if name == "return":
-                continue
-            kwargs[name] = binder.get(annotation).provide(binder)
-        instance = self.f(**kwargs)
-        if self._is_singleton:
-            binder._instances[self.return_type] = instance
-        return instance
+        return self.compile(binder)()
+
+    def compile(self, binder: Binder) -> Factory[T]:
+        f = self.f
+        dependencies = [
+            (name, binder.get_factory(annotation))
+            for name, annotation in _get_dependencies(f)
+        ]
+
+        def create() -> T:
+            return f(**{name: factory() for name, factory in dependencies})
+
+        if self.scope is Scope.transient:
+            return create
+        return _in_scope(binder, self.scope, self.return_type, create)
 
     @property
     def return_type(self) -> Type:
@@ -203,3 +268,48 @@ class Module:
 def singleton(cls: TypeT) -> TypeT:
     cls._injection_singleton = True
     return cls
+
+
+def _in_scope(
+    binder: Binder, scope: Scope, key: Type, create: Factory[T]
+) -> Factory[T]:
+    def provide_singleton() -> T:
+        instance = binder._instances.get(key)
+        if instance is None:
+            instance = binder._instances[key] = create()
+        return instance
+
+    def provide_request_scoped() -> T:
+        instances = binder.request_scope.get_instances()
+        if instances is None:
+            return create()
+        instance = instances.get(key)
+        if instance is None:
+            instance = instances[key] = create()
+        return instance
+
+    match scope:
+        case Scope.application:
+            return provide_singleton
+        case Scope.request:
+            return provide_request_scoped
+        case Scope.transient:
+            return create
+
+
+@cache
+def _get_signature(f: Callable) -> inspect.Signature:
+    return inspect.signature(f)
+
+
+@cache
+def _get_dependencies(f: Callable) -> Tuple[Tuple[str, Any], ...]:
+    """The annotated parameters of `f`, in order. Type hints are
+    resolved once per function since resolving them evaluates every
+    annotation.
+    """
+    return tuple(
+        (name, annotation)
+        for name, annotation in get_type_hints(f).items()
+        if name != "return"
+    )
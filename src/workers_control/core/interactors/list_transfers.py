@@ -1,21 +1,25 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
 from decimal import Decimal
 from enum import Enum
-from typing import Optional, TypeVar
+from typing import Iterable, Optional
 from uuid import UUID
 
 from workers_control.core.records import (
     AccountOwner,
     Company,
+    Cursor,
     Member,
     SocialAccounting,
+    Transfer,
+)
+from workers_control.core.repositories import (
+    CountStrategy,
+    DatabaseGateway,
+    TransferResult,
 )
-from workers_control.core.repositories import DatabaseGateway, QueryResult
 from workers_control.core.transfers import TransferType
 
-QueryT = TypeVar("QueryT", bound=QueryResult)
-
 
 class AccountOwnerType(Enum):
     member = "member"
@@ -26,8 +30,19 @@ class AccountOwnerType(Enum):
 
 @dataclass
 class Request:
+    """Transfers are listed with the newest transfer first. Pages can
+    be selected by offset or, in constant time regardless of how deep
+    the page is, by the cursor of a neighbouring page. The offset is
+    ignored if a cursor is given.
+    """
+
     limit: Optional[int]
     offset: Optional[int]
+    older_than: Optional[Cursor] = None
+    newer_than: Optional[Cursor] = None
+    neighbouring_pages: int = 1
+    """Number of pages on each side of the requested page that are
+    looked up and returned as cursors."""
 
 
 @dataclass
@@ -49,6 +64,18 @@ class TransferEntry:
 class Response:
     total_results: int
     transfers: list[TransferEntry]
+    previous_page: Optional[Cursor] = None
+    """Pass as newer_than to get the preceding page, None on the first
+    page."""
+    next_page: Optional[Cursor] = None
+    """Pass as older_than to get the following page, None on the last
+    page."""
+    preceding_pages: list[Cursor] = field(default_factory=list)
+    """Pass as newer_than to get the preceding pages that exist, nearest
+    first."""
+    following_pages: list[Cursor] = field(default_factory=list)
+    """Pass as older_than to get the following pages that exist, nearest
+    first."""
 
 
 @dataclass
@@ -56,10 +83,46 @@ class ListTransfersInteractor:
     database_gateway: DatabaseGateway
 
     def list_transfers(self, request: Request) -> Response:
-        transfers = self.database_gateway.get_transfers().ordered_by_date(
-            ascending=False
+        total_results = self.database_gateway.get_transfers().count(
+            CountStrategy.estimated
+        )
+        transfers = self.database_gateway.get_transfers()
+        is_paging_backwards = False
+        if request.older_than is not None:
+            transfers = transfers.before(request.older_than).ordered_by_date(
+                ascending=False
+            )
+        elif request.newer_than is not None:
+            transfers = transfers.after(request.newer_than).ordered_by_date(
+                ascending=True
+            )
+            is_paging_backwards = True
+        else:
+            transfers = transfers.ordered_by_date(ascending=False)
+            if request.offset:
+                transfers = transfers.offset(n=request.offset)
+        rows = list(self._fetch_pages_ahead(transfers, request))
+        pages_ahead = self._get_cursors_of_pages_ahead(
+            [transfer for transfer, _, _ in rows], request
+        )
+        rows = rows[: request.limit]
+        is_first_page = (
+            request.older_than is None
+            and request.newer_than is None
+            and not request.offset
         )
-        total_results = len(transfers)
+        pages_behind = (
+            []
+            if is_first_page or not rows
+            else self._get_cursors_of_pages_behind(
+                rows[0][0], request, is_paging_backwards
+            )
+        )
+        if is_paging_backwards:
+            rows.reverse()
+            preceding_pages, following_pages = pages_ahead, pages_behind
+        else:
+            preceding_pages, following_pages = pages_behind, pages_ahead
         return Response(
             total_results=total_results,
             transfers=[
@@ -82,13 +145,56 @@ class ListTransfersInteractor:
                     value=transfer.value,
                     transfer_type=transfer.type,
                 )
-                for transfer, debtor, creditor in _limit_results(
-                    transfers.joined_with_debtor_and_creditor(),
-                    limit=request.limit,
-                    offset=request.offset,
-                )
+                for transfer, debtor, creditor in rows
             ],
+            previous_page=preceding_pages[0] if preceding_pages else None,
+            next_page=following_pages[0] if following_pages else None,
+            preceding_pages=preceding_pages,
+            following_pages=following_pages,
+        )
+
+    def _fetch_pages_ahead(
+        self, transfers: TransferResult, request: Request
+    ) -> Iterable[tuple[Transfer, AccountOwner, AccountOwner]]:
+        # The rows of the pages following in the direction of the query
+        # tell which of them exist.
+        joined = transfers.joined_with_debtor_and_creditor()
+        if request.limit is not None:
+            joined = joined.limit(n=request.limit * (request.neighbouring_pages + 1))
+        return joined
+
+    def _get_cursors_of_pages_ahead(
+        self, transfers: list[Transfer], request: Request
+    ) -> list[Cursor]:
+        if request.limit is None:
+            return []
+        return [
+            _cursor_of(transfers[request.limit * n - 1])
+            for n in range(1, request.neighbouring_pages + 1)
+            if len(transfers) > request.limit * n
+        ]
+
+    def _get_cursors_of_pages_behind(
+        self, first_transfer: Transfer, request: Request, is_paging_backwards: bool
+    ) -> list[Cursor]:
+        # The pages behind the first transfer of the page in the
+        # direction of the query are looked up in the opposite direction.
+        if request.limit is None or not request.neighbouring_pages:
+            return []
+        cursor = _cursor_of(first_transfer)
+        transfers = self.database_gateway.get_transfers()
+        if is_paging_backwards:
+            transfers = transfers.before(cursor).ordered_by_date(ascending=False)
+        else:
+            transfers = transfers.after(cursor).ordered_by_date(ascending=True)
+        boundaries = [first_transfer] + list(
+            transfers.limit(n=request.limit * request.neighbouring_pages)
         )
+        return [
+            _cursor_of(boundaries[request.limit * (n - 1)])
+            for n in range(1, request.neighbouring_pages + 1)
+            if len(boundaries) > request.limit * (n - 1) + 1
+        ]
 
     def _get_account_owner_name(self, account_owner: AccountOwner) -> str | None:
         if isinstance(account_owner, Member):
@@ -108,11 +214,5 @@ class ListTransfersInteractor:
             return AccountOwnerType.cooperation
 
 
-def _limit_results(
-    transfers: QueryT, *, limit: Optional[int] = None, offset: Optional[int] = None
-) -> QueryT:
-    if offset is not None:
-        transfers = transfers.offset(n=offset)
-    if limit is not None:
-        transfers = transfers.limit(n=limit)
-    return transfers
+def _cursor_of(transfer: Transfer) -> Cursor:
+    return Cursor(date=transfer.date, id=transfer.id)
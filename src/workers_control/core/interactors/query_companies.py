@@ -8,6 +8,7 @@ from uuid import UUID
 from workers_control.core.records import Company, EmailAddress
 from workers_control.core.repositories import (
     CompanyResult,
+    CountStrategy,
     DatabaseGateway,
     QueryResult,
 )
@@ -51,7 +52,7 @@ class QueryCompaniesInteractor:
         query = request.query_string
         filter_by = request.filter_category
         companies = _filter_companies(self.database.get_companies(), query, filter_by)
-        total_results = len(companies)
+        total_results = companies.count(CountStrategy.cached)
         results = [
             self._create_response_model(company, mail)
             for company, mail in _limit_results(
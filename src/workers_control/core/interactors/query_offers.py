@@ -4,14 +4,16 @@ import enum
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Callable, List, Optional
+from typing import List, Optional
 from uuid import UUID
 
 from workers_control.core import records
 from workers_control.core.datetime_service import DatetimeService
 from workers_control.core.repositories import (
     BasicServiceResult,
+    CountStrategy,
     DatabaseGateway,
+    OfferResult,
     PlanResult,
 )
 from workers_control.core.services.price_calculator import PriceCalculator
@@ -67,58 +69,66 @@ class QueryOffersInteractor:
     price_calculator: PriceCalculator
 
     def execute(self, request: QueryOffersRequest) -> OfferQueryResponse:
-        plan_offers, plan_total = self._query_plans(request)
+        plans = self._query_plans(request)
         if request.include_basic_services:
-            bs_offers, bs_total = self._query_basic_services(request)
+            basic_services: Optional[BasicServiceResult] = self._query_basic_services(
+                request
+            )
         else:
-            bs_offers, bs_total = [], 0
-        merged = plan_offers + bs_offers
-        merged.sort(key=self._sort_key(request.sorting_category))
-        offset = request.offset or 0
-        end = offset + request.limit if request.limit is not None else len(merged)
-        merged = merged[offset:end]
+            basic_services = None
+        offers = self.database_gateway.get_offers(plans, basic_services)
+        total_results = offers.count(CountStrategy.cached)
+        offers = self._apply_offer_sorting(offers, request.sorting_category)
+        if request.offset:
+            offers = offers.offset(request.offset)
+        if request.limit is not None:
+            offers = offers.limit(request.limit)
         return OfferQueryResponse(
-            results=merged,
-            total_results=plan_total + bs_total,
+            results=self._get_queried_offers(list(offers)),
+            total_results=total_results,
             request=request,
         )
 
-    def _query_plans(
-        self, request: QueryOffersRequest
-    ) -> tuple[list[QueriedOffer], int]:
+    def _query_plans(self, request: QueryOffersRequest) -> PlanResult:
         now = self.datetime_service.now()
         plans = self.database_gateway.get_plans().that_were_approved_before(now)
         if not request.include_expired_plans:
             plans = plans.that_will_expire_after(now)
-        plans = self._apply_plan_filter(
+        return self._apply_plan_filter(
             plans, request.query_string, request.filter_category
         )
-        total = len(plans)
-        plans = self._apply_plan_sorting(plans, request.sorting_category)
-        joined = plans.joined_with_planner_and_cooperation()
-        results = [
-            self._plan_to_offer(plan, planner, cooperation)
-            for plan, planner, cooperation in joined
-        ]
-        return results, total
-
-    def _query_basic_services(
-        self, request: QueryOffersRequest
-    ) -> tuple[list[QueriedOffer], int]:
+
+    def _query_basic_services(self, request: QueryOffersRequest) -> BasicServiceResult:
         basic_services = self.database_gateway.get_basic_services().that_are_active()
-        basic_services = self._apply_basic_service_filter(
+        return self._apply_basic_service_filter(
             basic_services, request.query_string, request.filter_category
         )
-        total = len(basic_services)
-        basic_services = self._apply_basic_service_sorting(
-            basic_services, request.sorting_category
-        )
-        joined = basic_services.joined_with_provider()
-        results = [
-            self._basic_service_to_offer(basic_service, provider)
-            for basic_service, provider in joined
-        ]
-        return results, total
+
+    def _get_queried_offers(self, offers: list[records.Offer]) -> list[QueriedOffer]:
+        """Load the details of the offers on the requested page only."""
+        plan_ids = [offer.id for offer in offers if not offer.is_basic_service]
+        basic_service_ids = [offer.id for offer in offers if offer.is_basic_service]
+        queried_offers: dict[UUID, QueriedOffer] = dict()
+        if plan_ids:
+            prices = self.price_calculator.calculate_prices(plan_ids)
+            for plan, planner, cooperation in (
+                self.database_gateway.get_plans()
+                .with_id(*plan_ids)
+                .joined_with_planner_and_cooperation()
+            ):
+                queried_offers[plan.id] = self._plan_to_offer(
+                    plan, planner, cooperation, prices[plan.id]
+                )
+        if basic_service_ids:
+            for basic_service, provider in (
+                self.database_gateway.get_basic_services()
+                .with_id(*basic_service_ids)
+                .joined_with_provider()
+            ):
+                queried_offers[basic_service.id] = self._basic_service_to_offer(
+                    basic_service, provider
+                )
+        return [queried_offers[offer.id] for offer in offers]
 
     def _apply_plan_filter(
         self, plans: PlanResult, query: Optional[str], filter_by: OfferFilter
@@ -129,13 +139,6 @@ class QueryOffersInteractor:
             return plans.with_id_containing(query)
         return plans.with_product_name_containing(query)
 
-    def _apply_plan_sorting(
-        self, plans: PlanResult, sort_by: OfferSorting
-    ) -> PlanResult:
-        if sort_by == OfferSorting.by_provider_name:
-            return plans.ordered_by_planner_name()
-        return plans.ordered_by_approval_date(ascending=False)
-
     def _apply_basic_service_filter(
         self,
         basic_services: BasicServiceResult,
@@ -148,27 +151,20 @@ class QueryOffersInteractor:
             return basic_services.with_id_containing(query)
         return basic_services.with_name_containing(query)
 
-    def _apply_basic_service_sorting(
-        self,
-        basic_services: BasicServiceResult,
-        sort_by: OfferSorting,
-    ) -> BasicServiceResult:
-        if sort_by == OfferSorting.by_provider_name:
-            return basic_services.ordered_by_provider_name()
-        return basic_services.ordered_by_creation_date(ascending=False)
-
-    def _sort_key(self, sort_by: OfferSorting) -> Callable[[QueriedOffer], Any]:
+    def _apply_offer_sorting(
+        self, offers: OfferResult, sort_by: OfferSorting
+    ) -> OfferResult:
         if sort_by == OfferSorting.by_provider_name:
-            return lambda offer: offer.provider_name.lower()
-        return lambda offer: -offer.created_or_approved_on.timestamp()
+            return offers.ordered_by_provider_name()
+        return offers.ordered_by_activation_date(ascending=False)
 
     def _plan_to_offer(
         self,
         plan: records.Plan,
         planner: records.Company,
         cooperation: Optional[records.Cooperation],
+        price_per_unit: Decimal,
     ) -> QueriedOffer:
-        price_per_unit = self.price_calculator.calculate_price(plan.id)
         assert plan.approval_date
         return QueriedOffer(
             id=plan.id,
@@ -2,12 +2,12 @@ from dataclasses import dataclass
 from decimal import Decimal
 from uuid import UUID
 
+from workers_control.core.records import Cursor
 from workers_control.core.repositories import DatabaseGateway
 from workers_control.core.services.account_details import (
     AccountDetailsService,
     AccountTransfer,
     PlotDetails,
-    construct_plot_data,
 )
 
 
@@ -21,7 +21,6 @@ class Response:
     company_id: UUID
     transfers: list[AccountTransfer]
     account_balance: Decimal
-    plot: PlotDetails
 
 
 @dataclass
@@ -39,5 +38,18 @@ class ShowRAccountDetailsInteractor:
             company_id=request.company,
             transfers=sorted(transfers, key=lambda t: t.date, reverse=True),
             account_balance=account_balance,
-            plot=construct_plot_data(transfers),
+        )
+
+    def get_plot_details(self, request: Request) -> PlotDetails:
+        company = self.database.get_companies().with_id(request.company).first()
+        assert company
+        return self.account_details_service.get_plot_details(
+            company.raw_material_account
+        )
+
+    def get_last_transfer(self, request: Request) -> Cursor | None:
+        company = self.database.get_companies().with_id(request.company).first()
+        assert company
+        return self.account_details_service.get_last_transfer(
+            company.raw_material_account
         )
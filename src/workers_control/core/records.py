@@ -275,6 +275,16 @@ class Transfer:
         return hash(self.id)
 
 
+@dataclass(frozen=True)
+class Cursor:
+    """Position of a row in a result set that is ordered by date and
+    id.
+    """
+
+    date: datetime
+    id: UUID
+
+
 @dataclass
 class CompanyWorkInvite:
     id: UUID
@@ -359,6 +369,14 @@ class BasicService:
     deactivated_on: Optional[datetime] = None
 
 
+@dataclass(frozen=True)
+class Offer:
+    """Identifies either an approved plan or a basic service."""
+
+    id: UUID
+    is_basic_service: bool
+
+
 @dataclass
 class RegisteredHoursWorked:
     id: UUID
@@ -377,3 +395,4 @@ class Email:
     sender: str
     subject: str
     html: str
+    retry_count: int = 0
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 from decimal import Decimal
+from enum import Enum
 from typing import Generic, Iterable, Iterator, Optional, Protocol, Self, Tuple, TypeVar
 from uuid import UUID
 
@@ -11,6 +12,15 @@ from workers_control.core.transfers import TransferType
 T = TypeVar("T", covariant=True)
 
 
+class CountStrategy(Enum):
+    exact = "exact"
+    cached = "cached"
+    """Reuse the count of an equal query for a short while."""
+    estimated = "estimated"
+    """Estimate large counts from the statistics of the database where
+    available."""
+
+
 class QueryResult(Protocol, Generic[T]):
     def __iter__(self) -> Iterator[T]: ...
 
@@ -22,6 +32,11 @@ class QueryResult(Protocol, Generic[T]):
 
     def __len__(self) -> int: ...
 
+    def count(self, strategy: CountStrategy = ...) -> int:
+        """Count the results. Cached and estimated counts can be off
+        and are meant for display purposes like pagination only.
+        """
+
 
 class DatabaseUpdate(Protocol):
     def perform(self) -> int:
@@ -278,6 +293,14 @@ class PrivateConsumptionOfBasicServiceResult(
 ):
     def where_consumer_is_member(self, member: UUID) -> Self: ...
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        """Filter for consumptions whose transfer of consumption was
+        made at or after start and at or before end.
+        """
+
+    def get_total_value(self) -> Decimal:
+        """Sum up the values of the transfers of consumption."""
+
     def joined_with_transfer(
         self,
     ) -> QueryResult[
@@ -300,6 +323,14 @@ class ProductiveConsumptionOfBasicServiceResult(
 ):
     def where_consumer_is_company(self, company: UUID) -> Self: ...
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        """Filter for consumptions whose transfer of consumption was
+        made at or after start and at or before end.
+        """
+
+    def get_total_value(self) -> Decimal:
+        """Sum up the values of the transfers of consumption."""
+
     def joined_with_transfer(
         self,
     ) -> QueryResult[
@@ -419,7 +450,29 @@ class TransferResult(QueryResult[records.Transfer], Protocol):
         Tuple[records.Transfer, records.AccountOwner, records.AccountOwner]
     ]: ...
 
-    def ordered_by_date(self, *, ascending: bool = ...) -> Self: ...
+    def accumulated_volumes_of_account(
+        self, account: UUID
+    ) -> QueryResult[Tuple[datetime, Decimal]]:
+        """The date of every transfer from or to the account together
+        with the balance of the account right after it, ordered by date
+        and id. Only the transfers of this result are summed up.
+        """
+
+    def ordered_by_date(self, *, ascending: bool = ...) -> Self:
+        """Transfers made at the same time are ordered by their id, so
+        that the ordering is stable and can be used together with
+        after and before.
+        """
+
+    def after(self, cursor: records.Cursor) -> Self:
+        """Transfers that come after the cursor when ordered by date
+        and id in ascending order.
+        """
+
+    def before(self, cursor: records.Cursor) -> Self:
+        """Transfers that come before the cursor when ordered by date
+        and id in ascending order.
+        """
 
 
 class AccountResult(QueryResult[records.Account], Protocol):
@@ -437,6 +490,13 @@ class AccountResult(QueryResult[records.Account], Protocol):
 
     def joined_with_balance(self) -> QueryResult[Tuple[records.Account, Decimal]]: ...
 
+    def joined_with_last_transfer(
+        self,
+    ) -> QueryResult[Tuple[records.Account, Optional[records.Cursor]]]:
+        """The date and id of the transfer from or to each account that
+        was made last, or None for accounts without transfers.
+        """
+
 
 class CompanyWorkInviteResult(QueryResult[records.CompanyWorkInvite], Protocol):
     def issued_by(self, company: UUID) -> Self: ...
@@ -567,7 +627,7 @@ class RegisteredHoursWorkedResult(QueryResult[records.RegisteredHoursWorked], Pr
 
 
 class BasicServiceResult(QueryResult[records.BasicService], Protocol):
-    def with_id(self, id_: UUID) -> Self: ...
+    def with_id(self, *id_: UUID) -> Self: ...
 
     def of_provider(self, member: UUID) -> Self: ...
 
@@ -592,13 +652,47 @@ class BasicServiceUpdate(DatabaseUpdate, Protocol):
     def set_deactivated_on(self, deactivated_on: datetime) -> Self: ...
 
 
+class OfferResult(QueryResult[records.Offer], Protocol):
+    def ordered_by_activation_date(self, *, ascending: bool = ...) -> Self:
+        """Plans are ordered by their approval date and basic services
+        by their creation date.
+        """
+
+    def ordered_by_provider_name(self, *, ascending: bool = ...) -> Self:
+        """The ordering ignores the case of the provider names."""
+
+
 class EmailResult(QueryResult[records.Email], Protocol):
     def with_id(self, id_: UUID) -> Self: ...
 
     def that_have_not_been_sent(self) -> Self: ...
 
+    def that_are_due_at(self, timestamp: datetime) -> Self:
+        """Emails whose next attempt is scheduled exactly at `timestamp`
+        are included in the result. Dead letters are never due.
+        """
+
+    def that_are_dead_letters(self) -> Self: ...
+
+    def that_are_not_claimed_at(self, timestamp: datetime) -> Self:
+        """Emails whose claim expired exactly at `timestamp` are
+        included in the result.
+        """
+
     def ordered_by_creation_date(self, ascending: bool = ...) -> Self: ...
 
+    def ordered_by_next_attempt(self) -> Self:
+        """Emails with the same scheduled attempt are ordered by their
+        creation date.
+        """
+
+    def claim(self, *, until: datetime, limit: int) -> list[records.Email]:
+        """Claim the first `limit` emails of the result until the given
+        time and return them. Concurrent callers never claim the same
+        email, rows claimed by another transaction in the meantime are
+        skipped.
+        """
+
     def update(self) -> EmailUpdate: ...
 
 
@@ -609,6 +703,13 @@ class EmailUpdate(DatabaseUpdate, Protocol):
 
     def increment_retry_count(self) -> Self: ...
 
+    def release_claim(self) -> Self: ...
+
+    def schedule_next_attempt(self, timestamp: datetime) -> Self: ...
+
+    def move_to_dead_letters(self) -> Self:
+        """Unsent dead letters are never attempted to be sent again."""
+
 
 class DatabaseGateway(Protocol):
     def create_private_consumption(
@@ -817,6 +918,14 @@ class DatabaseGateway(Protocol):
 
     def get_basic_services(self) -> BasicServiceResult: ...
 
+    def get_offers(
+        self, plans: PlanResult, basic_services: Optional[BasicServiceResult]
+    ) -> OfferResult:
+        """Combine the approved plans and the basic services of both
+        result sets into one result set of offers. Orderings of the
+        arguments are not preserved.
+        """
+
     def create_email(
         self, created_at: datetime, recipient: str, sender: str, subject: str, html: str
     ) -> records.Email: ...
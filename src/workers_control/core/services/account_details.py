@@ -2,7 +2,6 @@ import enum
 from dataclasses import dataclass
 from datetime import datetime
 from decimal import Decimal
-from itertools import accumulate
 from uuid import UUID
 
 from workers_control.core.anonymization import (
@@ -15,6 +14,7 @@ from workers_control.core.records import (
     AccountOwner,
     Company,
     Cooperation,
+    Cursor,
     Member,
     SocialAccounting,
 )
@@ -81,6 +81,31 @@ class AccountDetailsService:
             )
         return transfers
 
+    def get_plot_details(self, account: UUID) -> PlotDetails:
+        timestamps: list[datetime] = []
+        accumulated_volumes: list[Decimal] = []
+        for (
+            date,
+            accumulated_volume,
+        ) in self.database_gateway.get_transfers().accumulated_volumes_of_account(
+            account
+        ):
+            timestamps.append(date)
+            accumulated_volumes.append(accumulated_volume)
+        return PlotDetails(
+            timestamps=timestamps, accumulated_volumes=accumulated_volumes
+        )
+
+    def get_last_transfer(self, account: UUID) -> Cursor | None:
+        result = (
+            self.database_gateway.get_accounts()
+            .with_id(account)
+            .joined_with_last_transfer()
+            .first()
+        )
+        assert result
+        return result[1]
+
     def get_account_balance(self, account: UUID) -> Decimal:
         result = (
             self.database_gateway.get_accounts()
@@ -130,11 +155,3 @@ def _transfer_party_type_from_owner(account_owner: AccountOwner) -> TransferPart
             return TransferPartyType.cooperation
         case SocialAccounting():
             return TransferPartyType.social_accounting
-
-
-def construct_plot_data(transfers: list[AccountTransfer]) -> PlotDetails:
-    transfers = sorted(transfers, key=lambda transfer: transfer.date)
-    return PlotDetails(
-        timestamps=[t.date for t in transfers],
-        accumulated_volumes=list(accumulate([t.volume for t in transfers])),
-    )
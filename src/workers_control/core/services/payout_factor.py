@@ -1,8 +1,10 @@
+from __future__ import annotations
+
 from dataclasses import dataclass
 from datetime import datetime, timedelta
 from decimal import Decimal
 from itertools import chain
-from typing import Iterable, Protocol
+from typing import Callable, Iterable, Protocol
 
 from workers_control.core.datetime_service import DatetimeService
 from workers_control.core.repositories import DatabaseGateway
@@ -12,6 +14,13 @@ class PayoutFactorConfig(Protocol):
     def get_window_length_in_days(self) -> int: ...
 
 
+class PayoutFactorInputsCache(Protocol):
+    def get_or_load(self, load: Callable[[], PayoutFactorInputs]) -> PayoutFactorInputs:
+        """Return the cached inputs if no plan was approved since they
+        were loaded. Otherwise call load and cache its result.
+        """
+
+
 @dataclass
 class PlanInfo:
     is_public: bool
@@ -29,11 +38,36 @@ class BasicServiceConsumptionDataPoint:
     value: Decimal
 
 
+@dataclass(frozen=True)
+class PlannedCosts:
+    is_public: bool
+    l: Decimal
+    p: Decimal
+    r: Decimal
+    start: datetime
+    end: datetime
+
+
+@dataclass(frozen=True)
+class PayoutFactorInputs:
+    """The planned costs the payout factor is calculated from,
+    independent of the exact position of the window. The inputs can be
+    reused for every window that starts at or after valid_from.
+    """
+
+    valid_from: datetime
+    plans: tuple[PlannedCosts, ...]
+
+    def is_valid_for(self, window_start: datetime) -> bool:
+        return self.valid_from <= window_start
+
+
 @dataclass
 class PayoutFactorService:
     datetime_service: DatetimeService
     database_gateway: DatabaseGateway
     payout_factor_config: PayoutFactorConfig
+    inputs_cache: PayoutFactorInputsCache
 
     def calculate_current_payout_factor(self) -> Decimal:
         """
@@ -44,71 +78,95 @@ class PayoutFactorService:
         window_length_in_days = self.payout_factor_config.get_window_length_in_days()
         window_start = now - timedelta(days=window_length_in_days / 2)
         window_end = now + timedelta(days=window_length_in_days / 2)
-        relevant_plans = self._get_info_of_relevant_plans(window_start, window_end)
+        inputs = self._get_inputs(window_start)
+        relevant_plans = self._get_info_of_relevant_plans(
+            inputs, window_start, window_end
+        )
         bs_consumption = self._get_basic_service_consumption_in_window(
             window_start, window_end
         )
         return self._calculate_payout_factor(relevant_plans, bs_consumption)
 
-    def _get_info_of_relevant_plans(
-        self, window_start: datetime, window_end: datetime
-    ) -> Iterable[PlanInfo]:
-        plans = (
-            self.database_gateway.get_plans()
-            .that_were_approved_before(window_end)
-            .that_will_expire_after(window_start)
-        )
-
+    def _get_inputs(self, window_start: datetime) -> PayoutFactorInputs:
+        inputs = self.inputs_cache.get_or_load(lambda: self._load_inputs(window_start))
+        if not inputs.is_valid_for(window_start):
+            # The cached inputs were loaded for a later window, e.g. when
+            # the clock was set back. Load them again without caching.
+            inputs = self._load_inputs(window_start)
+        return inputs
+
+    def _load_inputs(self, window_start: datetime) -> PayoutFactorInputs:
+        plans = self.database_gateway.get_plans().that_will_expire_after(window_start)
+        planned_costs = []
         for plan in plans:
-            approval = plan.approval_date
-            assert approval is not None
-            expiration = plan.expiration_date
-            assert expiration is not None
-
-            coverage = self.calculate_coverage(
-                window_start, window_end, approval, expiration
-            )
+            assert plan.approval_date is not None
+            assert plan.expiration_date is not None
             costs = plan.production_costs
-            yield PlanInfo(
-                is_public=plan.is_public_service,
-                l=costs.labour_cost,
-                p=costs.means_cost,
-                r=costs.resource_cost,
-                start=approval,
-                end=expiration,
-                coverage=coverage,
+            planned_costs.append(
+                PlannedCosts(
+                    is_public=plan.is_public_service,
+                    l=costs.labour_cost,
+                    p=costs.means_cost,
+                    r=costs.resource_cost,
+                    start=plan.approval_date,
+                    end=plan.expiration_date,
+                )
             )
+        return PayoutFactorInputs(valid_from=window_start, plans=tuple(planned_costs))
 
-    def _get_basic_service_consumption_in_window(
-        self, window_start: datetime, window_end: datetime
-    ) -> Decimal:
-        return sum(
-            (
-                dp.value
-                for dp in self.get_basic_service_consumptions_in_window(
-                    window_start, window_end
-                )
-            ),
-            Decimal(0),
-        )
+    def _get_info_of_relevant_plans(
+        self,
+        inputs: PayoutFactorInputs,
+        window_start: datetime,
+        window_end: datetime,
+    ) -> Iterable[PlanInfo]:
+        for plan in inputs.plans:
+            if plan.start > window_end or plan.end <= window_start:
+                continue
+            yield PlanInfo(
+                is_public=plan.is_public,
+                l=plan.l,
+                p=plan.p,
+                r=plan.r,
+                start=plan.start,
+                end=plan.end,
+                coverage=self.calculate_coverage(
+                    window_start, window_end, plan.start, plan.end
+                ),
+            )
 
     def get_basic_service_consumptions_in_window(
         self, window_start: datetime, window_end: datetime
     ) -> list[BasicServiceConsumptionDataPoint]:
         private = (
-            self.database_gateway.get_private_consumptions_of_basic_service().joined_with_transfer()
+            self.database_gateway.get_private_consumptions_of_basic_service()
+            .that_were_made_between(window_start, window_end)
+            .joined_with_transfer()
         )
         productive = (
-            self.database_gateway.get_productive_consumptions_of_basic_service().joined_with_transfer()
+            self.database_gateway.get_productive_consumptions_of_basic_service()
+            .that_were_made_between(window_start, window_end)
+            .joined_with_transfer()
         )
         data_points = [
             BasicServiceConsumptionDataPoint(date=transfer.date, value=transfer.value)
             for _, transfer in chain(private, productive)
-            if window_start <= transfer.date <= window_end
         ]
         data_points.sort(key=lambda dp: dp.date)
         return data_points
 
+    def _get_basic_service_consumption_in_window(
+        self, window_start: datetime, window_end: datetime
+    ) -> Decimal:
+        return (
+            self.database_gateway.get_private_consumptions_of_basic_service()
+            .that_were_made_between(window_start, window_end)
+            .get_total_value()
+            + self.database_gateway.get_productive_consumptions_of_basic_service()
+            .that_were_made_between(window_start, window_end)
+            .get_total_value()
+        )
+
     @staticmethod
     def calculate_coverage(
         window_start: datetime,
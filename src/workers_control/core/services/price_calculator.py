@@ -1,8 +1,9 @@
+from collections import defaultdict
 from dataclasses import dataclass
 from decimal import Decimal
+from typing import Iterable
 from uuid import UUID
 
-from workers_control.core import records
 from workers_control.core.datetime_service import DatetimeService
 from workers_control.core.repositories import DatabaseGateway
 
@@ -16,36 +17,61 @@ class PriceCalculator:
         """
         Calculate the price per unit for consumers.
         """
-        plan_record = self.database_gateway.get_plans().with_id(plan).first()
-        if plan_record is None:
-            return Decimal(0)
-        if plan_record.is_public_service:
-            return Decimal(0)
-        coop_price = self._calculate_cooperative_price(plan)
-        if coop_price is None:
-            return plan_record.cost_per_unit()
-        return coop_price
+        return self.calculate_prices([plan])[plan]
 
-    def _calculate_cooperative_price(self, plan: UUID) -> Decimal | None:
+    def calculate_prices(self, plans: Iterable[UUID]) -> dict[UUID, Decimal]:
         """
-        Returns None if plan is not part of a cooperation.
+        Calculate the prices per unit for consumers of all specified
+        plans at once. The number of queries does not depend on the
+        number of plans.
         """
+        prices = {plan: Decimal(0) for plan in plans}
+        if not prices:
+            return prices
+        plans_and_cooperations = list(
+            self.database_gateway.get_plans().with_id(*prices).joined_with_cooperation()
+        )
+        cooperative_prices = self._calculate_cooperative_prices(
+            {
+                cooperation.id
+                for plan, cooperation in plans_and_cooperations
+                if cooperation and not plan.is_public_service
+            }
+        )
+        for plan, cooperation in plans_and_cooperations:
+            if plan.is_public_service:
+                continue
+            coop_price = cooperative_prices.get(cooperation.id) if cooperation else None
+            if coop_price is None:
+                prices[plan.id] = plan.cost_per_unit()
+            else:
+                prices[plan.id] = coop_price
+        return prices
+
+    def _calculate_cooperative_prices(
+        self, cooperations: set[UUID]
+    ) -> dict[UUID, Decimal]:
+        """
+        Cooperations without any active plans are not included in the
+        result.
+        """
+        if not cooperations:
+            return dict()
         now = self.datetime_service.now()
-        plans = list(
+        costs_per_unit: dict[UUID, list[Decimal]] = defaultdict(list)
+        for plan, cooperation in (
             self.database_gateway.get_plans()
-            .that_are_in_same_cooperation_as(plan)
+            .that_are_part_of_cooperation(*cooperations)
             .that_will_expire_after(now)
-        )
-        if not plans:
-            return None
-        assert not any(p.is_public_service for p in plans)
-        if len(plans) == 1:
-            # The plan passed as argument is the sole member of a cooperation
-            return plans[0].cost_per_unit()
-        else:
-            return self._calculate_average_costs(plans)
+            .joined_with_cooperation()
+        ):
+            assert cooperation
+            assert not plan.is_public_service
+            costs_per_unit[cooperation.id].append(plan.cost_per_unit())
+        return {
+            cooperation: self._calculate_average_costs(costs)
+            for cooperation, costs in costs_per_unit.items()
+        }
 
-    def _calculate_average_costs(self, plans: list[records.Plan]) -> Decimal:
-        return Decimal(sum(plan.cost_per_unit() for plan in plans)) / Decimal(
-            len(plans)
-        )
+    def _calculate_average_costs(self, costs_per_unit: list[Decimal]) -> Decimal:
+        return Decimal(sum(costs_per_unit)) / Decimal(len(costs_per_unit))
@@ -0,0 +1,42 @@
+"""Add account_balance table
+
+Revision ID: 5b1d7e3a9c20
+Revises: f4a9c2e1b6d3
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b1d7e3a9c20"
+down_revision: Union[str, None] = "f4a9c2e1b6d3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account_balance",
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("balance", sa.Numeric(), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["account.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("account_id"),
+    )
+    op.execute(
+        "INSERT INTO account_balance (account_id, balance) "
+        "SELECT account.id, "
+        "COALESCE((SELECT SUM(value) FROM transfer "
+        "WHERE transfer.credit_account = account.id), 0) "
+        "- COALESCE((SELECT SUM(value) FROM transfer "
+        "WHERE transfer.debit_account = account.id), 0) "
+        "FROM account"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("account_balance")
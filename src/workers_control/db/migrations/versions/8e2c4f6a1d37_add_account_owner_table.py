@@ -0,0 +1,61 @@
+"""Add account_owner table
+
+Revision ID: 8e2c4f6a1d37
+Revises: 5b1d7e3a9c20
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8e2c4f6a1d37"
+down_revision: Union[str, None] = "5b1d7e3a9c20"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "account_owner",
+        sa.Column("account_id", sa.Uuid(), nullable=False),
+        sa.Column("owner_type", sa.String(length=20), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.Column("account_type", sa.String(length=20), nullable=False),
+        sa.ForeignKeyConstraint(["account_id"], ["account.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("account_id"),
+    )
+    op.create_index(
+        op.f("ix_account_owner_owner_id"), "account_owner", ["owner_id"], unique=False
+    )
+    op.execute(
+        "INSERT INTO account_owner (account_id, owner_type, owner_id, account_type) "
+        "SELECT account, 'member', id, 'member' FROM member"
+    )
+    for column, account_type in [
+        ("p_account", "p"),
+        ("r_account", "r"),
+        ("a_account", "a"),
+        ("prd_account", "prd"),
+    ]:
+        op.execute(
+            "INSERT INTO account_owner (account_id, owner_type, owner_id, account_type) "
+            f"SELECT {column}, 'company', id, '{account_type}' FROM company"
+        )
+    op.execute(
+        "INSERT INTO account_owner (account_id, owner_type, owner_id, account_type) "
+        "SELECT account_psf, 'social_accounting', id, 'psf' FROM social_accounting"
+    )
+    op.execute(
+        "INSERT INTO account_owner (account_id, owner_type, owner_id, account_type) "
+        "SELECT account, 'cooperation', id, 'cooperation' FROM cooperation"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(op.f("ix_account_owner_owner_id"), table_name="account_owner")
+    op.drop_table("account_owner")
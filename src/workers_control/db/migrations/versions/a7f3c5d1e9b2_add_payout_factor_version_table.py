@@ -0,0 +1,34 @@
+"""Add payout_factor_version table
+
+Revision ID: a7f3c5d1e9b2
+Revises: d2a6b9e4c813
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a7f3c5d1e9b2"
+down_revision: Union[str, None] = "d2a6b9e4c813"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    payout_factor_version = op.create_table(
+        "payout_factor_version",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("version", sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.bulk_insert(payout_factor_version, [{"id": 1, "version": uuid4()}])
+
+
+def downgrade() -> None:
+    op.drop_table("payout_factor_version")
@@ -0,0 +1,75 @@
+"""Create the social accounting row
+
+Revision ID: b6e2d8a4c1f7
+Revises: f1c7a9e3d5b4
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+
+from decimal import Decimal
+from typing import Sequence, Union
+from uuid import uuid4
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b6e2d8a4c1f7"
+down_revision: Union[str, None] = "f1c7a9e3d5b4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+account = sa.table("account", sa.column("id", sa.Uuid()))
+account_balance = sa.table(
+    "account_balance",
+    sa.column("account_id", sa.Uuid()),
+    sa.column("balance", sa.Numeric()),
+)
+account_owner = sa.table(
+    "account_owner",
+    sa.column("account_id", sa.Uuid()),
+    sa.column("owner_type", sa.String()),
+    sa.column("owner_id", sa.Uuid()),
+    sa.column("account_type", sa.String()),
+)
+social_accounting = sa.table(
+    "social_accounting",
+    sa.column("id", sa.Uuid()),
+    sa.column("account_psf", sa.Uuid()),
+)
+
+
+def upgrade() -> None:
+    """Create the social accounting up front, so that the application
+    never has to create it while serving concurrent requests.
+    """
+    conn = op.get_bind()
+    if conn.execute(sa.select(social_accounting.c.id).limit(1)).first():
+        return
+    account_id = uuid4()
+    social_accounting_id = uuid4()
+    conn.execute(sa.insert(account).values(id=account_id))
+    conn.execute(
+        sa.insert(account_balance).values(account_id=account_id, balance=Decimal(0))
+    )
+    conn.execute(
+        sa.insert(social_accounting).values(
+            id=social_accounting_id, account_psf=account_id
+        )
+    )
+    conn.execute(
+        sa.insert(account_owner).values(
+            account_id=account_id,
+            owner_type="social_accounting",
+            owner_id=social_accounting_id,
+            account_type="psf",
+        )
+    )
+
+
+def downgrade() -> None:
+    # The social accounting row may be referenced by transfers by now,
+    # so it is kept.
+    pass
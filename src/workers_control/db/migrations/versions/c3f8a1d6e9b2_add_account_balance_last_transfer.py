@@ -0,0 +1,41 @@
+"""Add last transfer to account_balance
+
+Revision ID: c3f8a1d6e9b2
+Revises: b6e2d8a4c1f7
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3f8a1d6e9b2"
+down_revision: Union[str, None] = "b6e2d8a4c1f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("account_balance") as batch_op:
+        batch_op.add_column(sa.Column("last_transfer_id", sa.Uuid(), nullable=True))
+        batch_op.add_column(
+            sa.Column("last_transfer_date", sa.DateTime(), nullable=True)
+        )
+    for column in ["id", "date"]:
+        op.execute(
+            f"UPDATE account_balance SET last_transfer_{column} = "
+            f"(SELECT transfer.{column} FROM transfer "
+            "WHERE transfer.debit_account = account_balance.account_id "
+            "OR transfer.credit_account = account_balance.account_id "
+            "ORDER BY transfer.date DESC, transfer.id DESC LIMIT 1)"
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("account_balance") as batch_op:
+        batch_op.drop_column("last_transfer_date")
+        batch_op.drop_column("last_transfer_id")
@@ -0,0 +1,44 @@
+"""Index transfer_of_consumption of basic service consumptions
+
+Revision ID: c4e8a2f7b1d9
+Revises: a7f3c5d1e9b2
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c4e8a2f7b1d9"
+down_revision: Union[str, None] = "a7f3c5d1e9b2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        op.f("ix_private_consumption_of_basic_service_transfer_of_consumption"),
+        "private_consumption_of_basic_service",
+        ["transfer_of_consumption"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_productive_consumption_of_basic_service_transfer_of_consumption"),
+        "productive_consumption_of_basic_service",
+        ["transfer_of_consumption"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_productive_consumption_of_basic_service_transfer_of_consumption"),
+        table_name="productive_consumption_of_basic_service",
+    )
+    op.drop_index(
+        op.f("ix_private_consumption_of_basic_service_transfer_of_consumption"),
+        table_name="private_consumption_of_basic_service",
+    )
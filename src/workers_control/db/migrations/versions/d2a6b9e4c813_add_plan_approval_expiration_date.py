@@ -0,0 +1,86 @@
+"""Add expiration_date to plan_approval
+
+Revision ID: d2a6b9e4c813
+Revises: 8e2c4f6a1d37
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from datetime import timedelta
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d2a6b9e4c813"
+down_revision: Union[str, None] = "8e2c4f6a1d37"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table("plan_approval") as batch_op:
+        batch_op.add_column(sa.Column("expiration_date", sa.DateTime(), nullable=True))
+
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            "UPDATE plan_approval "
+            "SET expiration_date = plan_approval.date + plan.timeframe * INTERVAL '1 day' "
+            "FROM plan WHERE plan.id = plan_approval.plan_id"
+        )
+    else:
+        _backfill_expiration_date()
+
+    with op.batch_alter_table("plan_approval") as batch_op:
+        batch_op.alter_column(
+            "expiration_date", existing_type=sa.DateTime(), nullable=False
+        )
+        batch_op.create_index(
+            "ix_plan_approval_expiration_date", ["expiration_date"], unique=False
+        )
+        batch_op.create_index(
+            "ix_plan_approval_date_expiration_date",
+            ["date", "expiration_date"],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("plan_approval") as batch_op:
+        batch_op.drop_index("ix_plan_approval_date_expiration_date")
+        batch_op.drop_index("ix_plan_approval_expiration_date")
+        batch_op.drop_column("expiration_date")
+
+
+def _backfill_expiration_date() -> None:
+    """SQLite has no interval arithmetic that round-trips with the
+    stored datetime format, so the expiration dates are computed in
+    Python.
+    """
+    conn = op.get_bind()
+    plan_approval = sa.table(
+        "plan_approval",
+        sa.column("id", sa.Uuid()),
+        sa.column("plan_id", sa.Uuid()),
+        sa.column("date", sa.DateTime()),
+        sa.column("expiration_date", sa.DateTime()),
+    )
+    plan = sa.table(
+        "plan",
+        sa.column("id", sa.Uuid()),
+        sa.column("timeframe", sa.Numeric()),
+    )
+    rows = conn.execute(
+        sa.select(plan_approval.c.id, plan_approval.c.date, plan.c.timeframe).join(
+            plan, plan.c.id == plan_approval.c.plan_id
+        )
+    ).all()
+    for approval_id, date, timeframe in rows:
+        conn.execute(
+            sa.update(plan_approval)
+            .where(plan_approval.c.id == approval_id)
+            .values(expiration_date=date + timedelta(days=int(timeframe)))
+        )
@@ -0,0 +1,30 @@
+"""Add claimed_until to email_outbox
+
+Revision ID: e5b8d3f1a6c2
+Revises: c4e8a2f7b1d9
+Create Date: 2026-10-18 16:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e5b8d3f1a6c2"
+down_revision: Union[str, None] = "c4e8a2f7b1d9"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "email_outbox",
+        sa.Column("claimed_until", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("email_outbox", "claimed_until")
@@ -0,0 +1,45 @@
+"""Add next_attempt_at to email_outbox
+
+Revision ID: f1c7a9e3d5b4
+Revises: e5b8d3f1a6c2
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f1c7a9e3d5b4"
+down_revision: Union[str, None] = "e5b8d3f1a6c2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "email_outbox",
+        sa.Column("next_attempt_at", sa.DateTime(), nullable=True),
+    )
+    op.execute("UPDATE email_outbox SET next_attempt_at = created_at")
+    op.create_index(
+        "ix_email_outbox_unsent_next_attempt_at",
+        "email_outbox",
+        ["next_attempt_at"],
+        unique=False,
+        postgresql_where=sa.text("sent_at IS NULL"),
+        sqlite_where=sa.text("sent_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_email_outbox_unsent_next_attempt_at",
+        table_name="email_outbox",
+        postgresql_where=sa.text("sent_at IS NULL"),
+        sqlite_where=sa.text("sent_at IS NULL"),
+    )
+    op.drop_column("email_outbox", "next_attempt_at")
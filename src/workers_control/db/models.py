@@ -14,12 +14,14 @@ from sqlalchemy import (
     Dialect,
     Engine,
     ForeignKey,
+    Index,
     String,
     Table,
     Text,
     TypeDecorator,
     Uuid,
     event,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.pool import ConnectionPoolEntry
@@ -191,11 +193,14 @@ class Plan(Base):
     )
     hidden_by_user: Mapped[bool] = mapped_column(default=False)
 
+    # Plan records always carry their approval and rejection dates, so
+    # both are loaded together with the plans instead of one lazy SELECT
+    # per plan.
     rejection: Mapped["PlanRejection | None"] = relationship(
-        "PlanRejection", back_populates="plan"
+        "PlanRejection", back_populates="plan", lazy="selectin"
     )
     approval: Mapped["PlanApproval | None"] = relationship(
-        "PlanApproval", back_populates="plan"
+        "PlanApproval", back_populates="plan", lazy="selectin"
     )
 
 
@@ -223,12 +228,18 @@ class PlanRejection(Base):
 
 class PlanApproval(Base):
     __tablename__ = "plan_approval"
+    __table_args__ = (
+        Index("ix_plan_approval_date_expiration_date", "date", "expiration_date"),
+    )
 
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
     plan_id: Mapped[UUID] = mapped_column(
         Uuid, ForeignKey("plan.id", ondelete="CASCADE")
     )
     date: Mapped[datetime] = mapped_column(TZDateTime)
+    # Approval date plus the plan's timeframe. Stored so that queries
+    # for active and expired plans can use an index.
+    expiration_date: Mapped[datetime] = mapped_column(TZDateTime, index=True)
     transfer_of_credit_p: Mapped[UUID] = mapped_column(Uuid, ForeignKey("transfer.id"))
     transfer_of_credit_r: Mapped[UUID] = mapped_column(Uuid, ForeignKey("transfer.id"))
     transfer_of_credit_a: Mapped[UUID] = mapped_column(Uuid, ForeignKey("transfer.id"))
@@ -242,6 +253,54 @@ class Account(Base):
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
 
 
+class AccountBalance(Base):
+    """Running balance of an account, maintained alongside every
+    inserted transfer so that balance lookups do not have to aggregate
+    the whole transfer table. The last transfer tells cached views of
+    the account whether they are still up to date.
+    """
+
+    __tablename__ = "account_balance"
+
+    account_id: Mapped[UUID] = mapped_column(
+        Uuid, ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
+    balance: Mapped[Decimal] = mapped_column(default=Decimal(0))
+    last_transfer_id: Mapped[UUID | None] = mapped_column(Uuid)
+    last_transfer_date: Mapped[datetime | None] = mapped_column(TZDateTime)
+
+
+class AccountOwner(Base):
+    """Maps every owned account to its owner so that transfer queries
+    can resolve debtors and creditors through a single equality join.
+
+    owner_type is one of "member", "company", "social_accounting" and
+    "cooperation". account_type is one of "member", "p", "r", "a",
+    "prd", "psf" and "cooperation".
+    """
+
+    __tablename__ = "account_owner"
+
+    account_id: Mapped[UUID] = mapped_column(
+        Uuid, ForeignKey("account.id", ondelete="CASCADE"), primary_key=True
+    )
+    owner_type: Mapped[str] = mapped_column(String(20))
+    owner_id: Mapped[UUID] = mapped_column(Uuid, index=True)
+    account_type: Mapped[str] = mapped_column(String(20))
+
+
+class PayoutFactorVersion(Base):
+    """Single row table whose version is replaced whenever a plan is
+    approved. Processes caching payout factor inputs compare this version
+    to decide whether their cache is stale.
+    """
+
+    __tablename__ = "payout_factor_version"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    version: Mapped[UUID] = mapped_column(Uuid)
+
+
 class Transfer(Base):
     __tablename__ = "transfer"
 
@@ -290,7 +349,7 @@ class PrivateConsumptionOfBasicService(Base):
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
     basic_service: Mapped[UUID] = mapped_column(Uuid, ForeignKey("basic_service.id"))
     transfer_of_consumption: Mapped[UUID] = mapped_column(
-        Uuid, ForeignKey("transfer.id")
+        Uuid, ForeignKey("transfer.id"), index=True
     )
     transfer_of_taxes: Mapped[UUID] = mapped_column(Uuid, ForeignKey("transfer.id"))
 
@@ -315,7 +374,7 @@ class ProductiveConsumptionOfBasicService(Base):
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
     basic_service: Mapped[UUID] = mapped_column(Uuid, ForeignKey("basic_service.id"))
     transfer_of_consumption: Mapped[UUID] = mapped_column(
-        Uuid, ForeignKey("transfer.id")
+        Uuid, ForeignKey("transfer.id"), index=True
     )
     transfer_of_taxes: Mapped[UUID] = mapped_column(Uuid, ForeignKey("transfer.id"))
 
@@ -395,6 +454,14 @@ class BasicService(Base):
 
 class EmailOutbox(Base):
     __tablename__ = "email_outbox"
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_unsent_next_attempt_at",
+            "next_attempt_at",
+            postgresql_where=text("sent_at IS NULL"),
+            sqlite_where=text("sent_at IS NULL"),
+        ),
+    )
 
     id: Mapped[UUID] = mapped_column(Uuid, primary_key=True, default=uuid4)
     created_at: Mapped[datetime] = mapped_column(TZDateTime)
@@ -405,3 +472,6 @@ class EmailOutbox(Base):
     sent_at: Mapped[datetime | None] = mapped_column(TZDateTime)
     retry_count: Mapped[int] = mapped_column(default=0)
     last_error: Mapped[str | None] = mapped_column(Text)
+    claimed_until: Mapped[datetime | None] = mapped_column(TZDateTime)
+    # NULL for unsent emails means that sending was given up.
+    next_attempt_at: Mapped[datetime | None] = mapped_column(TZDateTime)
@@ -1,11 +1,15 @@
 from __future__ import annotations
 
+import json
+import time
+from copy import copy
 from dataclasses import dataclass, field, replace
-from datetime import datetime
+from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import (
     Any,
     Callable,
+    ClassVar,
     Dict,
     Generic,
     Iterator,
@@ -17,15 +21,30 @@ from typing import (
 )
 from uuid import UUID, uuid4
 
-from sqlalchemy import Delete, Insert, String, Update
+from sqlalchemy import Delete, Insert, String, Update, event
 from sqlalchemy.dialects import postgresql, sqlite
-from sqlalchemy.engine import CursorResult
-from sqlalchemy.orm import InstrumentedAttribute, aliased, scoped_session
+from sqlalchemy.engine import Compiled, CursorResult
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import InstrumentedAttribute, ORMExecuteState, Session, aliased
 from sqlalchemy.orm.query import Query
-from sqlalchemy.sql.expression import ColumnElement, and_, delete, func, or_, update
-from sqlalchemy.sql.functions import concat
+from sqlalchemy.sql.compiler import SQLCompiler
+from sqlalchemy.sql.expression import (
+    ClauseElement,
+    Executable,
+    and_,
+    case,
+    delete,
+    false,
+    func,
+    or_,
+    select,
+    true,
+    update,
+)
 
 from workers_control.core import records
+from workers_control.core.repositories import CountStrategy
+from workers_control.core.services.payout_factor import PayoutFactorInputs
 from workers_control.core.transfers import TransferType
 from workers_control.db import models
 from workers_control.db.db import Database
@@ -39,24 +58,66 @@ from workers_control.db.models import (
 
 T = TypeVar("T", covariant=True)
 
+EMAIL_OUTBOX_CHANNEL = "email_outbox"
+"""PostgreSQL notification channel signalled whenever an email is stored
+in the outbox."""
 
-def _add_days_to_date(
-    db_session: scoped_session,
-    date_column: InstrumentedAttribute[datetime],
-    days_column: InstrumentedAttribute[Decimal],
-) -> ColumnElement[datetime]:
-    bind = db_session.bind
-    assert bind is not None
-    engine_name = bind.engine.name
+SOCIAL_ACCOUNTING_CREATED = "social_accounting_created"
+SOCIAL_ACCOUNTING_LOCK_ID = 0x50C1A1
+
+COUNT_CACHE_TTL = timedelta(seconds=60)
+COUNT_CACHE_SIZE = 1024
+
+ESTIMATED_COUNT_THRESHOLD = 10_000
+"""Planner estimates below this number are replaced by a real count,
+since small counts are cheap and estimates are least accurate for small
+or recently changed tables."""
+
+
+class IdentityCache:
+    """Records looked up by id, kept in the info of the SQLAlchemy
+    session. Sessions are removed at the end of every request, so
+    lookups are shared within a request only. The whole cache is
+    dropped whenever the session writes to the database, commits or
+    rolls back.
+    """
+
+    INFO_KEY = "identity_cache"
+
+    @classmethod
+    def get_or_load(
+        cls, session: Session, key: Tuple[type, UUID], load: Callable[[], Any]
+    ) -> Any:
+        if session.new or session.dirty or session.deleted:
+            # Unflushed changes would be flushed by a query.
+            cls.clear(session)
+        cache = session.info.setdefault(cls.INFO_KEY, {})
+        if key in cache:
+            record = cache[key]
+        else:
+            record = load()
+            # Loading may have flushed pending changes and thereby
+            # cleared the cache.
+            session.info.setdefault(cls.INFO_KEY, {})[key] = record
+        # Records are mutable dataclasses, callers get their own copy.
+        return copy(record)
+
+    @classmethod
+    def clear(cls, session: Session) -> None:
+        session.info.pop(cls.INFO_KEY, None)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _clear_identity_cache_on_write(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        IdentityCache.clear(orm_execute_state.session)
 
-    if engine_name == "sqlite":
-        return func.datetime(
-            date_column, "+" + func.cast(days_column, String) + " days"
-        )
-    else:
-        return (
-            func.cast(concat(days_column, " days"), postgresql.INTERVAL) + date_column
-        )
+
+@event.listens_for(Session, "after_flush")
+@event.listens_for(Session, "after_commit")
+@event.listens_for(Session, "after_soft_rollback")
+def _clear_identity_cache(session: Session, *args: Any) -> None:
+    IdentityCache.clear(session)
 
 
 class SqlQueryResult(Generic[T]):
@@ -64,29 +125,155 @@ class SqlQueryResult(Generic[T]):
         self.query = query
         self.mapper = mapper
         self.db = db
+        self._is_modified = False
+        self._identity: Optional[Tuple[type, UUID]] = None
 
     def limit(self, n: int) -> Self:
-        return type(self)(query=self.query.limit(n), mapper=self.mapper, db=self.db)
+        return self._with_modified_query(lambda query: query.limit(n))
 
     def offset(self, n: int) -> Self:
-        return type(self)(query=self.query.offset(n), mapper=self.mapper, db=self.db)
+        return self._with_modified_query(lambda query: query.offset(n))
 
     def first(self) -> Optional[T]:
+        if self._identity is not None:
+            return IdentityCache.get_or_load(
+                self.db.session(), self._identity, self._load_first
+            )
+        return self._load_first()
+
+    def _load_first(self) -> Optional[T]:
         element = self.query.first()
         if element is None:
             return None
         return self.mapper(element)
 
     def _with_modified_query(self, modification: Callable[[Query], Any]) -> Self:
-        return type(self)(
+        result = type(self)(
             query=modification(self.query), mapper=self.mapper, db=self.db
         )
+        result._is_modified = True
+        return result
+
+    def _with_id(self, id_: UUID, column: InstrumentedAttribute) -> Self:
+        """Filter by primary key. Lookups by id on an otherwise
+        unmodified result are served from the IdentityCache.
+        """
+        result = self._with_modified_query(lambda query: query.filter(column == id_))
+        if not self._is_modified:
+            result._identity = (type(self), id_)
+        return result
 
     def __iter__(self) -> Iterator[T]:
+        if self._identity is not None:
+            record = self.first()
+            return iter([] if record is None else [record])
         return (self.mapper(item) for item in self.query)
 
     def __len__(self) -> int:
-        return self.query.count()
+        if self._identity is not None:
+            return 0 if self.first() is None else 1
+        return self._query_for_counting().count()
+
+    def count(self, strategy: CountStrategy = CountStrategy.exact) -> int:
+        if strategy == CountStrategy.estimated:
+            estimate = self._estimate_count()
+            if estimate is not None and estimate >= ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+            strategy = CountStrategy.cached
+        if strategy == CountStrategy.cached:
+            key = self._count_cache_key()
+            count = CountCache.get(key)
+            if count is None:
+                count = len(self)
+                CountCache.put(key, count)
+            return count
+        return len(self)
+
+    def _query_for_counting(self) -> Query:
+        # The ordering does not change the number of rows, not even
+        # with LIMIT or OFFSET applied, but it can be costly.
+        return self.query.enable_assertions(False).order_by(None)
+
+    def _compile_for_counting(self) -> Compiled:
+        return self._query_for_counting().statement.compile(
+            dialect=self.db.session.get_bind().dialect,
+            compile_kwargs={"render_postcompile": True},
+        )
+
+    def _count_cache_key(self) -> Tuple[str, str]:
+        # Timestamps in the filter are truncated to the minute so that
+        # queries relative to "now" can share a count for the lifetime
+        # of a cache entry.
+        compiled = self._compile_for_counting()
+        parameters = sorted(
+            (
+                name,
+                (
+                    value.replace(second=0, microsecond=0)
+                    if isinstance(value, datetime)
+                    else value
+                ),
+            )
+            for name, value in compiled.params.items()
+        )
+        return str(compiled), repr(parameters)
+
+    def _estimate_count(self) -> Optional[int]:
+        """Ask the query planner of PostgreSQL for the number of rows.
+        Returns None for other databases.
+        """
+        if self.db.session.get_bind().dialect.name != "postgresql":
+            return None
+        plan: Any = self.db.session.execute(
+            ExplainAsJson(self._query_for_counting().statement)
+        ).scalar_one()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+
+class ExplainAsJson(Executable, ClauseElement):
+    inherit_cache = False
+
+    def __init__(self, statement: ClauseElement) -> None:
+        self.statement = statement
+
+
+@compiles(ExplainAsJson, "postgresql")
+def _compile_explain_as_json(
+    element: ExplainAsJson, compiler: SQLCompiler, **kwargs: Any
+) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kwargs)
+
+
+class CountCache:
+    """Shares row counts between all requests served by this process
+    for COUNT_CACHE_TTL.
+    """
+
+    _entries: ClassVar[Dict[Tuple[str, str], Tuple[float, int]]] = {}
+
+    @classmethod
+    def get(cls, key: Tuple[str, str]) -> Optional[int]:
+        entry = cls._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        return entry[1]
+
+    @classmethod
+    def put(cls, key: Tuple[str, str], count: int) -> None:
+        now = time.monotonic()
+        if len(cls._entries) >= COUNT_CACHE_SIZE:
+            cls._entries = {
+                key: entry for key, entry in cls._entries.items() if entry[0] >= now
+            }
+            if len(cls._entries) >= COUNT_CACHE_SIZE:
+                cls._entries = {}
+        cls._entries[key] = (now + COUNT_CACHE_TTL.total_seconds(), count)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._entries = {}
 
 
 class PlanQueryResult(SqlQueryResult[records.Plan]):
@@ -152,20 +339,18 @@ class PlanQueryResult(SqlQueryResult[records.Plan]):
 
     def that_will_expire_after(self, timestamp: datetime) -> Self:
         approval = aliased(models.PlanApproval)
-        expiration_date = _add_days_to_date(
-            self.db.session, approval.date, models.Plan.timeframe
-        )
         return self._with_modified_query(
-            lambda query: query.join(approval).filter(expiration_date > timestamp)
+            lambda query: query.join(approval).filter(
+                approval.expiration_date > timestamp
+            )
         )
 
     def that_are_expired_as_of(self, timestamp: datetime) -> Self:
         approval = aliased(models.PlanApproval)
-        expiration_date = _add_days_to_date(
-            self.db.session, approval.date, models.Plan.timeframe
-        )
         return self._with_modified_query(
-            lambda query: query.join(approval).filter(expiration_date <= timestamp)
+            lambda query: query.join(approval).filter(
+                approval.expiration_date <= timestamp
+            )
         )
 
     def that_are_productive(self) -> Self:
@@ -626,9 +811,7 @@ class MemberQueryResult(SqlQueryResult[records.Member]):
         )
 
     def with_id(self, member: UUID) -> Self:
-        return self._with_modified_query(
-            lambda query: query.filter(models.Member.id == member)
-        )
+        return self._with_id(member, models.Member.id)
 
     def with_email_address(self, email: str) -> Self:
         user = aliased(models.User)
@@ -691,9 +874,7 @@ class MemberUpdate:
 
 class CompanyQueryResult(SqlQueryResult[records.Company]):
     def with_id(self, id_: UUID) -> Self:
-        return self._with_modified_query(
-            lambda query: query.filter(models.Company.id == id_)
-        )
+        return self._with_id(id_, models.Company.id)
 
     def with_email_address(self, email: str) -> Self:
         return self._with_modified_query(
@@ -826,9 +1007,7 @@ class AccountantResult(SqlQueryResult[records.Accountant]):
         )
 
     def with_id(self, id_: UUID) -> Self:
-        return self._with_modified_query(
-            lambda query: query.filter(models.Accountant.id == id_)
-        )
+        return self._with_id(id_, models.Accountant.id)
 
     def joined_with_email_address(
         self,
@@ -890,11 +1069,61 @@ class AccountOwnerAliases:
     """
 
     def __init__(self) -> None:
+        self.account_owner = aliased(models.AccountOwner)
         self.member = aliased(models.Member)
         self.company = aliased(models.Company)
         self.social_accounting = aliased(models.SocialAccounting)
         self.cooperation = aliased(models.Cooperation)
 
+    def join_owner_of(
+        self, query: Query, account: InstrumentedAttribute[UUID]
+    ) -> Query:
+        """Resolve the owner of the given account column via the
+        account_owner mapping. Every join is an equality join on a
+        primary key.
+        """
+        owner = self.account_owner
+        return (
+            query.join(owner, owner.account_id == account, isouter=True)
+            .join(
+                self.member,
+                and_(
+                    owner.owner_type == "member",
+                    self.member.id == owner.owner_id,
+                ),
+                isouter=True,
+            )
+            .join(
+                self.company,
+                and_(
+                    owner.owner_type == "company",
+                    self.company.id == owner.owner_id,
+                ),
+                isouter=True,
+            )
+            .join(
+                self.social_accounting,
+                and_(
+                    owner.owner_type == "social_accounting",
+                    self.social_accounting.id == owner.owner_id,
+                ),
+                isouter=True,
+            )
+            .join(
+                self.cooperation,
+                and_(
+                    owner.owner_type == "cooperation",
+                    self.cooperation.id == owner.owner_id,
+                ),
+                isouter=True,
+            )
+        )
+
+    def entities(
+        self,
+    ) -> Tuple[Any, Any, Any, Any]:
+        return (self.member, self.company, self.social_accounting, self.cooperation)
+
 
 class TransferQueryResult(SqlQueryResult[records.Transfer]):
     def where_account_is_debtor(self, *account: UUID) -> Self:
@@ -921,38 +1150,10 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
     def joined_with_debtor(
         self,
     ) -> SqlQueryResult[Tuple[records.Transfer, records.AccountOwner]]:
-        member = aliased(models.Member)
-        company = aliased(models.Company)
-        social_accounting = aliased(models.SocialAccounting)
-        cooperation = aliased(models.Cooperation)
-        query = (
-            self.query.join(
-                member, member.account == models.Transfer.debit_account, isouter=True
-            )
-            .join(
-                company,
-                or_(
-                    company.p_account == models.Transfer.debit_account,
-                    company.r_account == models.Transfer.debit_account,
-                    company.a_account == models.Transfer.debit_account,
-                    company.prd_account == models.Transfer.debit_account,
-                ),
-                isouter=True,
-            )
-            .join(
-                social_accounting,
-                social_accounting.account_psf == models.Transfer.debit_account,
-                isouter=True,
-            )
-            .join(
-                cooperation,
-                cooperation.account == models.Transfer.debit_account,
-                isouter=True,
-            )
-            .with_entities(
-                models.Transfer, member, company, social_accounting, cooperation
-            )
-        )
+        debtor_aliases = self._create_account_owner_aliases()
+        query = debtor_aliases.join_owner_of(
+            self.query, models.Transfer.debit_account
+        ).with_entities(models.Transfer, *debtor_aliases.entities())
         return SqlQueryResult(
             query=query,
             mapper=self.map_transfer_and_account_owner,
@@ -962,38 +1163,10 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
     def joined_with_creditor(
         self,
     ) -> SqlQueryResult[Tuple[records.Transfer, records.AccountOwner]]:
-        member = aliased(models.Member)
-        company = aliased(models.Company)
-        social_accounting = aliased(models.SocialAccounting)
-        cooperation = aliased(models.Cooperation)
-        query = (
-            self.query.join(
-                member, member.account == models.Transfer.credit_account, isouter=True
-            )
-            .join(
-                company,
-                or_(
-                    company.p_account == models.Transfer.credit_account,
-                    company.r_account == models.Transfer.credit_account,
-                    company.a_account == models.Transfer.credit_account,
-                    company.prd_account == models.Transfer.credit_account,
-                ),
-                isouter=True,
-            )
-            .join(
-                social_accounting,
-                social_accounting.account_psf == models.Transfer.credit_account,
-                isouter=True,
-            )
-            .join(
-                cooperation,
-                cooperation.account == models.Transfer.credit_account,
-                isouter=True,
-            )
-            .with_entities(
-                models.Transfer, member, company, social_accounting, cooperation
-            )
-        )
+        creditor_aliases = self._create_account_owner_aliases()
+        query = creditor_aliases.join_owner_of(
+            self.query, models.Transfer.credit_account
+        ).with_entities(models.Transfer, *creditor_aliases.entities())
         return SqlQueryResult(
             query=query,
             mapper=self.map_transfer_and_account_owner,
@@ -1005,17 +1178,9 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
         cls, orm: Any
     ) -> Tuple[records.Transfer, records.AccountOwner]:
         transfer, member, company, social_accounting, cooperation = orm
-        account_owner: records.AccountOwner
-        if member:
-            account_owner = DatabaseGatewayImpl.member_from_orm(member)
-        elif company:
-            account_owner = DatabaseGatewayImpl.company_from_orm(company)
-        elif social_accounting:
-            account_owner = AccountingRepository.social_accounting_from_orm(
-                social_accounting
-            )
-        else:
-            account_owner = DatabaseGatewayImpl.cooperation_from_orm(cooperation)
+        account_owner = cls._determine_account_owner(
+            member, company, social_accounting, cooperation
+        )
         return DatabaseGatewayImpl.transfer_from_orm(transfer), account_owner
 
     def joined_with_debtor_and_creditor(
@@ -1025,78 +1190,12 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
     ]:
         debtor_aliases = self._create_account_owner_aliases()
         creditor_aliases = self._create_account_owner_aliases()
-
-        query = (
-            self.query
-            # Join debtor side
-            .join(
-                debtor_aliases.member,
-                debtor_aliases.member.account == models.Transfer.debit_account,
-                isouter=True,
-            )
-            .join(
-                debtor_aliases.company,
-                or_(
-                    debtor_aliases.company.p_account == models.Transfer.debit_account,
-                    debtor_aliases.company.r_account == models.Transfer.debit_account,
-                    debtor_aliases.company.a_account == models.Transfer.debit_account,
-                    debtor_aliases.company.prd_account == models.Transfer.debit_account,
-                ),
-                isouter=True,
-            )
-            .join(
-                debtor_aliases.social_accounting,
-                debtor_aliases.social_accounting.account_psf
-                == models.Transfer.debit_account,
-                isouter=True,
-            )
-            .join(
-                debtor_aliases.cooperation,
-                debtor_aliases.cooperation.account == models.Transfer.debit_account,
-                isouter=True,
-            )
-            # Join creditor side
-            .join(
-                creditor_aliases.member,
-                creditor_aliases.member.account == models.Transfer.credit_account,
-                isouter=True,
-            )
-            .join(
-                creditor_aliases.company,
-                or_(
-                    creditor_aliases.company.p_account
-                    == models.Transfer.credit_account,
-                    creditor_aliases.company.r_account
-                    == models.Transfer.credit_account,
-                    creditor_aliases.company.a_account
-                    == models.Transfer.credit_account,
-                    creditor_aliases.company.prd_account
-                    == models.Transfer.credit_account,
-                ),
-                isouter=True,
-            )
-            .join(
-                creditor_aliases.social_accounting,
-                creditor_aliases.social_accounting.account_psf
-                == models.Transfer.credit_account,
-                isouter=True,
-            )
-            .join(
-                creditor_aliases.cooperation,
-                creditor_aliases.cooperation.account == models.Transfer.credit_account,
-                isouter=True,
-            )
-            .with_entities(
-                models.Transfer,
-                debtor_aliases.member,
-                debtor_aliases.company,
-                debtor_aliases.social_accounting,
-                debtor_aliases.cooperation,
-                creditor_aliases.member,
-                creditor_aliases.company,
-                creditor_aliases.social_accounting,
-                creditor_aliases.cooperation,
-            )
+        query = debtor_aliases.join_owner_of(self.query, models.Transfer.debit_account)
+        query = creditor_aliases.join_owner_of(query, models.Transfer.credit_account)
+        query = query.with_entities(
+            models.Transfer,
+            *debtor_aliases.entities(),
+            *creditor_aliases.entities(),
         )
         return SqlQueryResult(
             query=query,
@@ -1107,6 +1206,33 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
     def _create_account_owner_aliases(self) -> AccountOwnerAliases:
         return AccountOwnerAliases()
 
+    def accumulated_volumes_of_account(
+        self, account: UUID
+    ) -> SqlQueryResult[Tuple[datetime, Decimal]]:
+        signed_value = case(
+            (models.Transfer.debit_account == account, -models.Transfer.value),
+            else_=models.Transfer.value,
+        )
+        ordering = (models.Transfer.date, models.Transfer.id)
+        query = (
+            self.where_account_is_debtor_or_creditor(account)
+            .query.with_entities(
+                models.Transfer.date,
+                func.sum(signed_value).over(order_by=ordering, rows=(None, 0)),
+            )
+            .order_by(*ordering)
+        )
+        return SqlQueryResult(
+            query=query,
+            mapper=self.map_date_and_accumulated_volume,
+            db=self.db,
+        )
+
+    @classmethod
+    def map_date_and_accumulated_volume(cls, orm: Any) -> Tuple[datetime, Decimal]:
+        date, accumulated_volume = orm
+        return date, Decimal(accumulated_volume)
+
     @classmethod
     def map_transfer_and_debtor_and_creditor(
         cls, orm: Any
@@ -1161,9 +1287,37 @@ class TransferQueryResult(SqlQueryResult[records.Transfer]):
         self, *, ascending: bool = True
     ) -> SqlQueryResult[records.Transfer]:
         ordering = (
-            models.Transfer.date.asc() if ascending else models.Transfer.date.desc()
+            (models.Transfer.date.asc(), models.Transfer.id.asc())
+            if ascending
+            else (models.Transfer.date.desc(), models.Transfer.id.desc())
+        )
+        return self._with_modified_query(lambda query: query.order_by(*ordering))
+
+    def after(self, cursor: records.Cursor) -> Self:
+        return self._with_modified_query(
+            lambda query: query.filter(
+                or_(
+                    models.Transfer.date > cursor.date,
+                    and_(
+                        models.Transfer.date == cursor.date,
+                        models.Transfer.id > cursor.id,
+                    ),
+                )
+            )
+        )
+
+    def before(self, cursor: records.Cursor) -> Self:
+        return self._with_modified_query(
+            lambda query: query.filter(
+                or_(
+                    models.Transfer.date < cursor.date,
+                    and_(
+                        models.Transfer.date == cursor.date,
+                        models.Transfer.id < cursor.id,
+                    ),
+                )
+            )
         )
-        return self._with_modified_query(lambda query: query.order_by(ordering))
 
 
 class AccountQueryResult(SqlQueryResult[records.Account]):
@@ -1214,38 +1368,12 @@ class AccountQueryResult(SqlQueryResult[records.Account]):
         )
 
     def joined_with_balance(self) -> SqlQueryResult[Tuple[records.Account, Decimal]]:
-        from sqlalchemy import func, select
-
-        tf_credited = (
-            select(
-                models.Transfer.credit_account.label("account_id"),
-                func.sum(models.Transfer.value).label("credited"),
-            )
-            .group_by(models.Transfer.credit_account)
-            .subquery()
-        )
-
-        tf_debited = (
-            select(
-                models.Transfer.debit_account.label("account_id"),
-                func.sum(models.Transfer.value).label("debited"),
-            )
-            .group_by(models.Transfer.debit_account)
-            .subquery()
-        )
-
-        query = (
-            self.query.outerjoin(
-                tf_credited, models.Account.id == tf_credited.c.account_id
-            )
-            .outerjoin(tf_debited, models.Account.id == tf_debited.c.account_id)
-            .with_entities(
-                models.Account,
-                (
-                    func.coalesce(tf_credited.c.credited, 0)
-                    - func.coalesce(tf_debited.c.debited, 0)
-                ).label("balance"),
-            )
+        query = self.query.outerjoin(
+            models.AccountBalance,
+            models.Account.id == models.AccountBalance.account_id,
+        ).with_entities(
+            models.Account,
+            func.coalesce(models.AccountBalance.balance, 0).label("balance"),
         )
 
         return SqlQueryResult(
@@ -1258,6 +1386,32 @@ class AccountQueryResult(SqlQueryResult[records.Account]):
     def map_account_and_balance(cls, orm: Any) -> Tuple[records.Account, Decimal]:
         return DatabaseGatewayImpl.account_from_orm(orm[0]), orm[1] or Decimal(0)
 
+    def joined_with_last_transfer(
+        self,
+    ) -> SqlQueryResult[Tuple[records.Account, Optional[records.Cursor]]]:
+        query = self.query.outerjoin(
+            models.AccountBalance,
+            models.Account.id == models.AccountBalance.account_id,
+        ).with_entities(
+            models.Account,
+            models.AccountBalance.last_transfer_date,
+            models.AccountBalance.last_transfer_id,
+        )
+        return SqlQueryResult(
+            query=query,
+            db=self.db,
+            mapper=self.map_account_and_last_transfer,
+        )
+
+    @classmethod
+    def map_account_and_last_transfer(
+        cls, orm: Any
+    ) -> Tuple[records.Account, Optional[records.Cursor]]:
+        account, date, id_ = orm
+        return DatabaseGatewayImpl.account_from_orm(account), (
+            records.Cursor(date=date, id=id_) if id_ is not None else None
+        )
+
 
 class ProductiveConsumptionResult(SqlQueryResult[records.ProductiveConsumption]):
     def with_id(self, id_: UUID) -> Self:
@@ -1600,6 +1754,29 @@ class PrivateConsumptionOfBasicServiceResult(
             .filter(consuming_member.id == member)
         )
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        transfer = aliased(models.Transfer)
+        return self._with_modified_query(
+            lambda query: query.join(
+                transfer,
+                models.PrivateConsumptionOfBasicService.transfer_of_consumption
+                == transfer.id,
+            ).filter(transfer.date >= start, transfer.date <= end)
+        )
+
+    def get_total_value(self) -> Decimal:
+        transfer = aliased(models.Transfer)
+        total = (
+            self.query.join(
+                transfer,
+                models.PrivateConsumptionOfBasicService.transfer_of_consumption
+                == transfer.id,
+            )
+            .with_entities(func.sum(transfer.value))
+            .scalar()
+        )
+        return Decimal(total) if total else Decimal(0)
+
     def joined_with_transfer(
         self,
     ) -> SqlQueryResult[
@@ -1694,6 +1871,29 @@ class ProductiveConsumptionOfBasicServiceResult(
             .filter(consuming_company.id == company)
         )
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        transfer = aliased(models.Transfer)
+        return self._with_modified_query(
+            lambda query: query.join(
+                transfer,
+                models.ProductiveConsumptionOfBasicService.transfer_of_consumption
+                == transfer.id,
+            ).filter(transfer.date >= start, transfer.date <= end)
+        )
+
+    def get_total_value(self) -> Decimal:
+        transfer = aliased(models.Transfer)
+        total = (
+            self.query.join(
+                transfer,
+                models.ProductiveConsumptionOfBasicService.transfer_of_consumption
+                == transfer.id,
+            )
+            .with_entities(func.sum(transfer.value))
+            .scalar()
+        )
+        return Decimal(total) if total else Decimal(0)
+
     def joined_with_transfer(
         self,
     ) -> SqlQueryResult[
@@ -1769,9 +1969,7 @@ class ProductiveConsumptionOfBasicServiceResult(
 
 class CooperationResult(SqlQueryResult[records.Cooperation]):
     def with_id(self, id_: UUID) -> Self:
-        return self._with_modified_query(
-            lambda query: query.filter(models.Cooperation.id == id_)
-        )
+        return self._with_id(id_, models.Cooperation.id)
 
     def with_name_ignoring_case(self, name: str) -> Self:
         return self._with_modified_query(
@@ -2375,12 +2573,31 @@ class AccountingRepository:
         )
 
     def get_or_create_social_accounting(self) -> records.SocialAccounting:
-        return self.social_accounting_from_orm(
+        """The social accounting row never changes once it is committed,
+        so it is loaded once per process. It is created by a migration;
+        databases set up without migrations get it on first use.
+        """
+        cached = SocialAccountingCache.get()
+        if cached is not None:
+            return cached
+        social_accounting = self.social_accounting_from_orm(
             self.get_or_create_social_accounting_orm()
         )
+        if SOCIAL_ACCOUNTING_CREATED not in self.db.session.info:
+            SocialAccountingCache.put(social_accounting)
+        return social_accounting
 
     def get_or_create_social_accounting_orm(self) -> SocialAccounting:
         social_accounting = self.db.session.query(models.SocialAccounting).first()
+        if (
+            not social_accounting
+            and self.db.session.get_bind().dialect.name == "postgresql"
+        ):
+            # Serialize the creation between concurrent transactions.
+            self.db.session.execute(
+                select(func.pg_advisory_xact_lock(SOCIAL_ACCOUNTING_LOCK_ID))
+            )
+            social_accounting = self.db.session.query(models.SocialAccounting).first()
         if not social_accounting:
             social_accounting = SocialAccounting(
                 id=uuid4(),
@@ -2388,7 +2605,26 @@ class AccountingRepository:
             account_psf = self.database_gateway.create_account()
             social_accounting.account_psf = account_psf.id
             self.db.session.add(social_accounting)
+            self.db.session.add(
+                models.AccountOwner(
+                    account_id=account_psf.id,
+                    owner_type="social_accounting",
+                    owner_id=social_accounting.id,
+                    account_type="psf",
+                )
+            )
             self.db.session.flush()
+            # The new row is cached once it is committed.
+            session = self.db.session()
+            session.info[SOCIAL_ACCOUNTING_CREATED] = self.social_accounting_from_orm(
+                social_accounting
+            )
+            event.listen(
+                session, "after_commit", _cache_created_social_accounting, once=True
+            )
+            event.listen(
+                session, "after_rollback", _forget_created_social_accounting, once=True
+            )
         return social_accounting
 
     def get_by_id(self, id: UUID) -> Optional[records.SocialAccounting]:
@@ -2400,6 +2636,135 @@ class AccountingRepository:
         return self.social_accounting_from_orm(accounting_orm)
 
 
+class PayoutFactorInputsCacheImpl:
+    """Shares the payout factor inputs between all requests served by
+    this process. The cache is keyed by the version stored in the
+    payout_factor_version table, which every plan approval replaces, so
+    approvals made by other processes invalidate it as well.
+    """
+
+    _cached: ClassVar[Optional[Tuple[UUID, PayoutFactorInputs]]] = None
+
+    def __init__(self, db: Database) -> None:
+        self.db = db
+
+    def get_or_load(self, load: Callable[[], PayoutFactorInputs]) -> PayoutFactorInputs:
+        version = (
+            self.db.session.query(models.PayoutFactorVersion.version)
+            .filter(models.PayoutFactorVersion.id == 1)
+            .scalar()
+        )
+        cached = PayoutFactorInputsCacheImpl._cached
+        if version is not None and cached is not None and cached[0] == version:
+            return cached[1]
+        inputs = load()
+        if version is not None:
+            PayoutFactorInputsCacheImpl._cached = (version, inputs)
+        return inputs
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cached = None
+
+
+class SocialAccountingCache:
+    """Shares the social accounting record between all requests served
+    by this process.
+    """
+
+    _cached: ClassVar[Optional[records.SocialAccounting]] = None
+
+    @classmethod
+    def get(cls) -> Optional[records.SocialAccounting]:
+        return cls._cached
+
+    @classmethod
+    def put(cls, social_accounting: records.SocialAccounting) -> None:
+        cls._cached = social_accounting
+
+    @classmethod
+    def clear(cls) -> None:
+        cls._cached = None
+
+
+def _cache_created_social_accounting(session: Session) -> None:
+    created = session.info.pop(SOCIAL_ACCOUNTING_CREATED, None)
+    if created is not None:
+        SocialAccountingCache.put(created)
+
+
+def _forget_created_social_accounting(session: Session) -> None:
+    session.info.pop(SOCIAL_ACCOUNTING_CREATED, None)
+
+
+@dataclass
+class AccountBalanceDrift:
+    account_id: UUID
+    stored_balance: Decimal
+    expected_balance: Decimal
+
+
+@dataclass
+class AccountBalanceReconciler:
+    """Compare the maintained account_balance table against the sum of
+    all transfers and optionally correct diverging rows.
+    """
+
+    db: Database
+
+    def find_drifts(self) -> list[AccountBalanceDrift]:
+        credited = (
+            self.db.session.query(
+                models.Transfer.credit_account.label("account_id"),
+                func.sum(models.Transfer.value).label("credited"),
+            )
+            .group_by(models.Transfer.credit_account)
+            .subquery()
+        )
+        debited = (
+            self.db.session.query(
+                models.Transfer.debit_account.label("account_id"),
+                func.sum(models.Transfer.value).label("debited"),
+            )
+            .group_by(models.Transfer.debit_account)
+            .subquery()
+        )
+        rows = (
+            self.db.session.query(
+                models.Account.id,
+                models.AccountBalance.balance,
+                func.coalesce(credited.c.credited, 0)
+                - func.coalesce(debited.c.debited, 0),
+            )
+            .outerjoin(
+                models.AccountBalance,
+                models.Account.id == models.AccountBalance.account_id,
+            )
+            .outerjoin(credited, models.Account.id == credited.c.account_id)
+            .outerjoin(debited, models.Account.id == debited.c.account_id)
+        )
+        drifts: list[AccountBalanceDrift] = []
+        for account_id, stored, expected in rows:
+            expected = Decimal(expected or 0)
+            if stored is None or Decimal(stored) != expected:
+                drifts.append(
+                    AccountBalanceDrift(
+                        account_id=account_id,
+                        stored_balance=Decimal(stored or 0),
+                        expected_balance=expected,
+                    )
+                )
+        return drifts
+
+    def correct(self, drift: AccountBalanceDrift) -> None:
+        self.db.session.merge(
+            models.AccountBalance(
+                account_id=drift.account_id, balance=drift.expected_balance
+            )
+        )
+        self.db.session.flush()
+
+
 class PasswordResetRequestResult(SqlQueryResult[records.PasswordResetRequest]):
     def with_email_address(self, email_address: str) -> Self:
         return self._with_modified_query(
@@ -2421,9 +2786,10 @@ class PasswordResetRequestResult(SqlQueryResult[records.PasswordResetRequest]):
 
 
 class BasicServiceResult(SqlQueryResult[records.BasicService]):
-    def with_id(self, id_: UUID) -> Self:
+    def with_id(self, *id_: UUID) -> Self:
+        ids = list(id_)
         return self._with_modified_query(
-            lambda query: query.filter(models.BasicService.id == id_)
+            lambda query: query.filter(models.BasicService.id.in_(ids))
         )
 
     def of_provider(self, member: UUID) -> Self:
@@ -2495,6 +2861,32 @@ class BasicServiceResult(SqlQueryResult[records.BasicService]):
         )
 
 
+class OfferResult(SqlQueryResult[records.Offer]):
+    def ordered_by_activation_date(self, *, ascending: bool = True) -> Self:
+        activation_date = self._column("activation_date")
+        ordering = activation_date.asc() if ascending else activation_date.desc()
+        return self._ordered_by(ordering)
+
+    def ordered_by_provider_name(self, *, ascending: bool = True) -> Self:
+        provider_name = func.lower(self._column("provider_name"))
+        ordering = provider_name.asc() if ascending else provider_name.desc()
+        return self._ordered_by(ordering)
+
+    def _ordered_by(self, ordering: Any) -> Self:
+        # Offers with the same sort key are ordered by id, so that pages
+        # of offers neither overlap nor skip offers.
+        offer_id = self._column("id")
+        return self._with_modified_query(
+            lambda query: query.order_by(ordering, offer_id.asc())
+        )
+
+    def _column(self, name: str) -> Any:
+        for column in self.query.column_descriptions:
+            if column["name"] == name:
+                return column["expr"]
+        raise KeyError(name)
+
+
 @dataclass
 class BasicServiceUpdate:
     query: Query
@@ -2536,6 +2928,67 @@ class EmailResult(SqlQueryResult[records.Email]):
             lambda query: query.filter(models.EmailOutbox.sent_at.is_(None))
         )
 
+    def that_are_due_at(self, timestamp: datetime) -> Self:
+        return self._with_modified_query(
+            lambda query: query.filter(models.EmailOutbox.next_attempt_at <= timestamp)
+        )
+
+    def that_are_dead_letters(self) -> Self:
+        return self._with_modified_query(
+            lambda query: query.filter(
+                models.EmailOutbox.sent_at.is_(None),
+                models.EmailOutbox.next_attempt_at.is_(None),
+            )
+        )
+
+    def that_are_not_claimed_at(self, timestamp: datetime) -> Self:
+        return self._with_modified_query(
+            lambda query: query.filter(
+                or_(
+                    models.EmailOutbox.claimed_until.is_(None),
+                    models.EmailOutbox.claimed_until <= timestamp,
+                )
+            )
+        )
+
+    def ordered_by_next_attempt(self) -> Self:
+        return self._with_modified_query(
+            lambda query: query.order_by(
+                models.EmailOutbox.next_attempt_at, models.EmailOutbox.created_at
+            )
+        )
+
+    def claim(self, *, until: datetime, limit: int) -> list[records.Email]:
+        # On PostgreSQL the rows are locked while they are claimed and
+        # rows locked by other workers are skipped instead of waited
+        # for. SQLite has no row locks but serializes all writes, which
+        # makes the UPDATE atomic as well.
+        claimable = (
+            self.query.with_entities(models.EmailOutbox.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        claimed = (
+            self.db.session.execute(
+                update(models.EmailOutbox)
+                .where(models.EmailOutbox.id.in_(claimable))
+                .values(claimed_until=until)
+                .returning(models.EmailOutbox.id)
+                .execution_options(synchronize_session=False)
+            )
+            .scalars()
+            .all()
+        )
+        if not claimed:
+            return []
+        emails = (
+            self.db.session.query(models.EmailOutbox)
+            .filter(models.EmailOutbox.id.in_(claimed))
+            .order_by(models.EmailOutbox.created_at)
+        )
+        return [self.mapper(email) for email in emails]
+
     def ordered_by_creation_date(self, ascending: bool = True) -> Self:
         ordering = (
             models.EmailOutbox.created_at.asc()
@@ -2575,6 +3028,24 @@ class EmailUpdate:
             ),
         )
 
+    def release_claim(self) -> Self:
+        return replace(
+            self,
+            update_values=dict(self.update_values, claimed_until=None),
+        )
+
+    def schedule_next_attempt(self, timestamp: datetime) -> Self:
+        return replace(
+            self,
+            update_values=dict(self.update_values, next_attempt_at=timestamp),
+        )
+
+    def move_to_dead_letters(self) -> Self:
+        return replace(
+            self,
+            update_values=dict(self.update_values, next_attempt_at=None),
+        )
+
     def perform(self) -> int:
         if not self.update_values:
             return 0
@@ -2817,12 +3288,21 @@ class DatabaseGatewayImpl:
         account: UUID,
     ) -> records.Cooperation:
         cooperation = models.Cooperation(
+            id=uuid4(),
             creation_date=creation_timestamp,
             name=name,
             definition=definition,
             account=account,
         )
         self.db.session.add(cooperation)
+        self.db.session.add(
+            models.AccountOwner(
+                account_id=account,
+                owner_type="cooperation",
+                owner_id=cooperation.id,
+                account_type="cooperation",
+            )
+        )
         self.db.session.flush()
         return self.cooperation_from_orm(cooperation)
 
@@ -2954,9 +3434,75 @@ class DatabaseGatewayImpl:
             type=type,
         )
         self.db.session.add(transfer)
+        # The balance rows are locked in the order of their account ids,
+        # so that concurrent transfers in opposite directions between the
+        # same accounts cannot deadlock.
+        for account, amount in sorted(
+            [(credit_account, value), (debit_account, -value)],
+            key=lambda item: item[0],
+        ):
+            self._add_to_account_balance(account, amount, transfer)
         self.db.session.flush()
         return self.transfer_from_orm(transfer)
 
+    def _renew_payout_factor_version(self) -> None:
+        # The row is upserted, because databases created from the models
+        # instead of by the migrations start without it, and concurrent
+        # plan approvals must not both try to insert it.
+        version = uuid4()
+        dialect = self.db.engine.dialect.name
+        sql_statement: postgresql.Insert | sqlite.Insert
+        if dialect == "postgresql":
+            sql_statement = (
+                postgresql.insert(models.PayoutFactorVersion)
+                .values(id=1, version=version)
+                .on_conflict_do_update(
+                    index_elements=[models.PayoutFactorVersion.id],
+                    set_=dict(version=version),
+                )
+            )
+        elif dialect == "sqlite":
+            sql_statement = (
+                sqlite.insert(models.PayoutFactorVersion)
+                .values(id=1, version=version)
+                .on_conflict_do_update(
+                    index_elements=[models.PayoutFactorVersion.id],
+                    set_=dict(version=version),
+                )
+            )
+        else:
+            raise NotImplementedError(f"Upsert not implemented for dialect {dialect}")
+        self.db.session.execute(sql_statement)
+
+    def _add_to_account_balance(
+        self, account: UUID, amount: Decimal, transfer: models.Transfer
+    ) -> None:
+        # The increment happens inside the UPDATE statement so that
+        # concurrent transfers touching the same account cannot overwrite
+        # each other's changes.
+        rowcount = (
+            self.db.session.query(models.AccountBalance)
+            .filter(models.AccountBalance.account_id == account)
+            .update(
+                {
+                    models.AccountBalance.balance: models.AccountBalance.balance
+                    + amount,
+                    models.AccountBalance.last_transfer_id: transfer.id,
+                    models.AccountBalance.last_transfer_date: transfer.date,
+                },
+                synchronize_session=False,
+            )
+        )
+        if not rowcount:
+            self.db.session.add(
+                models.AccountBalance(
+                    account_id=account,
+                    balance=amount,
+                    last_transfer_id=transfer.id,
+                    last_transfer_date=transfer.date,
+                )
+            )
+
     def get_transfers(self) -> TransferQueryResult:
         return TransferQueryResult(
             query=self.db.session.query(models.Transfer),
@@ -3018,6 +3564,14 @@ class DatabaseGatewayImpl:
             registered_on=registered_on,
         )
         self.db.session.add(orm_member)
+        self.db.session.add(
+            models.AccountOwner(
+                account_id=account.id,
+                owner_type="member",
+                owner_id=orm_member.id,
+                account_type="member",
+            )
+        )
         self.db.session.flush()
         return self.member_from_orm(orm_member)
 
@@ -3061,6 +3615,20 @@ class DatabaseGatewayImpl:
             prd_account=products_account.id,
         )
         self.db.session.add(company)
+        for account, account_type in [
+            (means_account, "p"),
+            (resource_account, "r"),
+            (labour_account, "a"),
+            (products_account, "prd"),
+        ]:
+            self.db.session.add(
+                models.AccountOwner(
+                    account_id=account.id,
+                    owner_type="company",
+                    owner_id=company.id,
+                    account_type=account_type,
+                )
+            )
         self.db.session.flush()
         return self.company_from_orm(company)
 
@@ -3190,6 +3758,9 @@ class DatabaseGatewayImpl:
     def create_account(self) -> records.Account:
         account = Account(id=uuid4())
         self.db.session.add(account)
+        self.db.session.add(
+            models.AccountBalance(account_id=account.id, balance=Decimal(0))
+        )
         self.db.session.flush()
         return self.account_from_orm(account)
 
@@ -3302,18 +3873,20 @@ class DatabaseGatewayImpl:
         transfer_of_credit_r: UUID,
         transfer_of_credit_a: UUID,
     ) -> records.PlanApproval:
+        plan_orm = self.db.session.query(models.Plan).filter_by(id=plan_id).first()
+        assert plan_orm
         approval_orm = models.PlanApproval(
             id=uuid4(),
             plan_id=plan_id,
             date=date,
+            expiration_date=date + timedelta(days=int(plan_orm.timeframe)),
             transfer_of_credit_p=transfer_of_credit_p,
             transfer_of_credit_r=transfer_of_credit_r,
             transfer_of_credit_a=transfer_of_credit_a,
         )
-        plan_orm = self.db.session.query(models.Plan).filter_by(id=plan_id).first()
-        assert plan_orm
         plan_orm.approval = approval_orm
         self.db.session.add(approval_orm)
+        self._renew_payout_factor_version()
         self.db.session.flush()
         return self.plan_approval_from_orm(approval_orm)
 
@@ -3398,6 +3971,50 @@ class DatabaseGatewayImpl:
             mapper=self.basic_service_from_orm,
         )
 
+    def get_offers(
+        self,
+        plans: PlanQueryResult,
+        basic_services: Optional[BasicServiceResult],
+    ) -> OfferResult:
+        plan_approval = aliased(models.PlanApproval)
+        planner = aliased(models.Company)
+        offers = (
+            plans.query.order_by(None)
+            .join(plan_approval, plan_approval.plan_id == models.Plan.id)
+            .join(planner, planner.id == models.Plan.planner)
+            .with_entities(
+                models.Plan.id.label("id"),
+                false().label("is_basic_service"),
+                plan_approval.date.label("activation_date"),
+                planner.name.label("provider_name"),
+            )
+        )
+        if basic_services is not None:
+            provider = aliased(models.Member)
+            offers = offers.union_all(
+                basic_services.query.order_by(None)
+                .join(provider, provider.id == models.BasicService.provider)
+                .with_entities(
+                    models.BasicService.id,
+                    true(),
+                    models.BasicService.created_on,
+                    provider.name,
+                )
+            )
+        offer = offers.subquery()
+        return OfferResult(
+            db=self.db,
+            query=self.db.session.query(
+                offer.c.id,
+                offer.c.is_basic_service,
+                offer.c.activation_date,
+                offer.c.provider_name,
+            ),
+            mapper=lambda row: records.Offer(
+                id=row.id, is_basic_service=bool(row.is_basic_service)
+            ),
+        )
+
     def create_email(
         self, created_at: datetime, recipient: str, sender: str, subject: str, html: str
     ) -> records.Email:
@@ -3408,9 +4025,13 @@ class DatabaseGatewayImpl:
             sender=sender,
             subject=subject,
             html=html,
+            next_attempt_at=created_at,
         )
         self.db.session.add(orm)
         self.db.session.flush()
+        if self.db.session.get_bind().dialect.name == "postgresql":
+            # Delivered to listening email workers on commit.
+            self.db.session.execute(select(func.pg_notify(EMAIL_OUTBOX_CHANNEL, "")))
         return self.email_from_orm(orm)
 
     def get_emails(self) -> EmailResult:
@@ -3429,4 +4050,5 @@ class DatabaseGatewayImpl:
             sender=orm.sender,
             subject=orm.subject,
             html=orm.html,
+            retry_count=orm.retry_count or 0,
         )
@@ -2,6 +2,10 @@ from abc import ABC, abstractmethod
 
 
 class EmailSenderPlugin(ABC):
+    """The email sending worker may call send_message from several
+    threads at once.
+    """
+
     @abstractmethod
     def send_message(
         self,
@@ -11,3 +15,29 @@ class EmailSenderPlugin(ABC):
         sender: str,
     ) -> None:
         pass
+
+    def close(self) -> None:
+        """Release resources kept between messages, e.g. open
+        connections. The worker calls this whenever the outbox has been
+        drained.
+        """
+
+
+class NewEmailNotifications(ABC):
+    """Lets the email sending worker wake up as soon as a new email is
+    stored instead of waiting for the next poll.
+    """
+
+    def start(self) -> None:
+        """Start receiving notifications. Called by the worker before
+        it polls the outbox for the first time.
+        """
+
+    @abstractmethod
+    def wait(self, timeout: float) -> bool:
+        """Block until a new email is stored or `timeout` seconds have
+        passed. Returns whether a new email was stored.
+        """
+
+    def close(self) -> None:
+        pass
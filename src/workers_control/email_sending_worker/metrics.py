@@ -0,0 +1,238 @@
+"""Metrics of the email sending worker in the Prometheus text exposition
+format. The metrics can be scraped from a local HTTP port or written to
+a file for the textfile collector of the node exporter.
+"""
+
+from __future__ import annotations
+
+import bisect
+import os
+import tempfile
+import threading
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterable
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SEND_DURATION_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUEUE_AGE_BUCKETS = (1, 5, 15, 60, 300, 900, 3600, 6 * 3600, 24 * 3600)
+ATTEMPT_BUCKETS = (1, 2, 3, 5, 7, 10)
+
+
+class Metric(ABC):
+    type_: str
+
+    def __init__(self, name: str, help_: str) -> None:
+        self.name = name
+        self.help = help_
+        self._lock = threading.Lock()
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type_}"
+        with self._lock:
+            yield from self._samples()
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]: ...
+
+
+class Counter(Metric):
+    type_ = "counter"
+
+    def __init__(self, name: str, help_: str) -> None:
+        super().__init__(name, help_)
+        self.value = 0.0
+
+    def inc(self, amount: float = 1) -> None:
+        with self._lock:
+            self.value += amount
+
+    def _samples(self) -> Iterable[str]:
+        yield f"{self.name} {_format(self.value)}"
+
+
+class Gauge(Metric):
+    type_ = "gauge"
+
+    def __init__(self, name: str, help_: str) -> None:
+        super().__init__(name, help_)
+        self.value = 0.0
+
+    def set(self, value: float) -> None:
+        with self._lock:
+            self.value = value
+
+    def _samples(self) -> Iterable[str]:
+        yield f"{self.name} {_format(self.value)}"
+
+
+class Histogram(Metric):
+    type_ = "histogram"
+
+    def __init__(self, name: str, help_: str, buckets: Iterable[float]) -> None:
+        super().__init__(name, help_)
+        self.buckets = sorted(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        with self._lock:
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                self.bucket_counts[index] += 1
+            self.count += 1
+            self.sum += value
+
+    def _samples(self) -> Iterable[str]:
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            yield f'{self.name}_bucket{{le="{_format(bound)}"}} {cumulative}'
+        yield f'{self.name}_bucket{{le="+Inf"}} {self.count}'
+        yield f"{self.name}_sum {_format(self.sum)}"
+        yield f"{self.name}_count {self.count}"
+
+
+class WorkerMetrics:
+    def __init__(self) -> None:
+        self.emails_sent = Counter(
+            "email_worker_emails_sent_total", "Emails sent successfully."
+        )
+        self.send_failures = Counter(
+            "email_worker_send_failures_total", "Failed attempts to send an email."
+        )
+        self.dead_letters_created = Counter(
+            "email_worker_dead_letters_total",
+            "Emails given up on after the maximum number of attempts.",
+        )
+        self.send_duration = Histogram(
+            "email_worker_send_duration_seconds",
+            "Time spent handing a single email to the mail service.",
+            SEND_DURATION_BUCKETS,
+        )
+        self.queue_age = Histogram(
+            "email_worker_queue_age_seconds",
+            "Time between storing an email in the outbox and sending it.",
+            QUEUE_AGE_BUCKETS,
+        )
+        self.attempts = Histogram(
+            "email_worker_attempts",
+            "Attempts needed to send an email or to give up on it.",
+            ATTEMPT_BUCKETS,
+        )
+        self.backlog = Gauge(
+            "email_worker_backlog",
+            "Unsent emails in the outbox that are due to be sent.",
+        )
+        self.dead_letters = Gauge(
+            "email_worker_dead_letters",
+            "Unsent emails in the outbox that are no longer attempted.",
+        )
+        self.polls = Counter(
+            "email_worker_polls_total", "Polls of the outbox for emails to send."
+        )
+        self.wakeups = Counter(
+            "email_worker_wakeups_total",
+            "Polls started early because of a notification about a new email.",
+        )
+
+    def render(self) -> str:
+        metrics: list[Metric] = [
+            self.emails_sent,
+            self.send_failures,
+            self.dead_letters_created,
+            self.send_duration,
+            self.queue_age,
+            self.attempts,
+            self.backlog,
+            self.dead_letters,
+            self.polls,
+            self.wakeups,
+        ]
+        return "".join(f"{line}\n" for metric in metrics for line in metric.render())
+
+
+class MetricsExporter(ABC):
+    def start(self) -> None:
+        pass
+
+    @abstractmethod
+    def update(self) -> None:
+        """Called by the worker after every poll."""
+
+    def close(self) -> None:
+        pass
+
+
+class HttpMetricsExporter(MetricsExporter):
+    """Serves the metrics on http://<host>:<port>/metrics from a
+    background thread. Binds to localhost unless told otherwise.
+    """
+
+    def __init__(
+        self, metrics: WorkerMetrics, port: int, host: str = "127.0.0.1"
+    ) -> None:
+        self.metrics = metrics
+        self._server = ThreadingHTTPServer((host, port), self._create_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def update(self) -> None:
+        pass
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._server.shutdown()
+        self._server.server_close()
+
+    def _create_handler(self) -> type[BaseHTTPRequestHandler]:
+        metrics = self.metrics
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args: object) -> None:
+                pass
+
+        return Handler
+
+
+class TextfileMetricsExporter(MetricsExporter):
+    """Writes the metrics to a file after every poll. The file is
+    replaced atomically, so that collectors never read a partial file.
+    """
+
+    def __init__(self, metrics: WorkerMetrics, path: str) -> None:
+        self.metrics = metrics
+        self.path = path
+
+    def update(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        with tempfile.NamedTemporaryFile(
+            "w", dir=directory, suffix=".tmp", delete=False
+        ) as file:
+            file.write(self.metrics.render())
+        os.replace(file.name, self.path)
+
+
+def _format(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
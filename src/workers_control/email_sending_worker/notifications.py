@@ -0,0 +1,84 @@
+"""Notifications about new emails in the outbox via PostgreSQL's
+LISTEN/NOTIFY. The database gateway sends a notification with every
+transaction that stores an email, PostgreSQL delivers it once the
+transaction is committed.
+"""
+
+from __future__ import annotations
+
+import logging
+import select
+import time
+from typing import Any, Optional
+
+from sqlalchemy import Engine
+
+from workers_control.db.repositories import EMAIL_OUTBOX_CHANNEL
+from workers_control.email_sending_worker.interface import NewEmailNotifications
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxListener(NewEmailNotifications):
+    """Listens for notifications on a dedicated connection. If the
+    connection fails, the listener waits for the full timeout and
+    reconnects on the next call, so that the worker falls back to
+    polling.
+    """
+
+    def __init__(self, engine: Engine) -> None:
+        self.engine = engine
+        self._connection: Optional[Any] = None
+
+    def start(self) -> None:
+        self._connect()
+
+    def wait(self, timeout: float) -> bool:
+        if self._connection is None and not self._connect():
+            time.sleep(timeout)
+            return False
+        try:
+            return self._wait_for_notification(timeout)
+        except Exception:
+            logger.warning("Lost connection for email notifications", exc_info=True)
+            self.close()
+            return False
+
+    def close(self) -> None:
+        connection, self._connection = self._connection, None
+        if connection is not None:
+            try:
+                connection.close()
+            except Exception:
+                pass
+
+    def _connect(self) -> bool:
+        try:
+            pooled_connection = self.engine.raw_connection()
+            pooled_connection.detach()
+            connection: Any = pooled_connection.driver_connection
+            connection.autocommit = True
+            cursor = connection.cursor()
+            cursor.execute(f"LISTEN {EMAIL_OUTBOX_CHANNEL}")
+            cursor.close()
+        except Exception:
+            logger.warning("Could not listen for email notifications", exc_info=True)
+            return False
+        self._connection = connection
+        return True
+
+    def _wait_for_notification(self, timeout: float) -> bool:
+        connection: Any = self._connection
+        if hasattr(connection, "poll"):
+            # psycopg2
+            readable, _, _ = select.select([connection], [], [], timeout)
+            if not readable:
+                return False
+            connection.poll()
+            notified = bool(connection.notifies)
+            connection.notifies.clear()
+            return notified
+        # psycopg 3
+        for _ in connection.notifies(timeout=timeout, stop_after=1):
+            return True
+        return False
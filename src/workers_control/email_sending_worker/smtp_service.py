@@ -1,9 +1,14 @@
 import email.utils
-from contextlib import contextmanager
-from dataclasses import dataclass
+import threading
+from dataclasses import dataclass, field
 from email.message import EmailMessage
-from smtplib import SMTP, SMTP_SSL
-from typing import Generator
+from smtplib import (
+    SMTP,
+    SMTP_SSL,
+    SMTPRecipientsRefused,
+    SMTPResponseException,
+    SMTPServerDisconnected,
+)
 
 from workers_control.email_sending_worker.interface import EmailSenderPlugin
 
@@ -15,11 +20,32 @@ class SmtpMailServerConfig:
     encryption_type: str
     username: str | None = None
     password: str | None = None
+    max_messages_per_connection: int = 100
+
+
+@dataclass
+class _PooledConnection:
+    smtp: SMTP | SMTP_SSL
+    messages_sent: int = 0
 
 
 @dataclass
 class SmtpMailService(EmailSenderPlugin):
+    """Keeps connections to the SMTP server open between messages, so
+    that sending a batch of messages pays for the TLS handshake and the
+    login only once. Concurrent senders each take their own connection
+    from the pool. A connection is replaced after
+    max_messages_per_connection messages and idle connections are
+    closed by close().
+    """
+
     config: SmtpMailServerConfig
+    _idle_connections: list[_PooledConnection] = field(
+        default_factory=list, init=False, repr=False
+    )
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False
+    )
 
     def send_message(
         self,
@@ -33,14 +59,41 @@ class SmtpMailService(EmailSenderPlugin):
         message["From"] = sender
         message["Date"] = email.utils.formatdate(localtime=True)
         message.set_content(html, subtype="html")
+        message["Message-ID"] = email.utils.make_msgid(domain="workers-control")
+        message["To"] = recipient
+
+        connection, is_reused = self._acquire_connection()
+        try:
+            try:
+                connection.smtp.send_message(message)
+            except SMTPServerDisconnected:
+                if not is_reused:
+                    raise
+                # The server closed the connection while it was idle.
+                connection = _PooledConnection(smtp=self.connect())
+                connection.smtp.send_message(message)
+        except (SMTPResponseException, SMTPRecipientsRefused):
+            # The server rejected the message, the connection is still
+            # usable.
+            self._release_connection(connection)
+            raise
+        except Exception:
+            connection.smtp.close()
+            raise
+        connection.messages_sent += 1
+        if connection.messages_sent >= self.config.max_messages_per_connection:
+            _quit(connection.smtp)
+        else:
+            self._release_connection(connection)
 
-        with self.create_smtp_connection() as connection:
-            message["Message-ID"] = email.utils.make_msgid(domain="workers-control")
-            message["To"] = recipient
-            connection.send_message(message)
+    def close(self) -> None:
+        with self._lock:
+            connections = self._idle_connections
+            self._idle_connections = []
+        for connection in connections:
+            _quit(connection.smtp)
 
-    @contextmanager
-    def create_smtp_connection(self) -> Generator[SMTP | SMTP_SSL, None, None]:
+    def connect(self) -> SMTP | SMTP_SSL:
         server = self.config.mail_server
         port = self.config.mail_port
         encryption_type = self.config.encryption_type
@@ -57,5 +110,24 @@ class SmtpMailService(EmailSenderPlugin):
         password = self.config.password
         if username and password:
             connection.login(username, password)
-        yield connection
+        return connection
+
+    def _acquire_connection(self) -> tuple[_PooledConnection, bool]:
+        """Returns an idle connection of the pool or a new one and
+        whether the connection was taken from the pool.
+        """
+        with self._lock:
+            if self._idle_connections:
+                return self._idle_connections.pop(), True
+        return _PooledConnection(smtp=self.connect()), False
+
+    def _release_connection(self, connection: _PooledConnection) -> None:
+        with self._lock:
+            self._idle_connections.append(connection)
+
+
+def _quit(connection: SMTP | SMTP_SSL) -> None:
+    try:
         connection.quit()
+    except (SMTPServerDisconnected, OSError):
+        connection.close()
@@ -2,7 +2,8 @@
 
 Polls the email_outbox table for unsent emails, sends them via SMTP, and
 records success or failure on each row. Designed to run as a separate process
-from the Flask app — see `flask send-emails`.
+from the Flask app — see `flask send-emails`. Several workers can run at the
+same time, each email is claimed by one of them before it is sent.
 """
 
 from __future__ import annotations
@@ -10,17 +11,37 @@ from __future__ import annotations
 import logging
 import signal
 import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
+from datetime import timedelta
 from typing import Callable
 
 from workers_control.core.datetime_service import DatetimeService
+from workers_control.core.records import Email
 from workers_control.core.repositories import DatabaseGateway
-from workers_control.email_sending_worker.interface import EmailSenderPlugin
+from workers_control.email_sending_worker.interface import (
+    EmailSenderPlugin,
+    NewEmailNotifications,
+)
+from workers_control.email_sending_worker.metrics import MetricsExporter, WorkerMetrics
 
 logger = logging.getLogger(__name__)
 
 DEFAULT_BATCH_SIZE = 5
+DEFAULT_CONCURRENCY = 1
 DEFAULT_POLL_INTERVAL_SECONDS = 5.0
+DEFAULT_CLAIM_DURATION = timedelta(minutes=5)
+DEFAULT_MAX_ATTEMPTS = 10
+DEFAULT_RETRY_DELAY = timedelta(minutes=1)
+MAX_RETRY_DELAY = timedelta(hours=6)
+
+
+class NoNotifications(NewEmailNotifications):
+    """Never wakes the worker up early, it only polls."""
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(timeout)
+        return False
 
 
 @dataclass
@@ -30,46 +51,122 @@ class EmailWorker:
     datetime_service: DatetimeService
     commit: Callable[[], None]
     batch_size: int = DEFAULT_BATCH_SIZE
+    concurrency: int = DEFAULT_CONCURRENCY
+    claim_duration: timedelta = DEFAULT_CLAIM_DURATION
+    max_attempts: int = DEFAULT_MAX_ATTEMPTS
+    retry_delay: timedelta = DEFAULT_RETRY_DELAY
     poll_interval_seconds: float = DEFAULT_POLL_INTERVAL_SECONDS
+    notifications: NewEmailNotifications = field(default_factory=NoNotifications)
+    metrics: WorkerMetrics = field(default_factory=WorkerMetrics)
+    metrics_exporters: list[MetricsExporter] = field(default_factory=list)
     _running: bool = field(default=True, init=False, repr=False)
 
     def run_once(self) -> int:
-        """Process one batch of unsent emails.
+        """Claim and process one batch of unsent emails that are due.
+        Claimed emails are skipped by other workers until the claim
+        expires, so that several workers can drain the outbox at the
+        same time. Failed emails are retried with exponential backoff
+        and moved to the dead letters after max_attempts attempts. The
+        mail service is closed once the outbox is drained, so that no
+        connections are kept open while waiting for new emails.
 
         Returns the number of emails that were sent successfully in this batch.
         """
-        emails = list(
+        now = self.datetime_service.now()
+        self.metrics.polls.inc()
+        emails = (
             self.database_gateway.get_emails()
             .that_have_not_been_sent()
-            .ordered_by_creation_date()
-            .limit(self.batch_size)
+            .that_are_due_at(now)
+            .that_are_not_claimed_at(now)
+            .ordered_by_next_attempt()
+            .claim(until=now + self.claim_duration, limit=self.batch_size)
         )
         if not emails:
+            self.mail_service.close()
             return 0
+        # Make the claims visible to other workers before sending.
+        self.commit()
         sent = 0
-        for email in emails:
-            row = self.database_gateway.get_emails().with_id(email.id)
-            try:
-                self.mail_service.send_message(
-                    subject=email.subject,
-                    recipient=email.recipient.split(","),
-                    html=email.html,
-                    sender=email.sender,
-                )
-            except Exception as exc:
-                logger.warning(
-                    "Failed to send email %s: %s", email.id, exc, exc_info=True
+        for email, error in zip(emails, self._send_all(emails)):
+            if error is None:
+                sent_at = self.datetime_service.now()
+                self.database_gateway.get_emails().with_id(
+                    email.id
+                ).update().set_sent_at(sent_at).perform()
+                sent += 1
+                self.metrics.emails_sent.inc()
+                self.metrics.attempts.observe(email.retry_count + 1)
+                self.metrics.queue_age.observe(
+                    (sent_at - email.created_at).total_seconds()
                 )
-                row.update().set_last_error(str(exc)).increment_retry_count().perform()
             else:
-                row.update().set_sent_at(self.datetime_service.now()).perform()
-                sent += 1
+                self._record_failure(email, error)
         self.commit()
+        if len(emails) < self.batch_size:
+            self.mail_service.close()
         return sent
 
+    def _record_failure(self, email: Email, error: Exception) -> None:
+        update = (
+            self.database_gateway.get_emails()
+            .with_id(email.id)
+            .update()
+            .set_last_error(str(error))
+            .increment_retry_count()
+            .release_claim()
+        )
+        attempts = email.retry_count + 1
+        self.metrics.send_failures.inc()
+        if attempts >= self.max_attempts:
+            logger.error(
+                "Giving up on email %s after %s attempts: %s",
+                email.id,
+                attempts,
+                error,
+                exc_info=error,
+            )
+            update = update.move_to_dead_letters()
+            self.metrics.dead_letters_created.inc()
+            self.metrics.attempts.observe(attempts)
+        else:
+            logger.warning(
+                "Failed to send email %s: %s", email.id, error, exc_info=error
+            )
+            delay = min(self.retry_delay * 2 ** (attempts - 1), MAX_RETRY_DELAY)
+            update = update.schedule_next_attempt(self.datetime_service.now() + delay)
+        update.perform()
+
+    def _send_all(self, emails: list[Email]) -> list[Exception | None]:
+        if self.concurrency == 1 or len(emails) == 1:
+            return [self._send(email) for email in emails]
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            return list(executor.map(self._send, emails))
+
+    def _send(self, email: Email) -> Exception | None:
+        started = time.perf_counter()
+        try:
+            self.mail_service.send_message(
+                subject=email.subject,
+                recipient=email.recipient.split(","),
+                html=email.html,
+                sender=email.sender,
+            )
+        except Exception as exc:
+            return exc
+        finally:
+            self.metrics.send_duration.observe(time.perf_counter() - started)
+        return None
+
     def run(self) -> None:
-        """Run the polling loop until SIGTERM/SIGINT is received."""
+        """Run the polling loop until SIGTERM/SIGINT is received. Between
+        polls the worker wakes up early when notified about a new email.
+        The metrics are exported after every poll.
+        """
         self._install_signal_handlers()
+        self.notifications.start()
+        for exporter in self.metrics_exporters:
+            exporter.start()
         logger.info("Email worker started")
         while self._running:
             try:
@@ -77,14 +174,33 @@ class EmailWorker:
             except Exception:
                 logger.exception("Unexpected error in email worker batch")
                 sent = 0
+            self._export_metrics()
             if sent < self.batch_size:
                 # No full batch processed — wait before polling again.
                 self._sleep_interruptible(self.poll_interval_seconds)
+        self.mail_service.close()
+        self.notifications.close()
+        for exporter in self.metrics_exporters:
+            exporter.close()
         logger.info("Email worker stopped")
 
     def stop(self) -> None:
         self._running = False
 
+    def _export_metrics(self) -> None:
+        if not self.metrics_exporters:
+            return
+        try:
+            now = self.datetime_service.now()
+            unsent = self.database_gateway.get_emails().that_have_not_been_sent()
+            self.metrics.backlog.set(unsent.that_are_due_at(now).count())
+            self.metrics.dead_letters.set(unsent.that_are_dead_letters().count())
+            self.commit()
+            for exporter in self.metrics_exporters:
+                exporter.update()
+        except Exception:
+            logger.exception("Could not export email worker metrics")
+
     def _install_signal_handlers(self) -> None:
         def handler(signum: int, frame: object) -> None:
             logger.info("Received signal %s, shutting down", signum)
@@ -95,5 +211,7 @@ class EmailWorker:
 
     def _sleep_interruptible(self, seconds: float) -> None:
         end = time.monotonic() + seconds
-        while self._running and time.monotonic() < end:
-            time.sleep(min(0.5, end - time.monotonic()))
+        while self._running and (remaining := end - time.monotonic()) > 0:
+            if self.notifications.wait(min(0.5, remaining)):
+                self.metrics.wakeups.inc()
+                return
@@ -64,6 +64,7 @@ def create_app(
 
     with app.app_context():
         from workers_control.flask.commands import (
+            check_account_balances,
             invite_accountant,
             run_alembic,
             send_emails,
@@ -80,6 +81,7 @@ def create_app(
             add_help_option=False,
         )(run_alembic)
         app.cli.command("send-emails")(send_emails)
+        app.cli.command("check-account-balances")(check_account_balances)
 
         from workers_control.db.models import Accountant, Company, Member
 
@@ -3,7 +3,7 @@ from typing import Any, Callable
 
 from flask import request
 
-from workers_control.flask.dependency_injection import create_dependency_injector
+from workers_control.flask.dependency_injection import get_dependency_injector
 from workers_control.flask.types import Response
 from workers_control.flask.views.http_error_view import http_501
 
@@ -16,7 +16,7 @@ class as_flask_view:
     def __call__(self, view_class: type[Any]) -> Callable[..., Response]:
         @wraps(view_class)
         def wrapper(*args: Any, **kwargs: Any) -> Response:
-            injector = create_dependency_injector()
+            injector = get_dependency_injector()
             view = injector.get(view_class)
             dispatched_method = getattr(view, request.method, _not_implemented_view)
             return dispatched_method(*args, **kwargs)
@@ -12,10 +12,29 @@ from workers_control.core.interactors.send_accountant_registration_token import
 from workers_control.core.repositories import DatabaseGateway
 from workers_control.db import commit_changes
 from workers_control.db.db import Database
-from workers_control.email_sending_worker.worker import EmailWorker
+from workers_control.db.repositories import AccountBalanceReconciler
+from workers_control.email_sending_worker.interface import NewEmailNotifications
+from workers_control.email_sending_worker.metrics import (
+    HttpMetricsExporter,
+    MetricsExporter,
+    TextfileMetricsExporter,
+    WorkerMetrics,
+)
+from workers_control.email_sending_worker.notifications import EmailOutboxListener
+from workers_control.email_sending_worker.worker import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_CONCURRENCY,
+    DEFAULT_POLL_INTERVAL_SECONDS,
+    EmailWorker,
+    NoNotifications,
+)
 from workers_control.flask.dependency_injection import with_injection
 from workers_control.flask.mail_sender import provide_email_sender
 
+# Notifications wake the worker up for new emails, polling only picks
+# up retries and notifications lost while reconnecting.
+POLL_INTERVAL_WITH_NOTIFICATIONS_SECONDS = 30.0
+
 
 @click.argument("email_address")
 @commit_changes
@@ -46,8 +65,38 @@ def run_alembic(args: tuple[str, ...]) -> None:
     subprocess.run(["alembic", "-x", f"db_url={db_url}", "-c", config, *args])
 
 
+@click.option(
+    "--concurrency",
+    type=click.IntRange(min=1),
+    default=DEFAULT_CONCURRENCY,
+    show_default=True,
+    help="Number of emails sent at the same time.",
+)
+@click.option(
+    "--batch-size",
+    type=click.IntRange(min=1),
+    default=DEFAULT_BATCH_SIZE,
+    show_default=True,
+    help="Number of emails claimed from the outbox at once.",
+)
+@click.option(
+    "--metrics-port",
+    type=click.IntRange(min=1, max=65535),
+    default=None,
+    help="Serve Prometheus metrics on http://127.0.0.1:<port>/metrics.",
+)
+@click.option(
+    "--metrics-textfile",
+    type=click.Path(dir_okay=False, writable=True),
+    default=None,
+    help="Write Prometheus metrics to this file after every poll.",
+)
 @with_injection()
 def send_emails(
+    concurrency: int,
+    batch_size: int,
+    metrics_port: int | None,
+    metrics_textfile: str | None,
     database_gateway: DatabaseGateway,
     datetime_service: DatetimeService,
     injector: Injector,
@@ -55,14 +104,62 @@ def send_emails(
     """Drain the email outbox via the configured ``MAIL_SENDER_PLUGIN``.
 
     Run this as a separate long-running process (e.g. under systemd). It uses
-    the same Flask configuration file as the web app.
+    the same Flask configuration file as the web app. Several processes can
+    drain the same outbox without sending an email twice. On PostgreSQL
+    the workers are woken up as soon as a new email is stored. The
+    worker's metrics can be exported for Prometheus.
     """
     mail_service = provide_email_sender(injector)
     db = Database()
+    if db.engine.dialect.name == "postgresql":
+        notifications: NewEmailNotifications = EmailOutboxListener(db.engine)
+        poll_interval = POLL_INTERVAL_WITH_NOTIFICATIONS_SECONDS
+    else:
+        notifications = NoNotifications()
+        poll_interval = DEFAULT_POLL_INTERVAL_SECONDS
+    metrics = WorkerMetrics()
+    metrics_exporters: list[MetricsExporter] = []
+    if metrics_port is not None:
+        metrics_exporters.append(HttpMetricsExporter(metrics, metrics_port))
+    if metrics_textfile is not None:
+        metrics_exporters.append(TextfileMetricsExporter(metrics, metrics_textfile))
     worker = EmailWorker(
         mail_service=mail_service,
         database_gateway=database_gateway,
         datetime_service=datetime_service,
         commit=db.session.commit,
+        batch_size=batch_size,
+        concurrency=concurrency,
+        poll_interval_seconds=poll_interval,
+        notifications=notifications,
+        metrics=metrics,
+        metrics_exporters=metrics_exporters,
     )
     worker.run()
+
+
+@click.option(
+    "--repair",
+    is_flag=True,
+    default=False,
+    help="Overwrite drifting balances with the value recomputed from transfers.",
+)
+@commit_changes
+@with_injection()
+def check_account_balances(repair: bool, reconciler: AccountBalanceReconciler) -> None:
+    """Recompute all account balances from transfers and report drift
+    against the maintained ``account_balance`` table."""
+    drifts = reconciler.find_drifts()
+    for drift in drifts:
+        click.echo(
+            f"Account {drift.account_id}: stored balance {drift.stored_balance}, "
+            f"expected {drift.expected_balance}"
+        )
+        if repair:
+            reconciler.correct(drift)
+    if not drifts:
+        click.echo("All account balances are consistent with transfers.")
+    elif repair:
+        click.echo(f"Corrected {len(drifts)} account balance(s).")
+    else:
+        click.echo(f"Found {len(drifts)} drifting account balance(s).")
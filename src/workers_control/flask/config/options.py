@@ -95,6 +95,15 @@ CONFIG_OPTIONS = [
         ],
         default="tls",
     ),
+    ConfigOption(
+        name="MAIL_MAX_MESSAGES_PER_CONNECTION",
+        converts_to_types=(int,),
+        description_paragraphs=[
+            "The email sending worker reuses its connection to the SMTP server for consecutive emails. After this many emails the connection is closed and a new one is opened.",
+            "Must be an integer larger than zero.",
+        ],
+        default="100",
+    ),
     ConfigOption(
         name="SECRET_KEY",
         converts_to_types=(str,),
@@ -156,6 +165,60 @@ CONFIG_OPTIONS = [
         ],
         default="180",
     ),
+    ConfigOption(
+        name="LINE_PLOT_MAX_POINTS",
+        converts_to_types=(int,),
+        description_paragraphs=[
+            "The maximum number of points drawn in the line plots of company accounts. Accounts with more transfers are downsampled to this many points, keeping the shape of the plot.",
+            "Must be an integer of at least 3.",
+        ],
+        default="2000",
+    ),
+    ConfigOption(
+        name="PLOT_CACHE_SIZE",
+        converts_to_types=(int,),
+        description_paragraphs=[
+            "The number of rendered account plots that each process of the application keeps in memory. A plot is rendered again only after a new transfer from or to its account.",
+            "Must be an integer larger than zero.",
+        ],
+        default="256",
+    ),
+    ConfigOption(
+        name="PLOT_CACHE_DIRECTORY",
+        converts_to_types=(str,),
+        description_paragraphs=[
+            "A directory in which rendered account plots are stored, so that all processes of the application share them and they survive restarts. The plots are written to its subdirectory ``line_plots``, and other files in the directory are left alone. The number of stored plots is limited by ``PLOT_CACHE_DIRECTORY_SIZE``. If the directory cannot be read or written, plots are rendered and served without it and a warning is logged.",
+            "Leave empty to keep rendered plots in memory only.",
+        ],
+        default='""',
+    ),
+    ConfigOption(
+        name="PLOT_CACHE_DIRECTORY_SIZE",
+        converts_to_types=(int,),
+        description_paragraphs=[
+            "The number of rendered account plots kept in ``PLOT_CACHE_DIRECTORY``. Each process checks the directory when it stores its first plot and then after every tenth of this number of stored plots. If the directory holds more plots, the plots that were read or stored least recently are deleted. Between checks the directory may therefore hold somewhat more plots. Plots of outdated states of an account are never read again and are therefore deleted first.",
+            "Must be an integer larger than zero. Has no effect if ``PLOT_CACHE_DIRECTORY`` is empty.",
+        ],
+        default="10000",
+    ),
+    ConfigOption(
+        name="PLOT_RENDERING_PROCESSES",
+        converts_to_types=(int,),
+        description_paragraphs=[
+            "The number of processes in which each process of the application renders plots. Rendering a plot blocks all other threads of its process, so with a threaded server, plots should be rendered in separate processes.",
+            "Set to 0 to render plots in the thread serving the request.",
+        ],
+        default="0",
+    ),
+    ConfigOption(
+        name="PLOT_RENDERING_TIMEOUT",
+        converts_to_types=(float,),
+        description_paragraphs=[
+            "The number of seconds to wait for a plot from the rendering processes. Requests for plots that take longer are answered with status 503. Plots whose rendering process crashed are drawn in the thread serving the request instead.",
+            "Has no effect if ``PLOT_RENDERING_PROCESSES`` is 0.",
+        ],
+        default="30",
+    ),
     ConfigOption(
         name="ALEMBIC_CONFIG",
         converts_to_types=(str,),
@@ -14,6 +14,7 @@ MAIL_PLUGIN = (
 MAIL_SENDER_PLUGIN = "workers_control.email_sending_worker.smtp_service:SmtpMailService"
 MAIL_ENCRYPTION_TYPE = "tls"
 MAIL_PORT = 587
+MAIL_MAX_MESSAGES_PER_CONNECTION = 100
 AUTO_MIGRATE = os.getenv("AUTO_MIGRATE", False)
 FORCE_HTTPS = True
 PREFERRED_URL_SCHEME = "https"
@@ -30,5 +31,11 @@ DEFAULT_USER_TIMEZONE = "UTC"
 ALLOWED_OVERDRAW_MEMBER = "0"
 ACCEPTABLE_RELATIVE_ACCOUNT_DEVIATION = "33"
 PAYOUT_FACTOR_CALCULATION_WINDOW = 180
+LINE_PLOT_MAX_POINTS = 2000
+PLOT_CACHE_SIZE = 256
+PLOT_CACHE_DIRECTORY = ""
+PLOT_CACHE_DIRECTORY_SIZE = 10000
+PLOT_RENDERING_PROCESSES = 0
+PLOT_RENDERING_TIMEOUT = 30
 
 SQLALCHEMY_DATABASE_URI = "sqlite:////tmp/workers_control.db"
@@ -1,5 +1,7 @@
 from typing import Any
 
+from flask import current_app, has_request_context
+
 from workers_control.core.interactors.list_available_languages import (
     ListAvailableLanguagesInteractor,
 )
@@ -8,17 +10,31 @@ from workers_control.web.www.presenters.list_available_languages_presenter impor
     ListAvailableLanguagesPresenter,
 )
 
+LANGUAGES_EXTENSION_KEY = "workers_control.languages"
+
+
+def add_template_variables() -> dict[str, Any]:
+    """The language listing only depends on the app configuration, so
+    it is presented once per app. Links are relative inside of requests
+    and absolute outside of them, hence the two cache entries.
+    """
+    cache = current_app.extensions.setdefault(LANGUAGES_EXTENSION_KEY, {})
+    key = has_request_context()
+    view_model = cache.get(key)
+    if view_model is None:
+        view_model = cache[key] = present_available_languages()
+    return dict(languages=view_model)
+
 
 @with_injection()
-def add_template_variables(
+def present_available_languages(
     list_languages_interactor: ListAvailableLanguagesInteractor,
     list_languages_presenter: ListAvailableLanguagesPresenter,
-) -> dict[str, Any]:
+) -> ListAvailableLanguagesPresenter.ViewModel:
     interactor_request = list_languages_interactor.Request()
     interactor_response = list_languages_interactor.list_available_languages(
         interactor_request
     )
-    view_model = list_languages_presenter.present_available_languages_list(
+    return list_languages_presenter.present_available_languages_list(
         interactor_response
     )
-    return dict(languages=view_model)
@@ -1,9 +1,9 @@
 from __future__ import annotations
 
 from functools import wraps
-from typing import Any, Callable
+from typing import Any, Callable, Dict, Optional, Type
 
-from flask import current_app
+from flask import current_app, g, has_app_context
 
 from workers_control.core import records
 from workers_control.core import repositories as interfaces
@@ -14,14 +14,25 @@ from workers_control.core.injector import (
     AliasProvider,
     Binder,
     CallableProvider,
+    ClassProvider,
     Injector,
     Module,
+    Scope,
 )
 from workers_control.core.password_hasher import PasswordHasher
-from workers_control.core.services.payout_factor import PayoutFactorConfig
+from workers_control.core.services.account_details import AccountDetailsService
+from workers_control.core.services.payout_factor import (
+    PayoutFactorConfig,
+    PayoutFactorInputsCache,
+    PayoutFactorService,
+)
+from workers_control.core.services.price_calculator import PriceCalculator
 from workers_control.db import get_social_accounting
 from workers_control.db.db import Database
-from workers_control.db.repositories import DatabaseGatewayImpl
+from workers_control.db.repositories import (
+    DatabaseGatewayImpl,
+    PayoutFactorInputsCacheImpl,
+)
 from workers_control.email_sending_worker.smtp_service import SmtpMailServerConfig
 from workers_control.flask.control_thresholds import ControlThresholdsFlask
 from workers_control.flask.datetime import (
@@ -38,6 +49,8 @@ from workers_control.flask.mail_service import provide_email_service
 from workers_control.flask.notifications import FlaskFlashNotifier
 from workers_control.flask.password_hasher import provide_password_hasher
 from workers_control.flask.payout_factor import PayoutFactorConfigImpl
+from workers_control.flask.plot_rendering import FlaskPlotRenderer
+from workers_control.flask.plotter import FlaskLinePlotConfiguration
 from workers_control.flask.text_renderer import TextRendererImpl
 from workers_control.flask.token import FlaskTokenService
 from workers_control.flask.translator import FlaskTranslator
@@ -57,6 +70,7 @@ from workers_control.web.formatters.datetime_formatter import (
 )
 from workers_control.web.language_service import LanguageService
 from workers_control.web.notification import Notifier
+from workers_control.web.plotting import LinePlotConfiguration, PlotRenderer
 from workers_control.web.request import Request
 from workers_control.web.session import Session
 from workers_control.web.text_renderer import TextRenderer
@@ -64,10 +78,42 @@ from workers_control.web.token import TokenService
 from workers_control.web.translator import Translator
 from workers_control.web.url_index import UrlIndex
 
+INJECTOR_EXTENSION_KEY = "workers_control.injector"
+
+# Stateless classes that many objects of a request depend on. They are
+# created once per request instead of once per dependent object.
+REQUEST_SCOPED_CLASSES: list[type] = [
+    AccountDetailsService,
+    DatabaseGatewayImpl,
+    FlaskDatetimeFormatter,
+    FlaskFlashNotifier,
+    FlaskSession,
+    FlaskTranslator,
+    GeneralUrlIndex,
+    PayoutFactorService,
+    PriceCalculator,
+]
+
+
+class FlaskRequestScope:
+    """Keeps request scoped instances in `flask.g`, which lives as long
+    as the application context of a request. Outside of an application
+    context request scoped instances are not reused.
+    """
+
+    def get_instances(self) -> Optional[Dict[Type, Any]]:
+        if not has_app_context():
+            return None
+        scopes = g.setdefault("injection_request_scopes", {})
+        return scopes.setdefault(self, {})
+
 
 class FlaskProductionModule(Module):
     def configure(self, binder: Binder) -> None:
         super().configure(binder)
+        binder.request_scope = FlaskRequestScope()
+        for cls in REQUEST_SCOPED_CLASSES:
+            binder[cls] = ClassProvider(cls, scope=Scope.request)
         binder.bind(
             records.SocialAccounting,
             to=CallableProvider(get_social_accounting),
@@ -100,6 +146,9 @@ class FlaskProductionModule(Module):
         binder[DatetimeFormatter] = AliasProvider(FlaskDatetimeFormatter)
         binder[TimezoneConfiguration] = AliasProvider(FlaskTimezoneConfiguration)
         binder[PayoutFactorConfig] = AliasProvider(PayoutFactorConfigImpl)
+        binder[LinePlotConfiguration] = AliasProvider(FlaskLinePlotConfiguration)
+        binder[PlotRenderer] = AliasProvider(FlaskPlotRenderer)
+        binder[PayoutFactorInputsCache] = AliasProvider(PayoutFactorInputsCacheImpl)
         binder.bind(
             AccountantInvitationEmailView,
             to=AliasProvider(AccountantInvitationEmailViewImpl),
@@ -131,6 +180,7 @@ class FlaskProductionModule(Module):
             encryption_type=cfg["MAIL_ENCRYPTION_TYPE"],
             username=cfg.get("MAIL_USERNAME") or None,
             password=cfg.get("MAIL_PASSWORD") or None,
+            max_messages_per_connection=int(cfg["MAIL_MAX_MESSAGES_PER_CONNECTION"]),
         )
 
 
@@ -155,3 +205,17 @@ class with_injection:
 
 def create_dependency_injector() -> Injector:
     return Injector([FlaskProductionModule()])
+
+
+def get_dependency_injector() -> Injector:
+    """Return the injector of the current flask app. It is created on
+    first use and shared by all requests, so that the resolution plans
+    it compiles are reused. Instances are still created for every
+    request, except for singletons.
+    """
+    injector = current_app.extensions.get(INJECTOR_EXTENSION_KEY)
+    if injector is None:
+        injector = current_app.extensions[INJECTOR_EXTENSION_KEY] = (
+            create_dependency_injector()
+        )
+    return injector
@@ -0,0 +1,51 @@
+"""Downsampling of line plots, so that series with a lot more points
+than can be told apart on a figure are rendered quickly.
+"""
+
+import numpy as np
+import numpy.typing as npt
+
+
+def largest_triangle_three_buckets(
+    x: npt.ArrayLike, y: npt.ArrayLike, max_points: int
+) -> npt.NDArray[np.intp]:
+    """Select at most max_points points of the series that preserve its
+    visual shape, using the largest triangle three buckets algorithm
+    by Sveinn Steinarsson. The first and the last point are always
+    kept. Returns the indices of the selected points in ascending order.
+
+    x must be sorted in ascending order. Scaling x or y by a constant
+    factor does not change the selection, so timestamps can be passed
+    in any unit.
+    """
+    if max_points < 3:
+        raise ValueError("At least three points are needed for downsampling.")
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    length = len(x)
+    if length <= max_points:
+        return np.arange(length)
+    bucket_count = max_points - 2
+    # Every bucket holds at least one point, since there are more inner
+    # points than buckets.
+    edges = np.linspace(1, length - 1, bucket_count + 1).astype(np.intp)
+    bucket_sizes = np.diff(edges)
+    averages_x = np.add.reduceat(x[1:-1], edges[:-1] - 1) / bucket_sizes
+    averages_y = np.add.reduceat(y[1:-1], edges[:-1] - 1) / bucket_sizes
+    # The last bucket is weighed against the last point of the series.
+    averages_x = np.append(averages_x[1:], x[-1])
+    averages_y = np.append(averages_y[1:], y[-1])
+    selected = np.empty(max_points, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = length - 1
+    previous = 0
+    for bucket in range(bucket_count):
+        start, stop = edges[bucket], edges[bucket + 1]
+        previous_x, previous_y = x[previous], y[previous]
+        doubled_areas = np.abs(
+            (previous_x - averages_x[bucket]) * (y[start:stop] - previous_y)
+            - (previous_x - x[start:stop]) * (averages_y[bucket] - previous_y)
+        )
+        previous = start + int(np.argmax(doubled_areas))
+        selected[bucket + 1] = previous
+    return selected
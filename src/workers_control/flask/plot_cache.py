@@ -0,0 +1,234 @@
+"""Rendered line plots of accounts are cached, so that repeated views
+of the same account cost a lookup of its last transfer instead of a
+rendering. Plots are kept in memory per app and, if a directory is
+configured, on disk, where all processes serving the app share them.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable, Tuple
+from uuid import UUID
+
+from flask import Response, current_app, request
+from flask_babel import get_locale
+
+from workers_control.core.records import Cursor
+from workers_control.flask.plotter import DEFAULT_LINE_PLOT_SIZE, PlotFormat
+from workers_control.web.formatters.datetime_formatter import TimezoneConfiguration
+from workers_control.web.plotting import LinePlotConfiguration
+
+PLOT_CACHE_EXTENSION_KEY = "workers_control.plot_cache"
+PLOT_CACHE_SUBDIRECTORY = "line_plots"
+
+_PLOT_FILE_NAME = re.compile(
+    r"[0-9a-f]{64}\.(%s)" % "|".join(plot_format.value for plot_format in PlotFormat)
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PlotStore:
+    """Least recently used plots in memory, backed by an optional
+    directory. Keys are used as file names. Once the directory holds more
+    than max_files plots, the plots read or written least recently are
+    deleted. Since scanning the directory is costly, it is checked on the
+    first write and then after every tenth of max_files writes, so it may
+    hold a few more plots in between. Only files named like the plots of
+    a LinePlotCache are counted and deleted. The directory is an optional
+    tier, so failures to read or write it are logged and otherwise
+    ignored.
+    """
+
+    def __init__(self, max_entries: int, directory: str | None, max_files: int) -> None:
+        self.max_entries = max_entries
+        self.directory = directory
+        self.max_files = max_files
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._lock = threading.Lock()
+        self._writes_until_pruning = 0
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            plot = self._entries.get(key)
+            if plot is not None:
+                self._entries.move_to_end(key)
+                return plot
+        plot = self._read_file(key)
+        if plot is not None:
+            self._remember(key, plot)
+        return plot
+
+    def put(self, key: str, plot: bytes) -> None:
+        self._remember(key, plot)
+        self._write_file(key, plot)
+
+    def _remember(self, key: str, plot: bytes) -> None:
+        with self._lock:
+            self._entries[key] = plot
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _read_file(self, key: str) -> bytes | None:
+        if not self.directory:
+            return None
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                plot = file.read()
+            # The modification time tells when a plot was used last.
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except OSError:
+            logger.warning("Could not read plot from %s.", path, exc_info=True)
+            return None
+        return plot
+
+    def _write_file(self, key: str, plot: bytes) -> None:
+        # The file is replaced atomically, so that other processes never
+        # read a partially written plot.
+        if not self.directory:
+            return
+        temporary_path: str | None = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "wb", dir=self.directory, suffix=".tmp", delete=False
+            ) as file:
+                temporary_path = file.name
+                file.write(plot)
+            os.replace(temporary_path, self._get_path(key))
+            temporary_path = None
+            if self._is_pruning_due():
+                self._prune_files()
+        except OSError:
+            logger.warning("Could not write plot to %s.", self.directory, exc_info=True)
+            if temporary_path is not None:
+                try:
+                    os.remove(temporary_path)
+                except OSError:
+                    pass
+
+    def _is_pruning_due(self) -> bool:
+        with self._lock:
+            if self._writes_until_pruning > 0:
+                self._writes_until_pruning -= 1
+                return False
+            self._writes_until_pruning = self.max_files // 10
+            return True
+
+    def _prune_files(self) -> None:
+        assert self.directory
+        files = []
+        with os.scandir(self.directory) as entries:
+            for entry in entries:
+                # Other files in the directory, including temporary files
+                # that are still being written, are left alone.
+                if not _PLOT_FILE_NAME.fullmatch(entry.name):
+                    continue
+                try:
+                    files.append((entry.stat().st_mtime, entry.path))
+                except FileNotFoundError:
+                    pass
+        if len(files) <= self.max_files:
+            return
+        files.sort()
+        for _, path in files[: len(files) - self.max_files]:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another process pruned the file already.
+                pass
+
+    def _get_path(self, key: str) -> str:
+        assert self.directory
+        return os.path.join(self.directory, key)
+
+
+@dataclass
+class LinePlotCache:
+    timezone_config: TimezoneConfiguration
+    line_plot_config: LinePlotConfiguration
+
+    def get_response(
+        self,
+        kind: str,
+        company: UUID,
+        last_transfer: Cursor | None,
+        render: Callable[[], bytes],
+        plot_format: PlotFormat = PlotFormat.png,
+        fig_size: Tuple[int, int] = DEFAULT_LINE_PLOT_SIZE,
+    ) -> Response:
+        """Respond with the plot of the given kind of account of the
+        company in the given format, calling render only if the plot has
+        not been cached since the last transfer of the account. Clients
+        that already have the plot get an empty response with status 304.
+        """
+        etag = self._create_etag(kind, company, last_transfer, plot_format, fig_size)
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            store = self._get_store()
+            key = f"{etag}.{plot_format.value}"
+            plot = store.get(key)
+            if plot is None:
+                plot = render()
+                store.put(key, plot)
+            response = Response(
+                plot, mimetype=plot_format.mimetype, direct_passthrough=True
+            )
+        response.set_etag(etag)
+        if last_transfer is not None:
+            response.last_modified = last_transfer.date
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        return response
+
+    def _create_etag(
+        self,
+        kind: str,
+        company: UUID,
+        last_transfer: Cursor | None,
+        plot_format: PlotFormat,
+        fig_size: Tuple[int, int],
+    ) -> str:
+        key = "|".join(
+            [
+                kind,
+                plot_format.value,
+                str(company),
+                str(last_transfer.id) if last_transfer else "",
+                last_transfer.date.isoformat() if last_transfer else "",
+                str(self.timezone_config.get_timezone_of_current_user()),
+                str(get_locale()),
+                f"{fig_size[0]}x{fig_size[1]}",
+                str(self.line_plot_config.get_max_points_of_line_plot()),
+            ]
+        )
+        return hashlib.sha256(key.encode()).hexdigest()
+
+    def _get_store(self) -> PlotStore:
+        store = current_app.extensions.get(PLOT_CACHE_EXTENSION_KEY)
+        if store is None:
+            # Plots are kept in a subdirectory of their own, so that other
+            # files in the configured directory are never pruned.
+            directory = current_app.config["PLOT_CACHE_DIRECTORY"]
+            store = current_app.extensions[PLOT_CACHE_EXTENSION_KEY] = PlotStore(
+                max_entries=int(current_app.config["PLOT_CACHE_SIZE"]),
+                directory=(
+                    os.path.join(directory, PLOT_CACHE_SUBDIRECTORY)
+                    if directory
+                    else None
+                ),
+                max_files=int(current_app.config["PLOT_CACHE_DIRECTORY_SIZE"]),
+            )
+        return store
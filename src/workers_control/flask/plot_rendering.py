@@ -0,0 +1,82 @@
+"""Matplotlib holds the GIL while it draws a plot, which stalls all
+other requests served by the threads of the same worker. If
+PLOT_RENDERING_PROCESSES is set, plots are therefore drawn in a pool of
+processes shared by the app. Plots that are not done within
+PLOT_RENDERING_TIMEOUT seconds raise PlotRenderingUnavailable. They are
+not drawn in the request thread instead, because a plot that timed out
+keeps being drawn by the pool. If the pool broke, no process draws the
+plot anymore, so the pool is replaced and the plot is drawn in the
+request thread.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable
+
+from flask import current_app
+
+PLOT_RENDERING_POOL_EXTENSION_KEY = "workers_control.plot_rendering_pool"
+
+logger = logging.getLogger(__name__)
+
+_pool_lock = threading.Lock()
+
+
+class PlotRenderingUnavailable(Exception):
+    pass
+
+
+class FlaskPlotRenderer:
+    def render(self, function: Callable[..., bytes], *args: Any) -> bytes:
+        pool = self._get_pool()
+        if pool is None:
+            return function(*args)
+        timeout = float(current_app.config["PLOT_RENDERING_TIMEOUT"])
+        try:
+            future = pool.submit(function, *args)
+        except RuntimeError:
+            # The pool is broken or was just shut down by another thread
+            # that found it broken.
+            logger.warning("Plot rendering pool is unusable, replacing it.")
+            self._discard_pool(pool)
+            return function(*args)
+        try:
+            return future.result(timeout=timeout)
+        except TimeoutError as error:
+            future.cancel()
+            logger.warning("Rendering of plot took longer than %s seconds.", timeout)
+            raise PlotRenderingUnavailable() from error
+        except BrokenProcessPool:
+            logger.warning("Plot rendering pool is broken, replacing it.")
+            self._discard_pool(pool)
+            return function(*args)
+
+    def _get_pool(self) -> ProcessPoolExecutor | None:
+        processes = int(current_app.config["PLOT_RENDERING_PROCESSES"])
+        if processes < 0:
+            raise ValueError()
+        if not processes:
+            return None
+        with _pool_lock:
+            pool = current_app.extensions.get(PLOT_RENDERING_POOL_EXTENSION_KEY)
+            if pool is None:
+                # Forking a process with running threads may copy held
+                # locks into the child, hence the processes are spawned.
+                pool = current_app.extensions[PLOT_RENDERING_POOL_EXTENSION_KEY] = (
+                    ProcessPoolExecutor(
+                        max_workers=processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                )
+            return pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor) -> None:
+        with _pool_lock:
+            if current_app.extensions.get(PLOT_RENDERING_POOL_EXTENSION_KEY) is pool:
+                del current_app.extensions[PLOT_RENDERING_POOL_EXTENSION_KEY]
+        pool.shutdown(wait=False, cancel_futures=True)
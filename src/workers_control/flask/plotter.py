@@ -1,35 +1,84 @@
+"""Plots are drawn by the module level functions of this module from
+plain numbers and strings, so that they can be rendered in another
+process by a PlotRenderer. The plotter classes gather and translate
+everything the functions need within the request.
+
+Besides PNG and SVG images the plotters return the data of a plot as
+JSON, which is drawn by the browser.
+"""
+
 import io
+import json
 from dataclasses import dataclass
-from datetime import datetime
+from datetime import UTC, datetime, tzinfo
 from decimal import Decimal
-from typing import List, Optional, Tuple, Union
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import matplotlib.dates as mdates
+import numpy as np
+import numpy.typing as npt
+from flask import current_app
 from matplotlib.backends.backend_agg import FigureCanvasAgg as FigureCanvas
 from matplotlib.figure import Figure
 from matplotlib.patches import Patch
 from matplotlib.ticker import MaxNLocator
 
 from workers_control.core.interactors import show_payout_factor_details
+from workers_control.flask.downsampling import largest_triangle_three_buckets
 from workers_control.web.colors import HexColors
 from workers_control.web.formatters.datetime_formatter import TimezoneConfiguration
+from workers_control.web.plotting import LinePlotConfiguration, PlotRenderer
 from workers_control.web.translator import Translator
 
 DEFAULT_LINE_PLOT_SIZE: Tuple[int, int] = (10, 5)
+MILLISECONDS_PER_DAY = 24 * 60 * 60 * 1000
+
+
+class PlotFormat(Enum):
+    png = "png"
+    svg = "svg"
+    json = "json"
+
+    @property
+    def mimetype(self) -> str:
+        return {
+            PlotFormat.png: "image/png",
+            PlotFormat.svg: "image/svg+xml",
+            PlotFormat.json: "application/json",
+        }[self]
+
+
+class FlaskLinePlotConfiguration:
+    def get_max_points_of_line_plot(self) -> int:
+        value = current_app.config["LINE_PLOT_MAX_POINTS"]
+        integer = int(value)
+        if integer < 3:
+            raise ValueError()
+        return integer
 
 
 @dataclass
 class GeneralPlotter:
     timezone_config: TimezoneConfiguration
+    line_plot_config: LinePlotConfiguration
+    renderer: PlotRenderer
 
     def create_line_plot(
         self,
         x: List[datetime],
         y: List[Decimal],
         fig_size: Tuple[int, int] = DEFAULT_LINE_PLOT_SIZE,
+        plot_format: PlotFormat = PlotFormat.png,
     ) -> bytes:
-        fig = self._create_line_plot_figure(x=x, y=y, fig_size=fig_size)
-        return self._figure_to_bytes(fig)
+        x_numbers, y_values, tz, fig_size = self._get_line_plot_arguments(
+            x, y, fig_size
+        )
+        if plot_format == PlotFormat.json:
+            return line_plot_to_json(x_numbers, y_values, tz)
+        return self.renderer.render(
+            render_line_plot, x_numbers, y_values, tz, fig_size, plot_format.value
+        )
 
     def _create_line_plot_figure(
         self,
@@ -37,16 +86,34 @@ class GeneralPlotter:
         y: List[Decimal],
         fig_size: Tuple[int, int] = DEFAULT_LINE_PLOT_SIZE,
     ) -> Figure:
+        return create_line_plot_figure(*self._get_line_plot_arguments(x, y, fig_size))
+
+    def _get_line_plot_arguments(
+        self, x: List[datetime], y: List[Decimal], fig_size: Tuple[int, int]
+    ) -> Tuple[
+        npt.NDArray[np.float64], npt.NDArray[np.float64], tzinfo, Tuple[int, int]
+    ]:
         tz = self.timezone_config.get_timezone_of_current_user()
-        fig = Figure()
-        ax = fig.subplots()
-        ax.axhline(linestyle="--", color="black")
-        ax.plot(x, y)  # type: ignore[arg-type]
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d", tz=tz))
-        ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=tz))
-        fig.set_size_inches(fig_size[0], fig_size[1])
-        fig.autofmt_xdate()
-        return fig
+        x, y = self._downsample(x, y)
+        return (
+            np.asarray(mdates.date2num(x), dtype=float),
+            np.fromiter(y, float, len(y)),
+            tz,
+            fig_size,
+        )
+
+    def _downsample(
+        self, x: List[datetime], y: List[Decimal]
+    ) -> Tuple[List[datetime], List[Decimal]]:
+        max_points = self.line_plot_config.get_max_points_of_line_plot()
+        if len(x) <= max_points:
+            return x, y
+        indices = largest_triangle_three_buckets(
+            np.fromiter((timestamp.timestamp() for timestamp in x), float, len(x)),
+            np.fromiter(y, float, len(y)),
+            max_points,
+        )
+        return [x[i] for i in indices], [y[i] for i in indices]
 
     def create_bar_plot(
         self,
@@ -56,16 +123,23 @@ class GeneralPlotter:
         fig_size: Tuple[int, int],
         y_label: Optional[str],
         integer_y_ticks: bool = False,
+        plot_format: PlotFormat = PlotFormat.png,
     ) -> bytes:
-        fig = self._create_bar_plot_figure(
-            x_coordinates=x_coordinates,
-            height_of_bars=height_of_bars,
-            colors_of_bars=colors_of_bars,
-            fig_size=fig_size,
-            y_label=y_label,
-            integer_y_ticks=integer_y_ticks,
+        heights = [float(height) for height in height_of_bars]
+        if plot_format == PlotFormat.json:
+            return bar_plot_to_json(
+                x_coordinates, heights, colors_of_bars, y_label, integer_y_ticks
+            )
+        return self.renderer.render(
+            render_bar_plot,
+            x_coordinates,
+            heights,
+            colors_of_bars,
+            fig_size,
+            y_label,
+            integer_y_ticks,
+            plot_format.value,
         )
-        return self._figure_to_bytes(fig)
 
     def _create_bar_plot_figure(
         self,
@@ -76,22 +150,38 @@ class GeneralPlotter:
         y_label: Optional[str],
         integer_y_ticks: bool = False,
     ) -> Figure:
-        fig = Figure()
-        ax = fig.subplots()
-        ax.bar(x_coordinates, height_of_bars, color=colors_of_bars)  # type: ignore[arg-type]
-        ax.spines["top"].set_visible(False)
-        ax.spines["right"].set_visible(False)
-        if y_label:
-            ax.set_ylabel(y_label)
-        if integer_y_ticks:
-            ax.yaxis.set_major_locator(MaxNLocator(integer=True))
-        fig.set_size_inches(fig_size[0], fig_size[1])
-        return fig
-
-    def _figure_to_bytes(self, fig: Figure) -> bytes:
-        output = io.BytesIO()
-        FigureCanvas(fig).print_png(output)
-        return output.getvalue()
+        return create_bar_plot_figure(
+            x_coordinates,
+            [float(height) for height in height_of_bars],
+            colors_of_bars,
+            fig_size,
+            y_label,
+            integer_y_ticks,
+        )
+
+
+@dataclass(frozen=True)
+class PayoutFactorDetailsPlotData:
+    plan_starts: List[float]
+    plan_durations: List[int]
+    plan_colors: List[str]
+    basic_service_dates: List[float]
+    window_start: float
+    window_end: float
+    window_center: float
+    display_start: float
+    display_end: float
+    public_color: str
+    productive_color: str
+    basic_service_color: str
+    window_color: str
+    title: str
+    plans_label: str
+    basic_services_label: str
+    window_label: str
+    now_label: str
+    public_plans_label: str
+    productive_plans_label: str
 
 
 @dataclass
@@ -99,97 +189,307 @@ class PayoutFactorDetailsPlotter:
     translator: Translator
     colors: HexColors
     timezone_config: TimezoneConfiguration
+    renderer: PlotRenderer
 
-    def plot(self, response: show_payout_factor_details.Response) -> bytes:
-        fig = self._create_figure(response)
-        buf = io.BytesIO()
-        fig.savefig(buf, format="png", bbox_inches="tight", pad_inches=0.5)
-        buf.seek(0)
-        return buf.getvalue()
+    def plot(
+        self,
+        response: show_payout_factor_details.Response,
+        plot_format: PlotFormat = PlotFormat.png,
+    ) -> bytes:
+        data = self._get_plot_data(response)
+        tz = self.timezone_config.get_timezone_of_current_user()
+        if plot_format == PlotFormat.json:
+            return payout_factor_details_plot_to_json(data, tz)
+        return self.renderer.render(
+            render_payout_factor_details_plot, data, tz, plot_format.value
+        )
 
     def _create_figure(self, response: show_payout_factor_details.Response) -> Figure:
-        tz = self.timezone_config.get_timezone_of_current_user()
+        return create_payout_factor_details_figure(
+            self._get_plot_data(response),
+            self.timezone_config.get_timezone_of_current_user(),
+        )
 
+    def _get_plot_data(
+        self, response: show_payout_factor_details.Response
+    ) -> PayoutFactorDetailsPlotData:
         public_color = self.colors.warning
         productive_color = self.colors.primary
+        return PayoutFactorDetailsPlotData(
+            plan_starts=[mdates.date2num(p.approval_date) for p in response.plans],
+            plan_durations=[
+                (p.expiration_date - p.approval_date).days for p in response.plans
+            ],
+            plan_colors=[
+                public_color if p.is_public_service else productive_color
+                for p in response.plans
+            ],
+            basic_service_dates=[
+                mdates.date2num(c.date) for c in response.basic_service_consumptions
+            ],
+            window_start=mdates.date2num(response.window_start),
+            window_end=mdates.date2num(response.window_end),
+            window_center=mdates.date2num(response.window_center),
+            display_start=mdates.date2num(response.display_start),
+            display_end=mdates.date2num(response.display_end),
+            public_color=public_color,
+            productive_color=productive_color,
+            basic_service_color=self.colors.success,
+            window_color=self.colors.danger,
+            title=self.translator.gettext("Payout Factor Calculation Window"),
+            plans_label=self.translator.gettext("Plans"),
+            basic_services_label=self.translator.gettext("Basic services"),
+            window_label=self.translator.gettext("Calculation window"),
+            now_label=self.translator.gettext("Now"),
+            public_plans_label=self.translator.gettext("Public plans"),
+            productive_plans_label=self.translator.gettext("Productive plans"),
+        )
 
-        plan_indices: list[int] = []
-        start: list[datetime] = []
-        end: list[datetime] = []
-        colors_list: list[str] = []
 
-        for i, p in enumerate(response.plans):
-            plan_indices.append(i)
-            start.append(p.approval_date)
-            end.append(p.expiration_date)
-            colors_list.append(
-                public_color if p.is_public_service else productive_color
-            )
+def render_line_plot(
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    tz: tzinfo,
+    fig_size: Tuple[int, int],
+    image_format: str = "png",
+) -> bytes:
+    return figure_to_image(create_line_plot_figure(x, y, tz, fig_size), image_format)
 
-        plan_durations = [(e - s).days for s, e in zip(start, end)]
-        bs_row_y = -1
 
-        fig = Figure()
-        ax = fig.add_subplot(1, 1, 1)
+def create_line_plot_figure(
+    x: npt.NDArray[np.float64],
+    y: npt.NDArray[np.float64],
+    tz: tzinfo,
+    fig_size: Tuple[int, int],
+) -> Figure:
+    """x holds the dates of the points as matplotlib date numbers."""
+    fig = Figure()
+    ax = fig.subplots()
+    ax.axhline(linestyle="--", color="black")
+    ax.plot(x, y)
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m-%d", tz=tz))
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=tz))
+    fig.set_size_inches(fig_size[0], fig_size[1])
+    fig.autofmt_xdate()
+    return fig
 
-        ax.barh(
-            plan_indices,
-            plan_durations,
-            left=[mdates.date2num(s) for s in start],
-            color=colors_list,
-        )
-        bs_label = self.translator.gettext("Basic services")
-        bs_dates = [
-            mdates.date2num(c.date) for c in response.basic_service_consumptions
-        ]
-        ax.scatter(
-            bs_dates,
-            [bs_row_y] * len(bs_dates),
-            marker="*",
-            s=80,
-            color=self.colors.success,
-            label=bs_label,
-            zorder=3,
-        )
-        ax.set_yticks(plan_indices)
-
-        title = self.translator.gettext("Payout Factor Calculation Window")
-        ax.set_title(title)
-        ylabel = self.translator.gettext("Plans")
-        ax.set_ylabel(ylabel)
-
-        ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m", tz=tz))
-        ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=tz))
-        fig.autofmt_xdate()
-        ax.invert_yaxis()
-        ax.grid(axis="x", linestyle="--", alpha=0.6)
-
-        ax.axvspan(
-            mdates.date2num(response.window_start),
-            mdates.date2num(response.window_end),
-            alpha=0.25,
-            color=self.colors.danger,
-            label=self.translator.gettext("Calculation window"),
-        )
-        ax.axvline(
-            mdates.date2num(response.window_center),
-            linestyle="--",
-            linewidth=1,
-            label=self.translator.gettext("Now"),
-        )
-        plan_type_handles = [
-            Patch(color=public_color, label=self.translator.gettext("Public plans")),
-            Patch(
-                color=productive_color,
-                label=self.translator.gettext("Productive plans"),
-            ),
+
+def render_bar_plot(
+    x_coordinates: List[Union[int, str]],
+    height_of_bars: List[float],
+    colors_of_bars: List[str],
+    fig_size: Tuple[int, int],
+    y_label: Optional[str],
+    integer_y_ticks: bool,
+    image_format: str = "png",
+) -> bytes:
+    return figure_to_image(
+        create_bar_plot_figure(
+            x_coordinates,
+            height_of_bars,
+            colors_of_bars,
+            fig_size,
+            y_label,
+            integer_y_ticks,
+        ),
+        image_format,
+    )
+
+
+def create_bar_plot_figure(
+    x_coordinates: List[Union[int, str]],
+    height_of_bars: List[float],
+    colors_of_bars: List[str],
+    fig_size: Tuple[int, int],
+    y_label: Optional[str],
+    integer_y_ticks: bool,
+) -> Figure:
+    fig = Figure()
+    ax = fig.subplots()
+    ax.bar(x_coordinates, height_of_bars, color=colors_of_bars)  # type: ignore[arg-type]
+    ax.spines["top"].set_visible(False)
+    ax.spines["right"].set_visible(False)
+    if y_label:
+        ax.set_ylabel(y_label)
+    if integer_y_ticks:
+        ax.yaxis.set_major_locator(MaxNLocator(integer=True))
+    fig.set_size_inches(fig_size[0], fig_size[1])
+    return fig
+
+
+def render_payout_factor_details_plot(
+    data: PayoutFactorDetailsPlotData, tz: tzinfo, image_format: str = "png"
+) -> bytes:
+    fig = create_payout_factor_details_figure(data, tz)
+    buf = io.BytesIO()
+    fig.savefig(buf, format=image_format, bbox_inches="tight", pad_inches=0.5)
+    return buf.getvalue()
+
+
+def create_payout_factor_details_figure(
+    data: PayoutFactorDetailsPlotData, tz: tzinfo
+) -> Figure:
+    plan_indices = list(range(len(data.plan_starts)))
+    bs_row_y = -1
+
+    fig = Figure()
+    ax = fig.add_subplot(1, 1, 1)
+
+    ax.barh(
+        plan_indices,
+        data.plan_durations,
+        left=data.plan_starts,
+        color=data.plan_colors,
+    )
+    ax.scatter(
+        data.basic_service_dates,
+        [bs_row_y] * len(data.basic_service_dates),
+        marker="*",
+        s=80,
+        color=data.basic_service_color,
+        label=data.basic_services_label,
+        zorder=3,
+    )
+    ax.set_yticks(plan_indices)
+
+    ax.set_title(data.title)
+    ax.set_ylabel(data.plans_label)
+
+    ax.xaxis.set_major_formatter(mdates.DateFormatter("%Y-%m", tz=tz))
+    ax.xaxis.set_major_locator(mdates.AutoDateLocator(tz=tz))
+    fig.autofmt_xdate()
+    ax.invert_yaxis()
+    ax.grid(axis="x", linestyle="--", alpha=0.6)
+
+    ax.axvspan(
+        data.window_start,
+        data.window_end,
+        alpha=0.25,
+        color=data.window_color,
+        label=data.window_label,
+    )
+    ax.axvline(
+        data.window_center,
+        linestyle="--",
+        linewidth=1,
+        label=data.now_label,
+    )
+    plan_type_handles = [
+        Patch(color=data.public_color, label=data.public_plans_label),
+        Patch(color=data.productive_color, label=data.productive_plans_label),
+    ]
+    handles, _ = ax.get_legend_handles_labels()
+    ax.legend(handles=plan_type_handles + handles)
+    fig.set_size_inches(14, (len(plan_indices) + 1) * 0.3 + 2)
+
+    ax.set_xlim(data.display_start, data.display_end)
+    return fig
+
+
+def figure_to_image(fig: Figure, image_format: str) -> bytes:
+    output = io.BytesIO()
+    FigureCanvas(fig).print_figure(output, format=image_format)
+    return output.getvalue()
+
+
+def line_plot_to_json(
+    x: npt.NDArray[np.float64], y: npt.NDArray[np.float64], tz: tzinfo
+) -> bytes:
+    return _to_json(
+        {
+            "type": "line",
+            "timezone": str(tz),
+            "x": date_numbers_to_milliseconds(x),
+            "y": y.tolist(),
+        }
+    )
+
+
+def bar_plot_to_json(
+    x_coordinates: List[Union[int, str]],
+    height_of_bars: List[float],
+    colors_of_bars: List[str],
+    y_label: Optional[str],
+    integer_y_ticks: bool,
+) -> bytes:
+    return _to_json(
+        {
+            "type": "bar",
+            "labels": [str(x) for x in x_coordinates],
+            "heights": height_of_bars,
+            "colors": colors_of_bars,
+            "y_label": y_label,
+            "integer_y_ticks": integer_y_ticks,
+        }
+    )
+
+
+def payout_factor_details_plot_to_json(
+    data: PayoutFactorDetailsPlotData, tz: tzinfo
+) -> bytes:
+    plan_starts = date_numbers_to_milliseconds(data.plan_starts)
+    (
+        window_start,
+        window_end,
+        window_center,
+        display_start,
+        display_end,
+    ) = date_numbers_to_milliseconds(
+        [
+            data.window_start,
+            data.window_end,
+            data.window_center,
+            data.display_start,
+            data.display_end,
         ]
-        handles, _ = ax.get_legend_handles_labels()
-        ax.legend(handles=plan_type_handles + handles)
-        fig.set_size_inches(14, (len(plan_indices) + 1) * 0.3 + 2)
+    )
+    return _to_json(
+        {
+            "type": "payout_factor_details",
+            "timezone": str(tz),
+            "title": data.title,
+            "y_label": data.plans_label,
+            "plans": [
+                {
+                    "start": start,
+                    "end": start + duration * MILLISECONDS_PER_DAY,
+                    "color": color,
+                }
+                for start, duration, color in zip(
+                    plan_starts, data.plan_durations, data.plan_colors, strict=True
+                )
+            ],
+            "basic_services": date_numbers_to_milliseconds(data.basic_service_dates),
+            "window": {"start": window_start, "end": window_end},
+            "now": window_center,
+            "display": {"start": display_start, "end": display_end},
+            "legend": {
+                "public_plans": {
+                    "label": data.public_plans_label,
+                    "color": data.public_color,
+                },
+                "productive_plans": {
+                    "label": data.productive_plans_label,
+                    "color": data.productive_color,
+                },
+                "basic_services": {
+                    "label": data.basic_services_label,
+                    "color": data.basic_service_color,
+                },
+                "window": {"label": data.window_label, "color": data.window_color},
+                "now": {"label": data.now_label},
+            },
+        }
+    )
 
-        ax.set_xlim(
-            mdates.date2num(response.display_start),
-            mdates.date2num(response.display_end),
-        )
-        return fig
+
+def date_numbers_to_milliseconds(numbers: Iterable[float]) -> List[int]:
+    """Convert matplotlib date numbers into milliseconds since the Unix
+    epoch, which is how JavaScript represents dates.
+    """
+    unix_epoch = mdates.date2num(datetime(1970, 1, 1, tzinfo=UTC))
+    return [round((number - unix_epoch) * MILLISECONDS_PER_DAY) for number in numbers]
+
+
+def _to_json(data: Dict[str, Any]) -> bytes:
+    return json.dumps(data, separators=(",", ":")).encode()
@@ -4,7 +4,7 @@ from typing import Any, Callable, TypeVar
 from flask import Blueprint, redirect
 
 from workers_control.flask import types
-from workers_control.flask.dependency_injection import create_dependency_injector
+from workers_control.flask.dependency_injection import get_dependency_injector
 from workers_control.web.www.authentication import AccountantAuthenticator
 
 ViewFunction = TypeVar("ViewFunction", bound=Callable)
@@ -25,7 +25,7 @@ class AccountantRoute:
     def __call__(self, view_function: ViewFunction) -> ViewFunction:
         @wraps(view_function)
         def _wrapper(*args: Any, **kwargs: Any) -> types.Response:
-            injector = create_dependency_injector()
+            injector = get_dependency_injector()
             authenticator = injector.get(AccountantAuthenticator)
             if (
                 redirect_url := authenticator.redirect_unauthenticated_user_to_start_page()
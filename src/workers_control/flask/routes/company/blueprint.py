@@ -4,7 +4,7 @@ from typing import Any, Callable
 from flask import Blueprint, redirect
 
 from workers_control.flask import types
-from workers_control.flask.dependency_injection import create_dependency_injector
+from workers_control.flask.dependency_injection import get_dependency_injector
 from workers_control.web.www.authentication import CompanyAuthenticator
 
 main_company = Blueprint("main_company", __name__)
@@ -20,7 +20,7 @@ class CompanyRoute:
     ) -> Callable[..., types.Response]:
         @wraps(view_function)
         def _wrapper(*args: Any, **kwargs: Any) -> types.Response:
-            injector = create_dependency_injector()
+            injector = get_dependency_injector()
             authenticator = injector.get(CompanyAuthenticator)
             redirect_url = authenticator.redirect_user_to_company_login()
             if redirect_url:
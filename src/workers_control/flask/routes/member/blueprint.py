@@ -4,7 +4,7 @@ from typing import Any, Callable, List, Optional
 from flask import Blueprint, redirect
 
 from workers_control.flask import types
-from workers_control.flask.dependency_injection import create_dependency_injector
+from workers_control.flask.dependency_injection import get_dependency_injector
 from workers_control.web.www.authentication import MemberAuthenticator
 
 main_member = Blueprint("main_member", __name__)
@@ -23,7 +23,7 @@ class MemberRoute:
     ) -> Callable[..., types.Response]:
         @wraps(view_function)
         def _wrapper(*args: Any, **kwargs: Any) -> types.Response:
-            injector = create_dependency_injector()
+            injector = get_dependency_injector()
             authenticator = injector.get(MemberAuthenticator)
             redirect_url = authenticator.redirect_user_to_member_login()
             if redirect_url:
@@ -17,6 +17,10 @@ from workers_control.core.interactors.show_prd_account_details import (
 )
 from workers_control.flask import plotter
 from workers_control.flask.dependency_injection import with_injection
+from workers_control.flask.plot_cache import LinePlotCache
+from workers_control.flask.plot_rendering import PlotRenderingUnavailable
+from workers_control.flask.plotter import PlotFormat
+from workers_control.flask.views.http_error_view import http_400, http_503
 from workers_control.web.colors import HexColors
 from workers_control.web.translator import Translator
 from workers_control.web.www.controllers.show_a_account_details_controller import (
@@ -29,16 +33,38 @@ from workers_control.web.www.controllers.show_prd_account_details_controller imp
 plots = Blueprint("plots", __name__)
 
 
+@plots.errorhandler(PlotRenderingUnavailable)
+def plot_rendering_unavailable(error: PlotRenderingUnavailable) -> Response:
+    return http_503()
+
+
+def get_plot_format() -> PlotFormat | None:
+    """Plots are returned as PNG unless the format query argument asks
+    for svg or json.
+    """
+    try:
+        return PlotFormat(request.args.get("format", PlotFormat.png.value))
+    except ValueError:
+        return None
+
+
+def create_plot_response(plot: bytes, plot_format: PlotFormat) -> Response:
+    return Response(plot, mimetype=plot_format.mimetype, direct_passthrough=True)
+
+
 @plots.route("/plots/global_barplot_for_means_of_production")
 @with_injection()
 @login_required
 def global_barplot_for_means_of_production(
     plotter: plotter.GeneralPlotter, translator: Translator, colors: HexColors
 ) -> Response:
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
     planned_means = Decimal(request.args["planned_means"])
     planned_resources = Decimal(request.args["planned_resources"])
     planned_work = Decimal(request.args["planned_work"])
-    png = plotter.create_bar_plot(
+    plot = plotter.create_bar_plot(
         x_coordinates=[
             translator.pgettext("Text should be short", "Fixed means"),
             translator.pgettext("Text should be short", "Liquid means"),
@@ -56,8 +82,9 @@ def global_barplot_for_means_of_production(
         ],
         fig_size=(5, 4),
         y_label=translator.gettext("Hours"),
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
+    return create_plot_response(plot, plot_format)
 
 
 @plots.route("/plots/global_barplot_for_plans")
@@ -66,9 +93,12 @@ def global_barplot_for_means_of_production(
 def global_barplot_for_plans(
     plotter: plotter.GeneralPlotter, translator: Translator, colors: HexColors
 ) -> Response:
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
     productive_plans = Decimal(request.args["productive_plans"])
     public_plans = Decimal(request.args["public_plans"])
-    png = plotter.create_bar_plot(
+    plot = plotter.create_bar_plot(
         x_coordinates=[
             translator.gettext("Productive plans"),
             translator.gettext("Public plans"),
@@ -78,8 +108,9 @@ def global_barplot_for_plans(
         fig_size=(5, 4),
         y_label=translator.gettext("Amount"),
         integer_y_ticks=True,
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
+    return create_plot_response(plot, plot_format)
 
 
 @plots.route("/plots/line_plot_of_company_prd_account")
@@ -88,16 +119,30 @@ def global_barplot_for_plans(
 def line_plot_of_company_prd_account(
     controller: ShowPRDAccountDetailsController,
     plotter: plotter.GeneralPlotter,
+    plot_cache: LinePlotCache,
     interactor: ShowPRDAccountDetailsInteractor,
 ) -> Response:
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
     company_id = UUID(request.args["company_id"])
     interactor_request = controller.create_request(company_id)
-    interactor_response = interactor.show_details(interactor_request)
-    png = plotter.create_line_plot(
-        x=interactor_response.plot.timestamps,
-        y=interactor_response.plot.accumulated_volumes,
+
+    def render() -> bytes:
+        plot_details = interactor.get_plot_details(interactor_request)
+        return plotter.create_line_plot(
+            x=plot_details.timestamps,
+            y=plot_details.accumulated_volumes,
+            plot_format=plot_format,
+        )
+
+    return plot_cache.get_response(
+        kind="prd",
+        company=company_id,
+        last_transfer=interactor.get_last_transfer(interactor_request),
+        render=render,
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
 
 
 @plots.route("/plots/line_plot_of_company_r_account")
@@ -105,17 +150,30 @@ def line_plot_of_company_prd_account(
 @login_required
 def line_plot_of_company_r_account(
     plotter: plotter.GeneralPlotter,
+    plot_cache: LinePlotCache,
     interactor: show_r_account_details.ShowRAccountDetailsInteractor,
 ) -> Response:
-    interactor_request = show_r_account_details.Request(
-        company=UUID(request.args["company_id"])
-    )
-    interactor_response = interactor.show_details(request=interactor_request)
-    png = plotter.create_line_plot(
-        x=interactor_response.plot.timestamps,
-        y=interactor_response.plot.accumulated_volumes,
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
+    company_id = UUID(request.args["company_id"])
+    interactor_request = show_r_account_details.Request(company=company_id)
+
+    def render() -> bytes:
+        plot_details = interactor.get_plot_details(interactor_request)
+        return plotter.create_line_plot(
+            x=plot_details.timestamps,
+            y=plot_details.accumulated_volumes,
+            plot_format=plot_format,
+        )
+
+    return plot_cache.get_response(
+        kind="r",
+        company=company_id,
+        last_transfer=interactor.get_last_transfer(interactor_request),
+        render=render,
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
 
 
 @plots.route("/plots/line_plot_of_company_p_account")
@@ -123,17 +181,30 @@ def line_plot_of_company_r_account(
 @login_required
 def line_plot_of_company_p_account(
     plotter: plotter.GeneralPlotter,
+    plot_cache: LinePlotCache,
     interactor: ShowPAccountDetailsInteractor,
 ) -> Response:
-    interactor_request = ShowPAccountDetailsInteractor.Request(
-        company=UUID(request.args["company_id"])
-    )
-    interactor_response = interactor.show_details(request=interactor_request)
-    png = plotter.create_line_plot(
-        x=interactor_response.plot.timestamps,
-        y=interactor_response.plot.accumulated_volumes,
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
+    company_id = UUID(request.args["company_id"])
+    interactor_request = ShowPAccountDetailsInteractor.Request(company=company_id)
+
+    def render() -> bytes:
+        plot_details = interactor.get_plot_details(interactor_request)
+        return plotter.create_line_plot(
+            x=plot_details.timestamps,
+            y=plot_details.accumulated_volumes,
+            plot_format=plot_format,
+        )
+
+    return plot_cache.get_response(
+        kind="p",
+        company=company_id,
+        last_transfer=interactor.get_last_transfer(interactor_request),
+        render=render,
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
 
 
 @plots.route("/plots/line_plot_of_company_a_account")
@@ -141,17 +212,31 @@ def line_plot_of_company_p_account(
 @login_required
 def line_plot_of_company_a_account(
     plotter: plotter.GeneralPlotter,
+    plot_cache: LinePlotCache,
     controller: ShowAAccountDetailsController,
     interactor: show_a_account_details.ShowAAccountDetailsInteractor,
 ) -> Response:
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
     company_id = UUID(request.args["company_id"])
     interactor_request = controller.create_request(company_id)
-    interactor_response = interactor.show_details(request=interactor_request)
-    png = plotter.create_line_plot(
-        x=interactor_response.plot.timestamps,
-        y=interactor_response.plot.accumulated_volumes,
+
+    def render() -> bytes:
+        plot_details = interactor.get_plot_details(interactor_request)
+        return plotter.create_line_plot(
+            x=plot_details.timestamps,
+            y=plot_details.accumulated_volumes,
+            plot_format=plot_format,
+        )
+
+    return plot_cache.get_response(
+        kind="a",
+        company=company_id,
+        last_transfer=interactor.get_last_transfer(interactor_request),
+        render=render,
+        plot_format=plot_format,
     )
-    return Response(png, mimetype="image/png", direct_passthrough=True)
 
 
 @plots.route("/plots/payout_factor_details_bar_plot")
@@ -161,6 +246,9 @@ def payout_factor_details_bar_plot(
     interactor: show_payout_factor_details.ShowPayoutFactorDetailsInteractor,
     plotter: plotter.PayoutFactorDetailsPlotter,
 ) -> Response:
+    plot_format = get_plot_format()
+    if plot_format is None:
+        return http_400()
     interactor_response = interactor.show_payout_factor_details()
-    png = plotter.plot(interactor_response)
-    return Response(png, mimetype="image/png", direct_passthrough=True)
+    plot = plotter.plot(interactor_response, plot_format)
+    return create_plot_response(plot, plot_format)
@@ -4,7 +4,7 @@ from typing import Any, Callable, TypeVar
 from flask import Blueprint, redirect, request
 
 from workers_control.flask import types
-from workers_control.flask.dependency_injection import create_dependency_injector
+from workers_control.flask.dependency_injection import get_dependency_injector
 from workers_control.flask.views.http_error_view import http_403
 from workers_control.web.www.authentication import UserAuthenticator
 
@@ -21,7 +21,7 @@ class AuthenticatedUserRoute:
     def __call__(self, view_function: ViewFunction) -> ViewFunction:
         @wraps(view_function)
         def wrapper(*args: Any, **kwargs: Any) -> types.Response:
-            injector = create_dependency_injector()
+            injector = get_dependency_injector()
             authenticator = injector.get(UserAuthenticator)
             if not authenticator.is_user_authenticated():
                 if request.method == "GET":
@@ -1,5 +1,6 @@
 document.addEventListener('DOMContentLoaded', () => {
     setupCopyToggles();
+    setupPlots();
 });
 
 function setupCopyToggles() {
@@ -23,3 +24,298 @@ function setupCopyToggles() {
         });
     });
 }
+
+// Plots are drawn in the browser from the data of the plot, which is
+// fetched with format=json. If that fails, the PNG image is shown
+// instead, as it is for browsers without JavaScript.
+const SVG_NAMESPACE = "http://www.w3.org/2000/svg";
+const DAY = 24 * 60 * 60 * 1000;
+const DATE_TICK_STEPS = [[1, 0], [2, 0], [7, 0], [14, 0], [0, 1], [0, 2], [0, 3], [0, 6], [0, 12], [0, 24], [0, 60]];
+
+function setupPlots() {
+    document.querySelectorAll('[data-type="plot"]').forEach(async el => {
+        const url = new URL(el.dataset.url, document.baseURI);
+        url.searchParams.set("format", "json");
+        try {
+            const response = await fetch(url, { credentials: "same-origin" });
+            if (!response.ok) {
+                throw new Error(`Plot could not be loaded: ${response.status}`);
+            }
+            const svg = drawPlot(await response.json());
+            svg.setAttribute("role", "img");
+            svg.setAttribute("aria-label", el.dataset.alt);
+            el.replaceChildren(svg);
+        } catch (error) {
+            console.error(error);
+            const img = document.createElement("img");
+            img.src = el.dataset.url;
+            img.alt = el.dataset.alt;
+            el.replaceChildren(img);
+        }
+    });
+}
+
+function drawPlot(data) {
+    switch (data.type) {
+        case "line":
+            return drawLinePlot(data);
+        case "bar":
+            return drawBarPlot(data);
+        case "payout_factor_details":
+            return drawPayoutFactorDetailsPlot(data);
+        default:
+            throw new Error(`Unknown plot type: ${data.type}`);
+    }
+}
+
+function drawLinePlot(data) {
+    const width = 1000, height = 500;
+    const left = 70, right = width - 20, top = 20, bottom = height - 90;
+    const svg = createChart(width, height);
+    const [xStart, xEnd] = data.x.length
+        ? [minimum(data.x), maximum(data.x)]
+        : [Date.now() - DAY, Date.now()];
+    const yTicks = niceTicks(Math.min(0, minimum(data.y)), Math.max(0, maximum(data.y)), 8, false);
+    const x = scale(xStart, xEnd, left, right);
+    const y = scale(yTicks[0], yTicks.at(-1), bottom, top);
+    drawYAxis(svg, y, yTicks, left, right, null);
+    drawXAxis(svg, x, dateTicks(xStart, xEnd, data.timezone, 10), top, bottom, tick => formatDate(tick, data.timezone, true));
+    append(svg, "line", { x1: left, x2: right, y1: y(0), y2: y(0), stroke: "black", "stroke-dasharray": "6 4" });
+    append(svg, "polyline", {
+        points: data.x.map((value, i) => `${x(value)},${y(data.y[i])}`).join(" "),
+        fill: "none",
+        stroke: "#1f77b4",
+        "stroke-width": 1.5,
+    });
+    return svg;
+}
+
+function drawBarPlot(data) {
+    const width = 500, height = 400;
+    const left = 70, right = width - 10, top = 15, bottom = height - 40;
+    const svg = createChart(width, height);
+    const yTicks = niceTicks(Math.min(0, minimum(data.heights)), Math.max(0, maximum(data.heights)), 6, data.integer_y_ticks);
+    const y = scale(yTicks[0], yTicks.at(-1), bottom, top);
+    const band = (right - left) / Math.max(1, data.labels.length);
+    drawYAxis(svg, y, yTicks, left, left, data.y_label);
+    data.labels.forEach((label, i) => {
+        const [barTop, barBottom] = [y(Math.max(0, data.heights[i])), y(Math.min(0, data.heights[i]))];
+        append(svg, "rect", {
+            x: left + band * (i + 0.1),
+            y: barTop,
+            width: band * 0.8,
+            height: barBottom - barTop,
+            fill: data.colors[i],
+        });
+        append(svg, "text", { x: left + band * (i + 0.5), y: bottom + 20, "text-anchor": "middle" }, label);
+    });
+    append(svg, "line", { x1: left, x2: right, y1: bottom, y2: bottom, stroke: "black" });
+    return svg;
+}
+
+function drawPayoutFactorDetailsPlot(data) {
+    const rowHeight = 24;
+    const width = 1400, height = (data.plans.length + 1) * rowHeight + 190;
+    const left = 60, right = width - 20, top = 80, bottom = height - 90;
+    const svg = createChart(width, height);
+    const x = scale(data.display.start, data.display.end, left, right);
+    // The basic services are drawn in the row above the first plan.
+    const rowCenter = index => top + (index + 1.5) * rowHeight;
+    const plot = append(svg, "svg", { x: left, y: top, width: right - left, height: bottom - top, overflow: "hidden" });
+    const content = append(plot, "g", { transform: `translate(${-left} ${-top})` });
+    drawXAxis(svg, x, dateTicks(data.display.start, data.display.end, data.timezone, 12), top, bottom, tick => formatDate(tick, data.timezone, false), true);
+    append(content, "rect", {
+        x: x(data.window.start),
+        y: top,
+        width: x(data.window.end) - x(data.window.start),
+        height: bottom - top,
+        fill: data.legend.window.color,
+        "fill-opacity": 0.25,
+    });
+    data.plans.forEach((plan, i) => {
+        append(content, "rect", {
+            x: x(plan.start),
+            y: rowCenter(i) - rowHeight * 0.4,
+            width: x(plan.end) - x(plan.start),
+            height: rowHeight * 0.8,
+            fill: plan.color,
+        });
+        append(svg, "text", { x: left - 8, y: rowCenter(i), "text-anchor": "end", "dominant-baseline": "middle" }, String(i));
+    });
+    data.basic_services.forEach(date => {
+        append(content, "text", {
+            x: x(date),
+            y: rowCenter(-1),
+            "text-anchor": "middle",
+            "dominant-baseline": "central",
+            "font-size": 18,
+            fill: data.legend.basic_services.color,
+        }, "★");
+    });
+    append(content, "line", { x1: x(data.now), x2: x(data.now), y1: top, y2: bottom, stroke: "#1f77b4", "stroke-dasharray": "6 4" });
+    append(svg, "rect", { x: left, y: top, width: right - left, height: bottom - top, fill: "none", stroke: "black" });
+    append(svg, "text", { x: (left + right) / 2, y: 22, "text-anchor": "middle", "font-size": 16 }, data.title);
+    append(svg, "text", {
+        transform: `translate(18 ${(top + bottom) / 2}) rotate(-90)`,
+        "text-anchor": "middle",
+    }, data.y_label);
+    drawLegend(svg, left, 50, [
+        { ...data.legend.public_plans, shape: "rect" },
+        { ...data.legend.productive_plans, shape: "rect" },
+        { ...data.legend.basic_services, shape: "star" },
+        { ...data.legend.window, shape: "rect", opacity: 0.25 },
+        { ...data.legend.now, color: "#1f77b4", shape: "line" },
+    ]);
+    return svg;
+}
+
+function createChart(width, height) {
+    const svg = document.createElementNS(SVG_NAMESPACE, "svg");
+    svg.setAttribute("viewBox", `0 0 ${width} ${height}`);
+    svg.setAttribute("width", "100%");
+    svg.setAttribute("font-family", "sans-serif");
+    svg.setAttribute("font-size", 12);
+    return svg;
+}
+
+function append(parent, name, attributes, text) {
+    const el = document.createElementNS(SVG_NAMESPACE, name);
+    Object.entries(attributes).forEach(([key, value]) => el.setAttribute(key, value));
+    if (text !== undefined) {
+        el.textContent = text;
+    }
+    parent.appendChild(el);
+    return el;
+}
+
+function drawYAxis(svg, y, ticks, left, right, label) {
+    ticks.forEach(tick => {
+        append(svg, "line", { x1: left - 5, x2: left, y1: y(tick), y2: y(tick), stroke: "black" });
+        if (right > left) {
+            append(svg, "line", { x1: left, x2: right, y1: y(tick), y2: y(tick), stroke: "#ddd" });
+        }
+        append(svg, "text", { x: left - 8, y: y(tick), "text-anchor": "end", "dominant-baseline": "middle" }, tick.toLocaleString());
+    });
+    append(svg, "line", { x1: left, x2: left, y1: y(ticks[0]), y2: y(ticks.at(-1)), stroke: "black" });
+    if (label) {
+        append(svg, "text", {
+            transform: `translate(15 ${(y(ticks[0]) + y(ticks.at(-1))) / 2}) rotate(-90)`,
+            "text-anchor": "middle",
+        }, label);
+    }
+}
+
+function drawXAxis(svg, x, ticks, top, bottom, formatTick, dashedGrid = false) {
+    ticks.forEach(tick => {
+        if (dashedGrid) {
+            append(svg, "line", { x1: x(tick), x2: x(tick), y1: top, y2: bottom, stroke: "#bbb", "stroke-dasharray": "4 4" });
+        }
+        append(svg, "line", { x1: x(tick), x2: x(tick), y1: bottom, y2: bottom + 5, stroke: "black" });
+        append(svg, "text", {
+            transform: `translate(${x(tick)} ${bottom + 12}) rotate(-30)`,
+            "text-anchor": "end",
+            "dominant-baseline": "hanging",
+        }, formatTick(tick));
+    });
+}
+
+function drawLegend(svg, left, y, entries) {
+    let x = left;
+    entries.forEach(({ label, color, shape, opacity = 1 }) => {
+        if (shape === "rect") {
+            append(svg, "rect", { x, y: y - 6, width: 20, height: 12, fill: color, "fill-opacity": opacity });
+        } else if (shape === "line") {
+            append(svg, "line", { x1: x, x2: x + 20, y1: y, y2: y, stroke: color, "stroke-dasharray": "6 4" });
+        } else {
+            append(svg, "text", { x: x + 10, y, "text-anchor": "middle", "dominant-baseline": "central", "font-size": 18, fill: color }, "★");
+        }
+        append(svg, "text", { x: x + 26, y, "dominant-baseline": "middle" }, label);
+        x += 46 + label.length * 7;
+    });
+}
+
+function scale(domainStart, domainEnd, rangeStart, rangeEnd) {
+    const domain = domainEnd - domainStart || 1;
+    return value => rangeStart + (value - domainStart) / domain * (rangeEnd - rangeStart);
+}
+
+function minimum(values) {
+    return values.reduce((a, b) => Math.min(a, b), Infinity);
+}
+
+function maximum(values) {
+    return values.reduce((a, b) => Math.max(a, b), -Infinity);
+}
+
+// Ticks at round numbers that cover the range from min to max.
+function niceTicks(min, max, count, integer) {
+    if (!(max > min)) {
+        max = min + 1;
+    }
+    const rough = (max - min) / count;
+    const magnitude = 10 ** Math.floor(Math.log10(rough));
+    let step = [1, 2, 5, 10].map(factor => factor * magnitude).find(candidate => candidate >= rough);
+    if (integer) {
+        step = Math.max(1, Math.round(step));
+    }
+    const first = Math.floor(min / step);
+    const last = Math.ceil(max / step);
+    const ticks = [];
+    for (let i = first; i <= last; i++) {
+        ticks.push(Number((i * step).toPrecision(12)));
+    }
+    return ticks;
+}
+
+// Ticks at midnight or at the first of a month in the given timezone,
+// as in the PNG plots.
+function dateTicks(start, end, timeZone, maxTicks) {
+    const [days, months] = DATE_TICK_STEPS.find(
+        ([d, m]) => (end - start) / ((d + m * 30.44) * DAY) <= maxTicks
+    ) ?? DATE_TICK_STEPS.at(-1);
+    const first = zonedParts(start, timeZone);
+    const ticks = [];
+    for (let i = 0; ; i++) {
+        const tick = months
+            ? zonedTime(first.year, first.month + i * months, 1, timeZone)
+            : zonedTime(first.year, first.month, first.day + i * days, timeZone);
+        if (tick > end) {
+            return ticks;
+        }
+        if (tick >= start) {
+            ticks.push(tick);
+        }
+    }
+}
+
+function formatDate(time, timeZone, withDay) {
+    const { year, month, day } = zonedParts(time, timeZone);
+    const pad = number => String(number).padStart(2, "0");
+    return withDay ? `${year}-${pad(month)}-${pad(day)}` : `${year}-${pad(month)}`;
+}
+
+function zonedParts(time, timeZone) {
+    const parts = {};
+    new Intl.DateTimeFormat("en-US", {
+        timeZone,
+        hourCycle: "h23",
+        year: "numeric",
+        month: "numeric",
+        day: "numeric",
+        hour: "numeric",
+        minute: "numeric",
+        second: "numeric",
+    }).formatToParts(new Date(time)).forEach(({ type, value }) => {
+        parts[type] = Number(value);
+    });
+    return parts;
+}
+
+// Milliseconds since the Unix epoch at midnight of the given day in the
+// given timezone. Months and days beyond their range roll over.
+function zonedTime(year, month, day, timeZone) {
+    const guess = Date.UTC(year, month - 1, day);
+    const parts = zonedParts(guess, timeZone);
+    const offset = Date.UTC(parts.year, parts.month - 1, parts.day, parts.hour, parts.minute, parts.second) - guess;
+    return guess - offset;
+}
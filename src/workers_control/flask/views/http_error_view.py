@@ -11,6 +11,10 @@ def http_error(code: int, reason: str) -> Response:
     )
 
 
+def http_400() -> Response:
+    return http_error(code=400, reason="BAD REQUEST")
+
+
 def http_404() -> Response:
     return http_error(code=404, reason="NOT FOUND")
 
@@ -25,3 +29,7 @@ def http_409() -> Response:
 
 def http_501() -> Response:
     return http_error(code=501, reason="NOT IMPLEMENTED")
+
+
+def http_503() -> Response:
+    return http_error(code=503, reason="SERVICE UNAVAILABLE")
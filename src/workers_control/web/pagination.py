@@ -1,26 +1,45 @@
+import binascii
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 from dataclasses import dataclass
-from typing import List
+from datetime import datetime
+from typing import List, Optional, Sequence
 from urllib.parse import urlencode, urlparse, urlunparse
+from uuid import UUID
 
+from workers_control.core.records import Cursor
 from workers_control.web.request import Request
 
 PAGE_PARAMETER_NAME = "page"
 """The name of the request query parameter used for pagination."""
 
+AFTER_PARAMETER_NAME = "after"
+"""The name of the request query parameter holding the cursor of the
+last row of the preceding page."""
+
+BEFORE_PARAMETER_NAME = "before"
+"""The name of the request query parameter holding the cursor of the
+first row of the following page."""
+
 DEFAULT_PAGE_SIZE = 15
 
+PAGE_WINDOW = 2
+"""Number of pages shown on each side of the current page."""
+
 
 @dataclass
 class PageLink:
     label: str
     href: str
     is_current: bool
+    is_gap: bool = False
 
 
 @dataclass
 class Pagination:
     is_visible: bool
     pages: List[PageLink]
+    previous: Optional[str] = None
+    next: Optional[str] = None
 
 
 class Paginator:
@@ -31,32 +50,136 @@ class Paginator:
         page_size: int = DEFAULT_PAGE_SIZE,
     ) -> None:
         self.parsed_url = urlparse(request.get_request_target())
-        self.query_arguments: dict[str, str] = dict(request.query_string().items())
+        self.query_arguments: dict[str, str] = {
+            key: value
+            for key, value in request.query_string().items()
+            if key not in (AFTER_PARAMETER_NAME, BEFORE_PARAMETER_NAME)
+        }
+        self.cursor_arguments: dict[str, str] = {
+            key: value
+            for key, value in request.query_string().items()
+            if key in (AFTER_PARAMETER_NAME, BEFORE_PARAMETER_NAME)
+        }
         self.page_size = page_size
         self.total_results = total_results
         self.current_offset = calculate_current_offset(request, self.page_size)
 
-    def get_page_link(self, page: int) -> str:
+    def get_page_link(self, page: int, **cursor_arguments: str) -> str:
         query = dict(self.query_arguments)
         query[PAGE_PARAMETER_NAME] = str(page)
+        query.update(cursor_arguments)
         modified_parsed = self.parsed_url._replace(query=urlencode(query))
         return urlunparse(modified_parsed)
 
     def get_pages(self) -> List[PageLink]:
-        current_page_number = 1 + self.current_offset // self.page_size
-        return [
+        """Links to the first and the last page and to the pages
+        around the current one. Omitted pages are represented by a
+        single gap entry.
+        """
+        shown_pages = sorted(
+            {1, self.number_of_pages}
+            | set(
+                range(
+                    max(1, self.current_page - PAGE_WINDOW),
+                    min(self.number_of_pages, self.current_page + PAGE_WINDOW) + 1,
+                )
+            )
+        )
+        pages: List[PageLink] = []
+        previous_page = 0
+        for n in shown_pages:
+            if n - previous_page == 2:
+                pages.append(self._create_page_link(n - 1))
+            elif n - previous_page > 2:
+                pages.append(
+                    PageLink(label="…", href="", is_current=False, is_gap=True)
+                )
+            pages.append(self._create_page_link(n))
+            previous_page = n
+        return pages
+
+    def get_cursor_pages(
+        self, preceding_pages: Sequence[Cursor], following_pages: Sequence[Cursor]
+    ) -> List[PageLink]:
+        """Links to the current page and to the neighbouring pages whose
+        cursors are given, nearest first. Unlike get_pages this does not
+        depend on the total number of results, which may be an estimate.
+        """
+        pages: List[PageLink] = []
+        for distance, cursor in reversed(list(enumerate(preceding_pages, start=1))):
+            page = self.current_page - distance
+            # Results added since the first page was listed shift the
+            # page numbers, so they may not reach down to the first page.
+            if page >= 1:
+                pages.append(
+                    self._create_cursor_page_link(page, BEFORE_PARAMETER_NAME, cursor)
+                )
+        pages.append(
             PageLink(
-                label=str(n),
-                href=self.get_page_link(page=n),
-                is_current=current_page_number == n,
+                label=str(self.current_page),
+                href=self.get_page_link(self.current_page, **self.cursor_arguments),
+                is_current=True,
+            )
+        )
+        for distance, cursor in enumerate(following_pages, start=1):
+            pages.append(
+                self._create_cursor_page_link(
+                    self.current_page + distance, AFTER_PARAMETER_NAME, cursor
+                )
+            )
+        return pages
+
+    def get_previous_page_link(self, cursor: Optional[Cursor] = None) -> Optional[str]:
+        """With a cursor the preceding page is selected by the cursor
+        instead of by its offset, and the link is returned regardless of
+        the total number of results, which may be an estimate.
+        """
+        if cursor is not None:
+            return self.get_page_link(
+                max(1, self.current_page - 1),
+                **{BEFORE_PARAMETER_NAME: encode_cursor(cursor)},
+            )
+        if self.current_page <= 1:
+            return None
+        return self.get_page_link(self.current_page - 1)
+
+    def get_next_page_link(self, cursor: Optional[Cursor] = None) -> Optional[str]:
+        """With a cursor the following page is selected by the cursor
+        instead of by its offset, and the link is returned regardless of
+        the total number of results, which may be an estimate.
+        """
+        if cursor is not None:
+            return self.get_page_link(
+                self.current_page + 1, **{AFTER_PARAMETER_NAME: encode_cursor(cursor)}
             )
-            for n in range(1, self.number_of_pages + 1)
-        ]
+        if self.current_page >= self.number_of_pages:
+            return None
+        return self.get_page_link(self.current_page + 1)
+
+    @property
+    def current_page(self) -> int:
+        return 1 + self.current_offset // self.page_size
 
     @property
     def number_of_pages(self) -> int:
         return 1 + (self.total_results - 1) // self.page_size
 
+    def _create_page_link(self, page: int) -> PageLink:
+        return PageLink(
+            label=str(page),
+            href=self.get_page_link(page=page),
+            is_current=self.current_page == page,
+        )
+
+    def _create_cursor_page_link(
+        self, page: int, parameter_name: str, cursor: Cursor
+    ) -> PageLink:
+        return PageLink(
+            label=str(page),
+            href=self.get_page_link(page, **{parameter_name: encode_cursor(cursor)}),
+            is_current=False,
+        )
+
 
 def calculate_current_offset(request: Request, limit: int) -> int:
     page_number_str = request.query_string().get_last_value(PAGE_PARAMETER_NAME)
@@ -67,3 +190,24 @@ def calculate_current_offset(request: Request, limit: int) -> int:
     except ValueError:
         return 0
     return (page_number - 1) * limit
+
+
+def encode_cursor(cursor: Cursor) -> str:
+    """Encode a cursor as an opaque token suitable for query strings."""
+    raw = f"{cursor.date.isoformat()}|{cursor.id}"
+    return urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Optional[Cursor]:
+    """Decode a token created by encode_cursor. Returns None if the
+    token is malformed, including tokens with dates without a timezone.
+    """
+    try:
+        raw = urlsafe_b64decode(token + "=" * (-len(token) % 4)).decode()
+        date_string, id_ = raw.split("|")
+        date = datetime.fromisoformat(date_string)
+        if date.tzinfo is None:
+            return None
+        return Cursor(date=date, id=UUID(id_))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        return None
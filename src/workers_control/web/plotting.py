@@ -0,0 +1,13 @@
+from typing import Any, Callable, Protocol
+
+
+class LinePlotConfiguration(Protocol):
+    def get_max_points_of_line_plot(self) -> int: ...
+
+
+class PlotRenderer(Protocol):
+    def render(self, function: Callable[..., bytes], *args: Any) -> bytes:
+        """Return the image that function draws from args. Implementations
+        may call function in another process, so it has to be defined on
+        module level and args have to be picklable.
+        """
@@ -1,9 +1,15 @@
 from dataclasses import dataclass
+from typing import Optional
 
 from workers_control.core.interactors.list_transfers import Request as InteractorRequest
+from workers_control.core.records import Cursor
 from workers_control.web.pagination import (
+    AFTER_PARAMETER_NAME,
+    BEFORE_PARAMETER_NAME,
     DEFAULT_PAGE_SIZE,
+    PAGE_WINDOW,
     calculate_current_offset,
+    decode_cursor,
 )
 from workers_control.web.request import Request
 
@@ -17,4 +23,13 @@ class ListTransfersController:
         return InteractorRequest(
             offset=offset,
             limit=DEFAULT_PAGE_SIZE,
+            older_than=self._get_cursor(AFTER_PARAMETER_NAME),
+            newer_than=self._get_cursor(BEFORE_PARAMETER_NAME),
+            neighbouring_pages=PAGE_WINDOW,
         )
+
+    def _get_cursor(self, parameter_name: str) -> Optional[Cursor]:
+        token = self.request.query_string().get_last_value(parameter_name)
+        if token is None:
+            return None
+        return decode_cursor(token)
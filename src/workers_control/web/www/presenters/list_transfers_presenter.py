@@ -97,15 +97,30 @@ class ListTransfersPresenter:
         return ResultsTable(rows=rows)
 
     def _create_pagination(self, response: InteractorResponse) -> Pagination:
+        # The total number of transfers is estimated, so only the pages
+        # around the current one that the interactor found are linked.
         paginator = Paginator(
             request=self.web_request,
             total_results=response.total_results,
         )
-        pagination = Pagination(
-            is_visible=paginator.number_of_pages > 1,
-            pages=paginator.get_pages(),
+        previous_page_link = (
+            paginator.get_previous_page_link(response.previous_page)
+            if response.previous_page
+            else None
+        )
+        next_page_link = (
+            paginator.get_next_page_link(response.next_page)
+            if response.next_page
+            else None
+        )
+        return Pagination(
+            is_visible=bool(previous_page_link or next_page_link),
+            pages=paginator.get_cursor_pages(
+                response.preceding_pages, response.following_pages
+            ),
+            previous=previous_page_link,
+            next=next_page_link,
         )
-        return pagination
 
     def _format_date(self, date: datetime) -> str:
         return self.datetime_formatter.format_datetime(
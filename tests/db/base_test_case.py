@@ -15,7 +15,12 @@ from tests.lazy_property import LazyPropertyTestCase, _lazy_property
 from tests.markers import database_required
 from workers_control.core.injector import Injector, Module
 from workers_control.db.db import Base, Database
-from workers_control.db.repositories import DatabaseGatewayImpl
+from workers_control.db.repositories import (
+    CountCache,
+    DatabaseGatewayImpl,
+    PayoutFactorInputsCacheImpl,
+    SocialAccountingCache,
+)
 
 
 @database_required
@@ -25,6 +30,9 @@ class DatabaseTestCase(LazyPropertyTestCase):
         self.injector = Injector(self.get_injection_modules())
         self.db = self.injector.get(Database)
         reset_test_db_once_per_testrun()
+        CountCache.clear()
+        SocialAccountingCache.clear()
+        PayoutFactorInputsCacheImpl.clear()
 
         # Run every test inside a transaction that is rolled back in
         # tearDown, see tests.db.isolation.
@@ -102,6 +110,8 @@ def reset_test_db_once_per_testrun() -> None:
 
 
 def reset_test_db() -> None:
+    SocialAccountingCache.clear()
+    PayoutFactorInputsCacheImpl.clear()
     engine = create_engine(provide_test_database_uri())
     try:
         dialect = engine.dialect.name
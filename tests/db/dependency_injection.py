@@ -8,9 +8,13 @@ from workers_control.core.injector import (
 )
 from workers_control.core.records import SocialAccounting
 from workers_control.core.repositories import DatabaseGateway
+from workers_control.core.services.payout_factor import PayoutFactorInputsCache
 from workers_control.db import get_social_accounting
 from workers_control.db.db import Database
-from workers_control.db.repositories import DatabaseGatewayImpl
+from workers_control.db.repositories import (
+    DatabaseGatewayImpl,
+    PayoutFactorInputsCacheImpl,
+)
 
 
 def provide_test_database_uri() -> str:
@@ -23,6 +27,7 @@ class DatabaseTestModule(Module):
         binder[Database] = CallableProvider(self.provide_database, is_singleton=True)
         binder[DatabaseGateway] = AliasProvider(DatabaseGatewayImpl)
         binder[SocialAccounting] = CallableProvider(get_social_accounting)
+        binder[PayoutFactorInputsCache] = AliasProvider(PayoutFactorInputsCacheImpl)
 
     @staticmethod
     def provide_database() -> Database:
@@ -0,0 +1,69 @@
+from decimal import Decimal
+from uuid import UUID
+
+from tests.db.base_test_case import DatabaseTestCase
+from workers_control.db import models
+from workers_control.db.repositories import AccountBalanceReconciler
+
+
+class AccountBalanceReconcilerTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.reconciler = self.injector.get(AccountBalanceReconciler)
+
+    def test_no_drift_is_found_for_fresh_account(self) -> None:
+        self.database_gateway.create_account()
+        assert not self.reconciler.find_drifts()
+
+    def test_no_drift_is_found_after_transfers_were_created(self) -> None:
+        account = self.database_gateway.create_account()
+        self.transfer_generator.create_transfer(
+            credit_account=account.id, value=Decimal(5)
+        )
+        self.transfer_generator.create_transfer(
+            debit_account=account.id, value=Decimal(2)
+        )
+        assert not self.reconciler.find_drifts()
+
+    def test_drift_is_reported_when_stored_balance_was_tampered_with(self) -> None:
+        account = self.database_gateway.create_account()
+        self.transfer_generator.create_transfer(
+            credit_account=account.id, value=Decimal(5)
+        )
+        self._set_stored_balance(account.id, Decimal(1))
+        drifts = self.reconciler.find_drifts()
+        assert len(drifts) == 1
+        assert drifts[0].account_id == account.id
+        assert drifts[0].stored_balance == Decimal(1)
+        assert drifts[0].expected_balance == Decimal(5)
+
+    def test_drift_is_reported_when_balance_row_is_missing(self) -> None:
+        account = self.database_gateway.create_account()
+        self.db.session.query(models.AccountBalance).filter(
+            models.AccountBalance.account_id == account.id
+        ).delete()
+        drifts = self.reconciler.find_drifts()
+        assert [drift.account_id for drift in drifts] == [account.id]
+
+    def test_correcting_drift_restores_expected_balance(self) -> None:
+        account = self.database_gateway.create_account()
+        self.transfer_generator.create_transfer(
+            credit_account=account.id, value=Decimal(5)
+        )
+        self._set_stored_balance(account.id, Decimal(1))
+        for drift in self.reconciler.find_drifts():
+            self.reconciler.correct(drift)
+        assert not self.reconciler.find_drifts()
+        result = (
+            self.database_gateway.get_accounts()
+            .with_id(account.id)
+            .joined_with_balance()
+            .first()
+        )
+        assert result
+        assert result[1] == Decimal(5)
+
+    def _set_stored_balance(self, account: UUID, balance: Decimal) -> None:
+        self.db.session.query(models.AccountBalance).filter(
+            models.AccountBalance.account_id == account
+        ).update({models.AccountBalance.balance: balance})
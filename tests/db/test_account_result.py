@@ -192,3 +192,50 @@ class JoinedWithBalanceTests(DatabaseTestCase):
             )
             == 1
         )
+
+
+class JoinedWithLastTransferTests(DatabaseTestCase):
+    def test_that_accounts_without_transfers_have_no_last_transfer(self) -> None:
+        account = self.database_gateway.create_account()
+        assert self.get_last_transfer(account.id) is None
+
+    def test_that_transfer_from_account_is_its_last_transfer(self) -> None:
+        account = self.database_gateway.create_account()
+        transfer = self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 1), debit_account=account.id
+        )
+        assert self.get_last_transfer(account.id) == records.Cursor(
+            date=datetime_utc(2021, 1, 1), id=transfer.id
+        )
+
+    def test_that_transfer_to_account_is_its_last_transfer(self) -> None:
+        account = self.database_gateway.create_account()
+        transfer = self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 1), credit_account=account.id
+        )
+        assert self.get_last_transfer(account.id) == records.Cursor(
+            date=datetime_utc(2021, 1, 1), id=transfer.id
+        )
+
+    def test_that_the_transfer_made_last_is_the_last_transfer(self) -> None:
+        account = self.database_gateway.create_account()
+        self.transfer_generator.create_transfer(credit_account=account.id)
+        transfer = self.transfer_generator.create_transfer(debit_account=account.id)
+        last_transfer = self.get_last_transfer(account.id)
+        assert last_transfer
+        assert last_transfer.id == transfer.id
+
+    def test_that_transfers_of_other_accounts_are_ignored(self) -> None:
+        account = self.database_gateway.create_account()
+        self.transfer_generator.create_transfer()
+        assert self.get_last_transfer(account.id) is None
+
+    def get_last_transfer(self, account: UUID) -> Optional[records.Cursor]:
+        result = (
+            self.database_gateway.get_accounts()
+            .with_id(account)
+            .joined_with_last_transfer()
+            .first()
+        )
+        assert result
+        return result[1]
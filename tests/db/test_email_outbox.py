@@ -2,6 +2,7 @@ from datetime import timedelta
 from uuid import UUID
 
 from tests.db.base_test_case import DatabaseTestCase
+from workers_control.core.repositories import EmailResult
 from workers_control.db import models
 
 
@@ -154,3 +155,150 @@ class EmailUpdateTests(DatabaseTestCase):
         self._create_email()
         affected = self.database_gateway.get_emails().update().perform()
         self.assertEqual(affected, 0)
+
+
+class ClaimEmailsTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.datetime_service.freeze_time()
+
+    def _create_email(self, recipient: str = "to@test.org") -> UUID:
+        email_id = self.database_gateway.create_email(
+            created_at=self.datetime_service.now(),
+            recipient=recipient,
+            sender="from@test.org",
+            subject="subj",
+            html="<p>body</p>",
+        ).id
+        self.datetime_service.advance_time(timedelta(seconds=1))
+        return email_id
+
+    def _claimable(self) -> EmailResult:
+        return (
+            self.database_gateway.get_emails()
+            .that_have_not_been_sent()
+            .that_are_not_claimed_at(self.datetime_service.now())
+            .ordered_by_creation_date()
+        )
+
+    def _claim(self, limit: int = 10) -> list[UUID]:
+        emails = self._claimable().claim(
+            until=self.datetime_service.now() + timedelta(minutes=5), limit=limit
+        )
+        return [email.id for email in emails]
+
+    def test_that_nothing_is_claimed_from_empty_outbox(self) -> None:
+        self.assertEqual(self._claim(), [])
+
+    def test_that_oldest_emails_are_claimed_up_to_the_limit(self) -> None:
+        email_ids = [self._create_email(f"{i}@test.org") for i in range(3)]
+        self.assertEqual(self._claim(limit=2), email_ids[:2])
+
+    def test_that_claimed_emails_are_not_claimed_again(self) -> None:
+        email_ids = [self._create_email(f"{i}@test.org") for i in range(3)]
+        first_claim = self._claim(limit=2)
+        second_claim = self._claim(limit=2)
+        self.assertEqual(second_claim, email_ids[2:])
+        self.assertFalse(set(first_claim) & set(second_claim))
+
+    def test_that_claimed_emails_are_claimed_again_after_the_claim_expired(
+        self,
+    ) -> None:
+        email_id = self._create_email()
+        self._claim()
+        self.datetime_service.advance_time(timedelta(minutes=5))
+        self.assertEqual(self._claim(), [email_id])
+
+    def test_that_released_emails_can_be_claimed_again(self) -> None:
+        email_id = self._create_email()
+        self._claim()
+        self.database_gateway.get_emails().with_id(
+            email_id
+        ).update().release_claim().perform()
+        self.assertEqual(self._claim(), [email_id])
+
+    def test_that_claimed_email_has_its_content(self) -> None:
+        self._create_email("a@test.org")
+        (email,) = self._claimable().claim(
+            until=self.datetime_service.now() + timedelta(minutes=5), limit=1
+        )
+        self.assertEqual(email.recipient, "a@test.org")
+        self.assertEqual(email.html, "<p>body</p>")
+
+    def test_that_claim_until_is_stored(self) -> None:
+        email_id = self._create_email()
+        until = self.datetime_service.now() + timedelta(minutes=5)
+        self._claimable().claim(until=until, limit=1)
+        orm = self.db.session.query(models.EmailOutbox).filter_by(id=email_id).one()
+        self.assertEqual(orm.claimed_until, until)
+
+
+class RetrySchedulingTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.datetime_service.freeze_time()
+
+    def _create_email(self) -> UUID:
+        email_id = self.database_gateway.create_email(
+            created_at=self.datetime_service.now(),
+            recipient="to@test.org",
+            sender="from@test.org",
+            subject="subj",
+            html="<p>body</p>",
+        ).id
+        self.datetime_service.advance_time(timedelta(seconds=1))
+        return email_id
+
+    def _due_email_ids(self) -> list[UUID]:
+        return [
+            email.id
+            for email in self.database_gateway.get_emails()
+            .that_are_due_at(self.datetime_service.now())
+            .ordered_by_next_attempt()
+        ]
+
+    def test_that_new_email_is_due_right_away(self) -> None:
+        email_id = self._create_email()
+        self.assertEqual(self._due_email_ids(), [email_id])
+
+    def test_that_email_is_not_due_before_the_scheduled_attempt(self) -> None:
+        email_id = self._create_email()
+        self.database_gateway.get_emails().with_id(
+            email_id
+        ).update().schedule_next_attempt(
+            self.datetime_service.now() + timedelta(minutes=1)
+        ).perform()
+        self.assertEqual(self._due_email_ids(), [])
+
+    def test_that_emails_are_ordered_by_scheduled_attempt(self) -> None:
+        first = self._create_email()
+        second = self._create_email()
+        self.database_gateway.get_emails().with_id(
+            first
+        ).update().schedule_next_attempt(self.datetime_service.now()).perform()
+        self.assertEqual(self._due_email_ids(), [second, first])
+
+    def test_that_dead_letters_are_never_due(self) -> None:
+        email_id = self._create_email()
+        self.database_gateway.get_emails().with_id(
+            email_id
+        ).update().move_to_dead_letters().perform()
+        self.assertEqual(self._due_email_ids(), [])
+
+    def test_that_dead_letters_can_be_listed(self) -> None:
+        email_id = self._create_email()
+        self._create_email()
+        self.database_gateway.get_emails().with_id(
+            email_id
+        ).update().move_to_dead_letters().perform()
+        dead_letters = list(self.database_gateway.get_emails().that_are_dead_letters())
+        self.assertEqual([email.id for email in dead_letters], [email_id])
+
+    def test_that_retry_count_is_part_of_the_email(self) -> None:
+        email_id = self._create_email()
+        self.database_gateway.get_emails().with_id(
+            email_id
+        ).update().increment_retry_count().perform()
+        email = self.database_gateway.get_emails().with_id(email_id).first()
+        assert email
+        self.assertEqual(email.retry_count, 1)
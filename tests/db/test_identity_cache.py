@@ -0,0 +1,91 @@
+from typing import Any
+from uuid import uuid4
+
+from sqlalchemy import event
+
+from tests.db.base_test_case import DatabaseTestCase
+
+
+class IdentityCacheTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.statements: list[str] = []
+        event.listen(self.connection, "before_cursor_execute", self._record_statement)
+
+    def _record_statement(
+        self, conn: Any, cursor: Any, statement: str, *args: Any
+    ) -> None:
+        self.statements.append(statement)
+
+    def test_repeated_lookup_of_company_by_id_runs_one_query(self) -> None:
+        company = self.company_generator.create_company()
+        self.db.session.flush()
+        self.statements.clear()
+        first = self.database_gateway.get_companies().with_id(company).first()
+        second = self.database_gateway.get_companies().with_id(company).first()
+        assert first == second
+        assert len(self.statements) == 1
+
+    def test_members_accountants_and_cooperations_are_cached(self) -> None:
+        member = self.member_generator.create_member()
+        accountant = self.accountant_generator.create_accountant()
+        cooperation = self.cooperation_generator.create_cooperation()
+        self.db.session.flush()
+        for _ in range(2):
+            assert self.database_gateway.get_members().with_id(member).first()
+            assert self.database_gateway.get_accountants().with_id(accountant).first()
+            assert self.database_gateway.get_cooperations().with_id(cooperation).first()
+        self.statements.clear()
+        self.database_gateway.get_members().with_id(member).first()
+        self.database_gateway.get_accountants().with_id(accountant).first()
+        self.database_gateway.get_cooperations().with_id(cooperation).first()
+        assert not self.statements
+
+    def test_iterating_over_a_lookup_by_id_uses_the_cache(self) -> None:
+        company = self.company_generator.create_company()
+        self.database_gateway.get_companies().with_id(company).first()
+        self.statements.clear()
+        assert len(list(self.database_gateway.get_companies().with_id(company))) == 1
+        assert not self.statements
+
+    def test_update_of_company_invalidates_cached_company(self) -> None:
+        company = self.company_generator.create_company(name="old name")
+        self.database_gateway.get_companies().with_id(company).first()
+        self.database_gateway.get_companies().with_id(company).update().set_name(
+            "new name"
+        ).perform()
+        record = self.database_gateway.get_companies().with_id(company).first()
+        assert record
+        assert record.name == "new name"
+
+    def test_created_company_is_found_after_a_failed_lookup(self) -> None:
+        assert self.database_gateway.get_companies().with_id(uuid4()).first() is None
+        company = self.company_generator.create_company()
+        assert self.database_gateway.get_companies().with_id(company).first()
+
+    def test_rollback_invalidates_cached_company(self) -> None:
+        company = self.company_generator.create_company()
+        self.database_gateway.get_companies().with_id(company).first()
+        self.db.session.rollback()
+        assert self.database_gateway.get_companies().with_id(company).first() is None
+
+    def test_changing_a_returned_record_does_not_change_the_cached_one(self) -> None:
+        company = self.company_generator.create_company(name="company name")
+        record = self.database_gateway.get_companies().with_id(company).first()
+        assert record
+        record.name = "changed"
+        record = self.database_gateway.get_companies().with_id(company).first()
+        assert record
+        assert record.name == "company name"
+
+    def test_filtered_lookup_by_id_is_not_served_from_cache(self) -> None:
+        member = self.member_generator.create_member()
+        company = self.company_generator.create_company()
+        self.database_gateway.get_companies().with_id(company).first()
+        assert (
+            self.database_gateway.get_companies()
+            .that_are_workplace_of_member(member)
+            .with_id(company)
+            .first()
+            is None
+        )
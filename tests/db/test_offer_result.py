@@ -0,0 +1,138 @@
+from datetime import timedelta
+
+from tests.datetime_service import datetime_utc
+from tests.db.base_test_case import DatabaseTestCase
+from workers_control.core import records
+
+
+class OfferResultTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.datetime_service.freeze_time(datetime_utc(2025, 1, 1))
+
+    def test_no_offers_exist_without_plans_and_basic_services(self) -> None:
+        assert not self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        )
+
+    def test_approved_plans_are_offers(self) -> None:
+        plan = self.plan_generator.create_plan()
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(), None
+        )
+        assert list(offers) == [records.Offer(id=plan, is_basic_service=False)]
+
+    def test_plans_that_are_not_approved_are_no_offers(self) -> None:
+        self.plan_generator.create_plan(approved=False)
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(), None
+        )
+        assert not offers
+
+    def test_basic_services_are_offers(self) -> None:
+        basic_service = self.basic_service_generator.create_basic_service()
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        )
+        assert list(offers) == [records.Offer(id=basic_service, is_basic_service=True)]
+
+    def test_filters_of_plans_and_basic_services_are_applied(self) -> None:
+        plan = self.plan_generator.create_plan()
+        self.plan_generator.create_plan()
+        basic_service = self.basic_service_generator.create_basic_service()
+        self.basic_service_generator.create_basic_service()
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans().with_id(plan),
+            self.database_gateway.get_basic_services().with_id(basic_service),
+        )
+        assert {offer.id for offer in offers} == {plan, basic_service}
+        assert len(offers) == 2
+
+    def test_offers_can_be_ordered_by_activation_date(self) -> None:
+        older_plan = self.plan_generator.create_plan()
+        self.datetime_service.advance_time(timedelta(days=1))
+        basic_service = self.basic_service_generator.create_basic_service()
+        self.datetime_service.advance_time(timedelta(days=1))
+        newer_plan = self.plan_generator.create_plan()
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        )
+        assert [o.id for o in offers.ordered_by_activation_date()] == [
+            older_plan,
+            basic_service,
+            newer_plan,
+        ]
+        assert [o.id for o in offers.ordered_by_activation_date(ascending=False)] == [
+            newer_plan,
+            basic_service,
+            older_plan,
+        ]
+
+    def test_offers_can_be_ordered_by_provider_name_ignoring_case(self) -> None:
+        plan = self.plan_generator.create_plan(
+            planner=self.company_generator.create_company(name="b company")
+        )
+        basic_service = self.basic_service_generator.create_basic_service(
+            member=self.member_generator.create_member(name="A member")
+        )
+        other_plan = self.plan_generator.create_plan(
+            planner=self.company_generator.create_company(name="C company")
+        )
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        )
+        assert [o.id for o in offers.ordered_by_provider_name()] == [
+            basic_service,
+            plan,
+            other_plan,
+        ]
+
+    def test_ordering_of_plans_passed_in_is_ignored(self) -> None:
+        plan = self.plan_generator.create_plan()
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans().ordered_by_planner_name(),
+            self.database_gateway.get_basic_services().ordered_by_provider_name(),
+        )
+        assert [o.id for o in offers] == [plan]
+
+    def test_offers_can_be_paginated(self) -> None:
+        plans = []
+        for _ in range(3):
+            plans.append(self.plan_generator.create_plan())
+            self.datetime_service.advance_time(timedelta(days=1))
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        ).ordered_by_activation_date()
+        assert [o.id for o in offers.offset(1).limit(1)] == [plans[1]]
+
+    def test_pages_of_offers_of_one_provider_contain_every_offer_exactly_once(
+        self,
+    ) -> None:
+        planner = self.company_generator.create_company()
+        plans = {self.plan_generator.create_plan(planner=planner) for _ in range(5)}
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        ).ordered_by_provider_name()
+        paged = [
+            offer.id for page in range(5) for offer in offers.offset(page).limit(1)
+        ]
+        assert sorted(paged) == sorted(plans)
+
+    def test_pages_of_offers_activated_at_the_same_time_contain_every_offer_once(
+        self,
+    ) -> None:
+        plans = {self.plan_generator.create_plan() for _ in range(5)}
+        offers = self.database_gateway.get_offers(
+            self.database_gateway.get_plans(),
+            self.database_gateway.get_basic_services(),
+        ).ordered_by_activation_date(ascending=False)
+        paged = [
+            offer.id for page in range(5) for offer in offers.offset(page).limit(1)
+        ]
+        assert sorted(paged) == sorted(plans)
@@ -0,0 +1,67 @@
+from datetime import datetime, timezone
+
+from tests.db.base_test_case import DatabaseTestCase
+from workers_control.core.services.payout_factor import PayoutFactorInputs
+from workers_control.db import models
+from workers_control.db.repositories import PayoutFactorInputsCacheImpl
+
+
+class PayoutFactorInputsCacheTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.cache = self.injector.get(PayoutFactorInputsCacheImpl)
+        self.load_count = 0
+
+    def test_inputs_are_loaded_every_time_before_any_version_exists(self) -> None:
+        self.cache.get_or_load(self._load)
+        self.cache.get_or_load(self._load)
+        assert self.load_count == 2
+
+    def test_inputs_are_loaded_once_after_plan_approval(self) -> None:
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        self.cache.get_or_load(self._load)
+        assert self.load_count == 1
+
+    def test_new_plan_approval_invalidates_cached_inputs(self) -> None:
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        assert self.load_count == 2
+
+    def test_private_consumption_of_basic_service_keeps_cached_inputs(
+        self,
+    ) -> None:
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        self.consumption_generator.create_private_consumption_of_basic_service()
+        self.cache.get_or_load(self._load)
+        assert self.load_count == 1
+
+    def test_productive_consumption_of_basic_service_keeps_cached_inputs(
+        self,
+    ) -> None:
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        self.consumption_generator.create_productive_consumption_of_basic_service()
+        self.cache.get_or_load(self._load)
+        assert self.load_count == 1
+
+    def test_cached_inputs_are_shared_between_instances(self) -> None:
+        self.plan_generator.create_plan()
+        self.cache.get_or_load(self._load)
+        PayoutFactorInputsCacheImpl(db=self.db).get_or_load(self._load)
+        assert self.load_count == 1
+
+    def test_database_without_version_row_gets_one_on_plan_approval(self) -> None:
+        self.db.session.query(models.PayoutFactorVersion).delete()
+        self.plan_generator.create_plan()
+        self.plan_generator.create_plan()
+        assert self.db.session.query(models.PayoutFactorVersion).count() == 1
+
+    def _load(self) -> PayoutFactorInputs:
+        self.load_count += 1
+        return PayoutFactorInputs(
+            valid_from=datetime(2020, 1, 1, tzinfo=timezone.utc), plans=()
+        )
@@ -13,6 +13,8 @@ from workers_control.core.interactors.reject_plan import RejectPlanInteractor
 from workers_control.core.records import Plan, ProductionCosts
 from workers_control.db import models
 
+from .utility import Utility
+
 
 class PlanResultTests(DatabaseTestCase):
     def test_that_plan_gets_hidden(self) -> None:
@@ -940,3 +942,33 @@ class ThatRequestCooperationWithCoordinatorTests(DatabaseTestCase):
         assert not self.database_gateway.get_plans().that_request_cooperation_with_coordinator(
             original_coordinator
         )
+
+
+class QueryCountTests(DatabaseTestCase):
+    @parameterized.expand([(1,), (10,)])
+    def test_that_listing_plans_issues_a_bounded_number_of_queries(
+        self, plan_count: int
+    ) -> None:
+        for _ in range(plan_count):
+            self.plan_generator.create_plan(approved=True)
+            self.plan_generator.create_plan(approved=False, rejected=True)
+        self.db.session.expire_all()
+        with Utility.record_statements(self.connection) as statements:
+            plans = [plan for plan in self.database_gateway.get_plans()]
+        assert len(plans) == 2 * plan_count
+        assert all(plan.approval_date or plan.rejection_date for plan in plans)
+        assert len(statements) <= 3
+
+    def test_that_listing_plans_joined_with_planner_and_cooperation_issues_a_bounded_number_of_queries(
+        self,
+    ) -> None:
+        for _ in range(10):
+            self.plan_generator.create_plan(approved=True)
+        self.db.session.expire_all()
+        with Utility.record_statements(self.connection) as statements:
+            results = [
+                result
+                for result in self.database_gateway.get_plans().joined_with_planner_and_cooperation()
+            ]
+        assert len(results) == 10
+        assert len(statements) <= 3
@@ -1,7 +1,9 @@
+from datetime import timedelta
 from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
+from tests.datetime_service import datetime_utc
 from tests.db.base_test_case import DatabaseTestCase
 from workers_control.core import records
 from workers_control.core.transfers import TransferType
@@ -167,3 +169,56 @@ class ProductiveConsumptionOfBasicServiceTests(DatabaseTestCase):
             .where_consumer_is_company(company.id)
             .joined_with_transfer()
         )
+
+    def test_consumptions_made_at_the_borders_of_the_range_are_included(
+        self,
+    ) -> None:
+        start = datetime_utc(2020, 1, 1)
+        end = datetime_utc(2020, 1, 10)
+        for timestamp in [start, end]:
+            self.datetime_service.freeze_time(timestamp)
+            self._create_consumption()
+        assert (
+            len(
+                self.database_gateway.get_productive_consumptions_of_basic_service().that_were_made_between(
+                    start, end
+                )
+            )
+            == 2
+        )
+
+    def test_consumptions_made_outside_of_the_range_are_excluded(self) -> None:
+        start = datetime_utc(2020, 1, 1)
+        end = datetime_utc(2020, 1, 10)
+        for timestamp in [start - timedelta(seconds=1), end + timedelta(seconds=1)]:
+            self.datetime_service.freeze_time(timestamp)
+            self._create_consumption()
+        assert not self.database_gateway.get_productive_consumptions_of_basic_service().that_were_made_between(
+            start, end
+        )
+
+    def test_total_value_is_zero_without_consumptions(self) -> None:
+        assert self.database_gateway.get_productive_consumptions_of_basic_service().get_total_value() == Decimal(
+            0
+        )
+
+    def test_total_value_sums_up_transfers_of_consumption(self) -> None:
+        self._create_consumption(amount=Decimal(2))
+        self._create_consumption(amount=Decimal("3.5"))
+        assert self.database_gateway.get_productive_consumptions_of_basic_service().get_total_value() == Decimal(
+            "5.5"
+        )
+
+    def test_total_value_only_considers_consumptions_in_range(self) -> None:
+        self.datetime_service.freeze_time(datetime_utc(2020, 1, 1))
+        self._create_consumption(amount=Decimal(2))
+        self.datetime_service.freeze_time(datetime_utc(2020, 2, 1))
+        self._create_consumption(amount=Decimal(3))
+        assert (
+            self.database_gateway.get_productive_consumptions_of_basic_service()
+            .that_were_made_between(
+                datetime_utc(2020, 1, 15), datetime_utc(2020, 2, 15)
+            )
+            .get_total_value()
+            == Decimal(3)
+        )
@@ -0,0 +1,89 @@
+from tests.datetime_service import datetime_utc
+from tests.db.base_test_case import DatabaseTestCase
+from workers_control.core.repositories import CountStrategy
+from workers_control.db.repositories import CountCache
+
+
+class ExactCountTests(DatabaseTestCase):
+    def test_that_exact_count_is_zero_without_rows(self) -> None:
+        assert self.database_gateway.get_transfers().count() == 0
+
+    def test_that_exact_count_includes_rows_created_after_a_previous_count(
+        self,
+    ) -> None:
+        self.transfer_generator.create_transfer()
+        self.database_gateway.get_transfers().count()
+        self.transfer_generator.create_transfer()
+        assert self.database_gateway.get_transfers().count() == 2
+
+    def test_that_ordered_and_limited_results_can_be_counted(self) -> None:
+        for _ in range(3):
+            self.transfer_generator.create_transfer()
+        transfers = (
+            self.database_gateway.get_transfers().ordered_by_date().offset(1).limit(1)
+        )
+        assert transfers.count() == 1
+        assert len(transfers) == 1
+
+
+class CachedCountTests(DatabaseTestCase):
+    def test_that_cached_count_is_correct_on_first_call(self) -> None:
+        self.transfer_generator.create_transfer()
+        transfers = self.database_gateway.get_transfers()
+        assert transfers.count(CountStrategy.cached) == 1
+
+    def test_that_cached_count_is_reused_for_an_equal_query(self) -> None:
+        self.transfer_generator.create_transfer()
+        self.database_gateway.get_transfers().count(CountStrategy.cached)
+        self.transfer_generator.create_transfer()
+        transfers = self.database_gateway.get_transfers()
+        assert transfers.count(CountStrategy.cached) == 1
+
+    def test_that_cached_count_is_not_shared_between_different_filters(
+        self,
+    ) -> None:
+        company = self.company_generator.create_company()
+        self.company_generator.create_company(name="other company")
+        self.database_gateway.get_companies().count(CountStrategy.cached)
+        companies = self.database_gateway.get_companies().with_id(company)
+        assert companies.count(CountStrategy.cached) == 1
+
+    def test_that_cached_count_is_not_shared_between_filter_parameters(
+        self,
+    ) -> None:
+        self.company_generator.create_company(name="abc")
+        companies = self.database_gateway.get_companies()
+        companies.with_name_containing("abc").count(CountStrategy.cached)
+        assert companies.with_name_containing("xyz").count(CountStrategy.cached) == 0
+
+    def test_that_timestamps_in_the_same_minute_share_a_cached_count(
+        self,
+    ) -> None:
+        self.plan_generator.create_plan(approved=True)
+        plans = self.database_gateway.get_plans()
+        plans.that_were_approved_before(datetime_utc(2030, 1, 1, 12, 0, 1)).count(
+            CountStrategy.cached
+        )
+        self.plan_generator.create_plan(approved=True)
+        assert (
+            plans.that_were_approved_before(datetime_utc(2030, 1, 1, 12, 0, 59)).count(
+                CountStrategy.cached
+            )
+            == 1
+        )
+
+    def test_that_count_is_recalculated_after_clearing_the_cache(self) -> None:
+        self.transfer_generator.create_transfer()
+        self.database_gateway.get_transfers().count(CountStrategy.cached)
+        self.transfer_generator.create_transfer()
+        CountCache.clear()
+        transfers = self.database_gateway.get_transfers()
+        assert transfers.count(CountStrategy.cached) == 2
+
+
+class EstimatedCountTests(DatabaseTestCase):
+    def test_that_small_estimated_counts_are_correct(self) -> None:
+        for _ in range(3):
+            self.transfer_generator.create_transfer()
+        transfers = self.database_gateway.get_transfers()
+        assert transfers.count(CountStrategy.estimated) == 3
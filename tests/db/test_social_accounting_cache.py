@@ -0,0 +1,37 @@
+from tests.db.base_test_case import DatabaseTestCase
+from workers_control.db.repositories import AccountingRepository, SocialAccountingCache
+
+
+class SocialAccountingCacheTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.repository = self.injector.get(AccountingRepository)
+
+    def test_same_social_accounting_is_returned_every_time(self) -> None:
+        first = self.repository.get_or_create_social_accounting()
+        self.db.session.commit()
+        second = self.repository.get_or_create_social_accounting()
+        assert first == second
+
+    def test_created_social_accounting_is_not_cached_before_commit(self) -> None:
+        self.repository.get_or_create_social_accounting()
+        self.repository.get_or_create_social_accounting()
+        assert SocialAccountingCache.get() is None
+
+    def test_created_social_accounting_is_cached_after_commit(self) -> None:
+        social_accounting = self.repository.get_or_create_social_accounting()
+        self.db.session.commit()
+        assert SocialAccountingCache.get() == social_accounting
+
+    def test_created_social_accounting_is_not_cached_after_rollback(self) -> None:
+        self.repository.get_or_create_social_accounting()
+        self.db.session.rollback()
+        self.db.session.commit()
+        assert SocialAccountingCache.get() is None
+
+    def test_existing_social_accounting_is_cached_when_loaded(self) -> None:
+        social_accounting = self.repository.get_or_create_social_accounting()
+        self.db.session.commit()
+        SocialAccountingCache.clear()
+        self.repository.get_or_create_social_accounting()
+        assert SocialAccountingCache.get() == social_accounting
@@ -1,10 +1,14 @@
-from uuid import uuid4
+from decimal import Decimal
+from itertools import accumulate
+from typing import Any
+from uuid import UUID, uuid4
 
 from parameterized import parameterized
+from sqlalchemy import event
 
 from tests.datetime_service import datetime_utc
 from tests.db.base_test_case import DatabaseTestCase
-from workers_control.core.records import AccountTypes, SocialAccounting
+from workers_control.core.records import AccountTypes, Cursor, SocialAccounting
 from workers_control.core.transfers import TransferType
 
 
@@ -16,6 +20,41 @@ class TransferResultTests(DatabaseTestCase):
         self.transfer_generator.create_transfer()
         assert len(self.database_gateway.get_transfers()) == 1
 
+    @parameterized.expand([(True,), (False,)])
+    def test_that_account_balances_are_updated_in_the_order_of_account_ids(
+        self, credit_account_first: bool
+    ) -> None:
+        first, second = sorted(
+            [
+                self.database_gateway.create_account().id,
+                self.database_gateway.create_account().id,
+            ]
+        )
+        updated_accounts: list[UUID] = []
+
+        def record_updated_account(
+            conn: Any, cursor: Any, statement: str, parameters: Any, *args: Any
+        ) -> None:
+            if statement.startswith("UPDATE account_balance"):
+                values = (
+                    list(parameters.values())
+                    if isinstance(parameters, dict)
+                    else list(parameters)
+                )
+                updated_accounts.append(UUID(str(values[-1])))
+
+        event.listen(self.connection, "before_cursor_execute", record_updated_account)
+        try:
+            self.transfer_generator.create_transfer(
+                credit_account=first if credit_account_first else second,
+                debit_account=second if credit_account_first else first,
+            )
+        finally:
+            event.remove(
+                self.connection, "before_cursor_execute", record_updated_account
+            )
+        assert updated_accounts == [first, second]
+
     @parameterized.expand(
         [
             (TransferType.private_consumption,),
@@ -230,6 +269,20 @@ class JoinedWithDebtorTests(DatabaseTestCase):
         assert transfer_with_debtor
         assert transfer_with_debtor[1] == cooperation
 
+    def test_that_joined_with_debtor_yields_one_row_per_transfer_when_several_companies_exist(
+        self,
+    ) -> None:
+        company_id = self.company_generator.create_company()
+        self.company_generator.create_company()
+        company = self.database_gateway.get_companies().with_id(company_id).first()
+        assert company
+        self.transfer_generator.create_transfer(debit_account=company.work_account)
+        transfers_with_debtor = list(
+            self.database_gateway.get_transfers().joined_with_debtor()
+        )
+        assert len(transfers_with_debtor) == 1
+        assert transfers_with_debtor[0][1] == company
+
 
 class JoinedWithCreditorTests(DatabaseTestCase):
     def test_that_joined_with_creditor_yields_member(
@@ -322,6 +375,154 @@ class OrderedByDateTests(DatabaseTestCase):
         expected_dates = [date1, date2] if ascending else [date2, date1]
         assert actual_dates == expected_dates
 
+    @parameterized.expand(
+        [
+            (True,),
+            (False,),
+        ]
+    )
+    def test_that_transfers_made_at_the_same_time_are_ordered_by_id(
+        self, ascending: bool
+    ) -> None:
+        date = datetime_utc(2021, 1, 1)
+        ids = [self.transfer_generator.create_transfer(date=date).id for _ in range(5)]
+        transfers = self.database_gateway.get_transfers().ordered_by_date(
+            ascending=ascending
+        )
+        assert [transfer.id for transfer in transfers] == sorted(
+            ids, reverse=not ascending
+        )
+
+
+class AccumulatedVolumesOfAccountTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.account = self.company_generator.create_company_record().means_account
+
+    def test_that_nothing_is_yielded_for_an_account_without_transfers(self) -> None:
+        self.transfer_generator.create_transfer()
+        assert not self.database_gateway.get_transfers().accumulated_volumes_of_account(
+            self.account
+        )
+
+    def test_that_credits_are_added_and_debits_are_subtracted(self) -> None:
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 1),
+            credit_account=self.account,
+            value=Decimal("2.5"),
+        )
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 2),
+            debit_account=self.account,
+            value=Decimal(4),
+        )
+        accumulated_volumes = [
+            volume
+            for _, volume in self.database_gateway.get_transfers().accumulated_volumes_of_account(
+                self.account
+            )
+        ]
+        assert accumulated_volumes == [Decimal("2.5"), Decimal("-1.5")]
+
+    def test_that_volumes_are_accumulated_in_order_of_date(self) -> None:
+        for day in [3, 1, 2]:
+            self.transfer_generator.create_transfer(
+                date=datetime_utc(2021, 1, day),
+                credit_account=self.account,
+                value=Decimal(day),
+            )
+        result = list(
+            self.database_gateway.get_transfers().accumulated_volumes_of_account(
+                self.account
+            )
+        )
+        assert result == [
+            (datetime_utc(2021, 1, 1), Decimal(1)),
+            (datetime_utc(2021, 1, 2), Decimal(3)),
+            (datetime_utc(2021, 1, 3), Decimal(6)),
+        ]
+
+    def test_that_transfers_made_at_the_same_time_are_accumulated_in_order_of_id(
+        self,
+    ) -> None:
+        date = datetime_utc(2021, 1, 1)
+        values = {
+            self.transfer_generator.create_transfer(
+                date=date, credit_account=self.account, value=Decimal(value)
+            ).id: Decimal(value)
+            for value in [1, 10, 100]
+        }
+        accumulated_volumes = [
+            volume
+            for _, volume in self.database_gateway.get_transfers().accumulated_volumes_of_account(
+                self.account
+            )
+        ]
+        assert accumulated_volumes == list(
+            accumulate(values[id_] for id_ in sorted(values))
+        )
+
+    def test_that_only_transfers_of_the_result_are_accumulated(self) -> None:
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 1), credit_account=self.account
+        )
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 2),
+            credit_account=self.account,
+            value=Decimal(3),
+        )
+        cursor = Cursor(date=datetime_utc(2021, 1, 1, 12), id=uuid4())
+        result = list(
+            self.database_gateway.get_transfers()
+            .after(cursor)
+            .accumulated_volumes_of_account(self.account)
+        )
+        assert result == [(datetime_utc(2021, 1, 2), Decimal(3))]
+
+
+class AfterAndBeforeCursorTests(DatabaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.earlier = self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 1)
+        )
+        self.simultaneous = sorted(
+            [
+                self.transfer_generator.create_transfer(date=datetime_utc(2021, 1, 2))
+                for _ in range(2)
+            ],
+            key=lambda transfer: transfer.id,
+        )
+        self.later = self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 1, 3)
+        )
+
+    def test_that_transfers_after_cursor_are_returned(self) -> None:
+        cursor = Cursor(date=self.simultaneous[0].date, id=self.simultaneous[0].id)
+        transfers = (
+            self.database_gateway.get_transfers()
+            .after(cursor)
+            .ordered_by_date(ascending=True)
+        )
+        assert [t.id for t in transfers] == [self.simultaneous[1].id, self.later.id]
+
+    def test_that_transfers_before_cursor_are_returned(self) -> None:
+        cursor = Cursor(date=self.simultaneous[1].date, id=self.simultaneous[1].id)
+        transfers = (
+            self.database_gateway.get_transfers()
+            .before(cursor)
+            .ordered_by_date(ascending=False)
+        )
+        assert [t.id for t in transfers] == [self.simultaneous[0].id, self.earlier.id]
+
+    def test_that_cursor_between_transfers_does_not_need_to_match_a_transfer(
+        self,
+    ) -> None:
+        cursor = Cursor(date=datetime_utc(2021, 1, 2, 12), id=uuid4())
+        assert [t.id for t in self.database_gateway.get_transfers().after(cursor)] == [
+            self.later.id
+        ]
+
 
 class JoinedWithDebtorAndCreditorTests(DatabaseTestCase):
     def test_that_join_yields_member_and_same_member(self) -> None:
@@ -2,8 +2,35 @@
 Utility functions useful for database tests.
 """
 
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from sqlalchemy import Connection, event
+
 
 class Utility:
     @staticmethod
     def mangle_case(input: str) -> str:
         return input.upper() if input[0].islower() else input.lower()
+
+    @staticmethod
+    @contextmanager
+    def record_statements(connection: Connection) -> Iterator[list[str]]:
+        """Collect every SQL statement executed on the connection while
+        the context is active.
+        """
+        statements: list[str] = []
+
+        def before_cursor_execute(
+            conn: Any,
+            cursor: Any,
+            statement: str,
+            *args: Any,
+        ) -> None:
+            statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", before_cursor_execute)
+        try:
+            yield statements
+        finally:
+            event.remove(connection, "before_cursor_execute", before_cursor_execute)
@@ -4,13 +4,17 @@ from tests.email_notifications import EmailSenderTestImpl
 from tests.interactors import repositories
 from tests.mail_service import MockEmailService
 from tests.password_hasher import PasswordHasherImpl
-from tests.payout_factor import PayoutFactorConfigTestImpl
+from tests.payout_factor import (
+    PayoutFactorConfigTestImpl,
+    PayoutFactorInputsCacheTestImpl,
+)
 from tests.token import FakeTokenService
 from tests.web.email_configuration import FakeEmailConfiguration
 from tests.web.email_presenters.accountant_invitation_email_view import (
     AccountantInvitationEmailViewImpl,
 )
 from tests.web.email_presenters.text_renderer import TextRendererTestImpl
+from tests.web.plotting import FakeLinePlotConfiguration, FakePlotRenderer
 from tests.web.www.datetime_formatter import (
     FakeDatetimeFormatter,
     FakeTimezoneConfiguration,
@@ -34,7 +38,10 @@ from workers_control.core.injector import (
 from workers_control.core.password_hasher import PasswordHasher
 from workers_control.core.records import SocialAccounting
 from workers_control.core.repositories import DatabaseGateway, LanguageRepository
-from workers_control.core.services.payout_factor import PayoutFactorConfig
+from workers_control.core.services.payout_factor import (
+    PayoutFactorConfig,
+    PayoutFactorInputsCache,
+)
 from workers_control.web.colors import HexColors
 from workers_control.web.email import EmailConfiguration, MailService
 from workers_control.web.email.accountant_invitation_presenter import (
@@ -46,6 +53,7 @@ from workers_control.web.formatters.datetime_formatter import (
 )
 from workers_control.web.language_service import LanguageService
 from workers_control.web.notification import Notifier
+from workers_control.web.plotting import LinePlotConfiguration, PlotRenderer
 from workers_control.web.request import Request
 from workers_control.web.session import Session
 from workers_control.web.text_renderer import TextRenderer
@@ -71,6 +79,9 @@ class TestingModule(Module):
         binder[DatetimeService] = AliasProvider(FakeDatetimeService)
         binder[PasswordHasher] = AliasProvider(PasswordHasherImpl)
         binder[PayoutFactorConfig] = AliasProvider(PayoutFactorConfigTestImpl)
+        binder[LinePlotConfiguration] = AliasProvider(FakeLinePlotConfiguration)
+        binder[PlotRenderer] = AliasProvider(FakePlotRenderer)
+        binder[PayoutFactorInputsCache] = AliasProvider(PayoutFactorInputsCacheTestImpl)
         binder[LanguageRepository] = AliasProvider(repositories.FakeLanguageRepository)
         binder[LanguageService] = AliasProvider(FakeLanguageService)
         binder[MailService] = AliasProvider(MockEmailService)
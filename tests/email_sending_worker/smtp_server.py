@@ -0,0 +1,104 @@
+"""A minimal SMTP server for tests, in the spirit of aiosmtpd. It
+speaks just enough of the protocol for smtplib to deliver plain text
+messages and records connections and received messages.
+"""
+
+from __future__ import annotations
+
+import socket
+import socketserver
+import threading
+import time
+from typing import Self
+
+
+class LocalSmtpServer:
+    def __init__(self, handshake_delay_seconds: float = 0) -> None:
+        self.handshake_delay_seconds = handshake_delay_seconds
+        self.connections = 0
+        self.messages: list[bytes] = []
+        self._open_sockets: set[socket.socket] = set()
+        self._lock = threading.Lock()
+        self._server = socketserver.ThreadingTCPServer(
+            ("127.0.0.1", 0), self._create_handler()
+        )
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, kwargs={"poll_interval": 0.01}
+        )
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def __enter__(self) -> Self:
+        self._thread.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.disconnect_clients()
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+    def disconnect_clients(self) -> None:
+        """Close all open connections like a server would after an idle
+        timeout.
+        """
+        with self._lock:
+            sockets = list(self._open_sockets)
+        for client in sockets:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _create_handler(self) -> type[socketserver.StreamRequestHandler]:
+        server = self
+
+        class Handler(socketserver.StreamRequestHandler):
+            def handle(self) -> None:
+                with server._lock:
+                    server.connections += 1
+                    server._open_sockets.add(self.request)
+                try:
+                    self._converse()
+                finally:
+                    with server._lock:
+                        server._open_sockets.discard(self.request)
+
+            def _converse(self) -> None:
+                self._handshake_delay()
+                self._reply("220 localhost ESMTP")
+                while line := self.rfile.readline():
+                    command = line.decode().strip().upper()
+                    if command.startswith(("EHLO", "HELO")):
+                        self._handshake_delay()
+                        self._reply("250-localhost", "250 OK")
+                    elif command == "DATA":
+                        self._reply("354 End data with <CR><LF>.<CR><LF>")
+                        self._receive_message()
+                        self._reply("250 OK")
+                    elif command == "QUIT":
+                        self._reply("221 Bye")
+                        return
+                    elif command.startswith(("MAIL", "RCPT", "RSET", "NOOP")):
+                        self._reply("250 OK")
+                    else:
+                        self._reply("502 Command not implemented")
+
+            def _receive_message(self) -> None:
+                lines = []
+                while (line := self.rfile.readline()) not in (b".\r\n", b""):
+                    lines.append(line)
+                with server._lock:
+                    server.messages.append(b"".join(lines))
+
+            def _reply(self, *lines: str) -> None:
+                self.wfile.write("".join(f"{line}\r\n" for line in lines).encode())
+
+            def _handshake_delay(self) -> None:
+                if server.handshake_delay_seconds:
+                    time.sleep(server.handshake_delay_seconds)
+
+        return Handler
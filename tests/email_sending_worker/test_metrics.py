@@ -0,0 +1,103 @@
+import os
+import tempfile
+from unittest import TestCase
+from urllib.error import HTTPError
+from urllib.request import urlopen
+
+from workers_control.email_sending_worker.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    HttpMetricsExporter,
+    TextfileMetricsExporter,
+    WorkerMetrics,
+)
+
+
+class MetricRenderingTests(TestCase):
+    def test_counter_is_rendered_with_help_and_type(self) -> None:
+        counter = Counter("emails_total", "Emails.")
+        counter.inc()
+        counter.inc(2)
+        self.assertEqual(
+            list(counter.render()),
+            [
+                "# HELP emails_total Emails.",
+                "# TYPE emails_total counter",
+                "emails_total 3",
+            ],
+        )
+
+    def test_gauge_is_rendered_with_last_value(self) -> None:
+        gauge = Gauge("backlog", "Backlog.")
+        gauge.set(7)
+        gauge.set(4)
+        self.assertIn("backlog 4", list(gauge.render()))
+
+    def test_histogram_buckets_are_cumulative(self) -> None:
+        histogram = Histogram("duration", "Duration.", [1, 5])
+        for value in [0.5, 1, 3, 10]:
+            histogram.observe(value)
+        self.assertEqual(
+            list(histogram.render())[2:],
+            [
+                'duration_bucket{le="1"} 2',
+                'duration_bucket{le="5"} 3',
+                'duration_bucket{le="+Inf"} 4',
+                "duration_sum 14.5",
+                "duration_count 4",
+            ],
+        )
+
+    def test_worker_metrics_render_all_metrics(self) -> None:
+        rendered = WorkerMetrics().render()
+        for name in [
+            "email_worker_emails_sent_total",
+            "email_worker_send_failures_total",
+            "email_worker_send_duration_seconds",
+            "email_worker_queue_age_seconds",
+            "email_worker_backlog",
+            "email_worker_wakeups_total",
+        ]:
+            self.assertIn(f"# TYPE {name} ", rendered)
+
+
+class HttpMetricsExporterTests(TestCase):
+    def setUp(self) -> None:
+        self.metrics = WorkerMetrics()
+        self.exporter = HttpMetricsExporter(self.metrics, port=0)
+        self.exporter.start()
+        self.addCleanup(self.exporter.close)
+
+    def test_metrics_are_served(self) -> None:
+        self.metrics.emails_sent.inc()
+        with urlopen(f"http://127.0.0.1:{self.exporter.port}/metrics") as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+        self.assertIn("email_worker_emails_sent_total 1\n", body)
+        self.assertTrue(content_type.startswith("text/plain; version=0.0.4"))
+
+    def test_other_paths_are_not_found(self) -> None:
+        with self.assertRaises(HTTPError) as context:
+            urlopen(f"http://127.0.0.1:{self.exporter.port}/")
+        self.assertEqual(context.exception.code, 404)
+
+
+class TextfileMetricsExporterTests(TestCase):
+    def setUp(self) -> None:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, "email_worker.prom")
+        self.metrics = WorkerMetrics()
+        self.exporter = TextfileMetricsExporter(self.metrics, self.path)
+
+    def test_metrics_are_written_on_update(self) -> None:
+        self.metrics.backlog.set(12)
+        self.exporter.update()
+        with open(self.path) as file:
+            self.assertIn("email_worker_backlog 12\n", file.read())
+
+    def test_no_temporary_files_are_left_behind(self) -> None:
+        self.exporter.update()
+        self.exporter.update()
+        self.assertEqual(os.listdir(os.path.dirname(self.path)), ["email_worker.prom"])
@@ -0,0 +1,109 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from smtplib import SMTP, SMTP_SSL
+from unittest import TestCase
+
+from tests.email_sending_worker.smtp_server import LocalSmtpServer
+from workers_control.email_sending_worker.smtp_service import (
+    SmtpMailServerConfig,
+    SmtpMailService,
+)
+
+
+class PlainSmtpMailService(SmtpMailService):
+    """The local server does not offer STARTTLS, so the connection
+    stays unencrypted.
+    """
+
+    def connect(self) -> SMTP | SMTP_SSL:
+        connection = SMTP(self.config.mail_server, port=self.config.mail_port)
+        connection.ehlo()
+        return connection
+
+
+class SmtpMailServiceTests(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.server = LocalSmtpServer()
+        self.enterContext(self.server)
+
+    def create_service(
+        self, max_messages_per_connection: int = 100
+    ) -> PlainSmtpMailService:
+        service = PlainSmtpMailService(
+            config=SmtpMailServerConfig(
+                mail_server="127.0.0.1",
+                mail_port=self.server.port,
+                encryption_type="tls",
+                max_messages_per_connection=max_messages_per_connection,
+            )
+        )
+        self.addCleanup(service.close)
+        return service
+
+    def send(self, service: SmtpMailService, n: int = 1) -> None:
+        for i in range(n):
+            service.send_message(
+                subject=f"message {i}",
+                recipient=["to@example.org"],
+                html="<p>hi</p>",
+                sender="from@example.org",
+            )
+
+    def test_that_message_is_delivered(self) -> None:
+        service = self.create_service()
+        self.send(service)
+        assert len(self.server.messages) == 1
+        assert b"Subject: message 0" in self.server.messages[0]
+
+    def test_that_consecutive_messages_share_one_connection(self) -> None:
+        service = self.create_service()
+        self.send(service, n=5)
+        assert len(self.server.messages) == 5
+        assert self.server.connections == 1
+
+    def test_that_connection_is_replaced_after_max_messages(self) -> None:
+        service = self.create_service(max_messages_per_connection=2)
+        self.send(service, n=5)
+        assert len(self.server.messages) == 5
+        assert self.server.connections == 3
+
+    def test_that_new_connection_is_opened_after_close(self) -> None:
+        service = self.create_service()
+        self.send(service)
+        service.close()
+        self.send(service)
+        assert self.server.connections == 2
+
+    def test_that_closing_without_connection_does_nothing(self) -> None:
+        service = self.create_service()
+        service.close()
+        assert self.server.connections == 0
+
+    def test_that_service_reconnects_after_server_closed_connection(self) -> None:
+        service = self.create_service()
+        self.send(service)
+        self.server.disconnect_clients()
+        self.send(service)
+        assert len(self.server.messages) == 2
+        assert self.server.connections == 2
+
+    def test_that_concurrent_senders_use_separate_connections(self) -> None:
+        self.server.handshake_delay_seconds = 0.01
+        service = self.create_service()
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            list(executor.map(lambda _: self.send(service, n=4), range(3)))
+        assert len(self.server.messages) == 12
+        assert 1 <= self.server.connections <= 3
+
+    def test_that_reusing_the_connection_increases_throughput(self) -> None:
+        self.server.handshake_delay_seconds = 0.02
+        started = time.perf_counter()
+        self.send(self.create_service(max_messages_per_connection=1), n=10)
+        duration_with_connection_per_message = time.perf_counter() - started
+        started = time.perf_counter()
+        self.send(self.create_service(), n=10)
+        duration_with_reused_connection = time.perf_counter() - started
+        assert (
+            duration_with_reused_connection < duration_with_connection_per_message / 3
+        )
@@ -1,19 +1,29 @@
+import signal
 from dataclasses import dataclass, field
 from datetime import timedelta
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple
 from uuid import UUID
 
 from tests.base_test_case import BaseTestCase
 from tests.datetime_service import datetime_utc
 from tests.interactors.repositories import MockDatabase
-from workers_control.email_sending_worker.interface import EmailSenderPlugin
-from workers_control.email_sending_worker.worker import EmailWorker
+from workers_control.email_sending_worker.interface import (
+    EmailSenderPlugin,
+    NewEmailNotifications,
+)
+from workers_control.email_sending_worker.metrics import MetricsExporter, WorkerMetrics
+from workers_control.email_sending_worker.worker import (
+    DEFAULT_RETRY_DELAY,
+    MAX_RETRY_DELAY,
+    EmailWorker,
+)
 
 
 @dataclass
 class CapturingMailService(EmailSenderPlugin):
     sent: List[Tuple[str, list[str], str, str]] = field(default_factory=list)
     fail_with: Optional[Exception] = None
+    closed: int = 0
 
     def send_message(
         self, subject: str, recipient: list[str], html: str, sender: str
@@ -22,6 +32,54 @@ class CapturingMailService(EmailSenderPlugin):
             raise self.fail_with
         self.sent.append((subject, recipient, html, sender))
 
+    def close(self) -> None:
+        self.closed += 1
+
+
+@dataclass
+class FakeNotifications(NewEmailNotifications):
+    """Calls `on_wait` for every wait and reports a new email for the
+    first `wakeups` waits."""
+
+    on_wait: Callable[[], None] = lambda: None
+    wakeups: int = 0
+    waits: List[float] = field(default_factory=list)
+    started: int = 0
+    closed: int = 0
+
+    def start(self) -> None:
+        self.started += 1
+
+    def wait(self, timeout: float) -> bool:
+        self.waits.append(timeout)
+        self.on_wait()
+        if self.wakeups:
+            self.wakeups -= 1
+            return True
+        return False
+
+    def close(self) -> None:
+        self.closed += 1
+
+
+@dataclass
+class CapturingMetricsExporter(MetricsExporter):
+    metrics: WorkerMetrics
+    backlogs: List[float] = field(default_factory=list)
+    updates: int = 0
+    started: int = 0
+    closed: int = 0
+
+    def start(self) -> None:
+        self.started += 1
+
+    def update(self) -> None:
+        self.updates += 1
+        self.backlogs.append(self.metrics.backlog.value)
+
+    def close(self) -> None:
+        self.closed += 1
+
 
 class EmailWorkerTests(BaseTestCase):
     def setUp(self) -> None:
@@ -81,14 +139,80 @@ class EmailWorkerTests(BaseTestCase):
         self.assertEqual(status.retry_count, 1)
         self.assertEqual(status.last_error, "smtp boom")
 
-    def test_failed_email_is_retried_on_next_run(self) -> None:
+    def test_failed_email_is_retried_once_the_retry_delay_passed(self) -> None:
         self._create_email()
         self.mail_service.fail_with = RuntimeError("smtp boom")
         self.worker.run_once()
         self.mail_service.fail_with = None
+        self.datetime_service.advance_time(DEFAULT_RETRY_DELAY)
         sent = self.worker.run_once()
         self.assertEqual(sent, 1)
 
+    def test_failed_email_is_not_retried_before_the_retry_delay_passed(
+        self,
+    ) -> None:
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.mail_service.fail_with = None
+        self.datetime_service.advance_time(DEFAULT_RETRY_DELAY / 2)
+        sent = self.worker.run_once()
+        self.assertEqual(sent, 0)
+
+    def test_retry_delay_doubles_with_every_failed_attempt(self) -> None:
+        email_id = self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.datetime_service.advance_time(DEFAULT_RETRY_DELAY)
+        self.worker.run_once()
+        status = self.database.email_outbox_status[email_id]
+        self.assertEqual(
+            status.next_attempt_at,
+            self.datetime_service.now() + 2 * DEFAULT_RETRY_DELAY,
+        )
+
+    def test_retry_delay_is_capped(self) -> None:
+        self.worker.max_attempts = 20
+        email_id = self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        for _ in range(15):
+            self.worker.run_once()
+            self.datetime_service.advance_time(MAX_RETRY_DELAY)
+        status = self.database.email_outbox_status[email_id]
+        self.assertEqual(status.retry_count, 15)
+        self.assertEqual(status.next_attempt_at, self.datetime_service.now())
+
+    def test_email_is_moved_to_dead_letters_after_max_attempts(self) -> None:
+        self.worker.max_attempts = 3
+        email_id = self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        for _ in range(3):
+            self.worker.run_once()
+            self.datetime_service.advance_time(MAX_RETRY_DELAY)
+        dead_letters = list(self.database_gateway.get_emails().that_are_dead_letters())
+        self.assertEqual([email.id for email in dead_letters], [email_id])
+
+    def test_dead_letters_are_not_attempted_again(self) -> None:
+        self.worker.max_attempts = 1
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.mail_service.fail_with = None
+        self.datetime_service.advance_time(MAX_RETRY_DELAY)
+        self.assertEqual(self.worker.run_once(), 0)
+
+    def test_failed_email_does_not_block_newer_emails(self) -> None:
+        self.worker.batch_size = 1
+        self._create_email(recipient="bad@example.org")
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.mail_service.fail_with = None
+        self.datetime_service.advance_time(timedelta(seconds=1))
+        self._create_email(recipient="good@example.org")
+        self.datetime_service.advance_time(DEFAULT_RETRY_DELAY)
+        self.worker.run_once()
+        self.assertEqual(self.mail_service.sent[0][1], ["good@example.org"])
+
     def test_batch_size_limits_emails_processed_per_run(self) -> None:
         for i in range(10):
             self._create_email(recipient=f"to{i}@example.org")
@@ -113,11 +237,250 @@ class EmailWorkerTests(BaseTestCase):
             self.mail_service.sent[0][1], ["a@example.org", "b@example.org"]
         )
 
-    def test_commit_is_called_after_processing_a_batch(self) -> None:
+    def test_commit_is_called_after_claiming_and_after_processing_a_batch(
+        self,
+    ) -> None:
         self._create_email()
         self.worker.run_once()
-        self.assertEqual(self.commits, 1)
+        self.assertEqual(self.commits, 2)
 
     def test_commit_is_not_called_when_no_emails_to_process(self) -> None:
         self.worker.run_once()
         self.assertEqual(self.commits, 0)
+
+    def test_mail_service_is_closed_when_outbox_is_empty(self) -> None:
+        self.worker.run_once()
+        self.assertEqual(self.mail_service.closed, 1)
+
+    def test_mail_service_is_closed_after_draining_the_outbox(self) -> None:
+        self._create_email()
+        self.worker.run_once()
+        self.assertEqual(self.mail_service.closed, 1)
+
+    def test_mail_service_is_kept_open_after_a_full_batch(self) -> None:
+        for i in range(5):
+            self._create_email(recipient=f"to{i}@example.org")
+        self.worker.run_once()
+        self.assertEqual(self.mail_service.closed, 0)
+
+    def test_email_claimed_by_another_worker_is_not_sent(self) -> None:
+        email_id = self._create_email()
+        self.database_gateway.get_emails().with_id(email_id).claim(
+            until=self.datetime_service.now() + timedelta(minutes=1), limit=1
+        )
+        self.assertEqual(self.worker.run_once(), 0)
+        self.assertEqual(self.mail_service.sent, [])
+
+    def test_email_is_sent_once_the_claim_of_another_worker_expired(self) -> None:
+        email_id = self._create_email()
+        self.database_gateway.get_emails().with_id(email_id).claim(
+            until=self.datetime_service.now() + timedelta(minutes=1), limit=1
+        )
+        self.datetime_service.advance_time(timedelta(minutes=1))
+        self.assertEqual(self.worker.run_once(), 1)
+
+    def test_sent_email_stays_claimed(self) -> None:
+        email_id = self._create_email()
+        self.worker.run_once()
+        status = self.database.email_outbox_status[email_id]
+        self.assertIsNotNone(status.claimed_until)
+
+    def test_claim_of_failed_email_is_released(self) -> None:
+        email_id = self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        status = self.database.email_outbox_status[email_id]
+        self.assertIsNone(status.claimed_until)
+
+    def test_two_workers_do_not_send_the_same_email(self) -> None:
+        other_mail_service = CapturingMailService()
+        other_worker = EmailWorker(
+            mail_service=other_mail_service,
+            database_gateway=self.database_gateway,
+            datetime_service=self.datetime_service,
+            commit=self._commit,
+            batch_size=5,
+        )
+        for i in range(8):
+            self._create_email(recipient=f"to{i}@example.org")
+        self.worker.run_once()
+        other_worker.run_once()
+        recipients = [args[1][0] for args in self.mail_service.sent] + [
+            args[1][0] for args in other_mail_service.sent
+        ]
+        self.assertEqual(len(recipients), 8)
+        self.assertEqual(len(set(recipients)), 8)
+
+    def test_sent_emails_are_counted(self) -> None:
+        self._create_email()
+        self._create_email()
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.emails_sent.value, 2)
+        self.assertEqual(self.worker.metrics.send_failures.value, 0)
+
+    def test_time_emails_spent_in_the_outbox_is_observed(self) -> None:
+        self._create_email()
+        self.datetime_service.advance_time(timedelta(seconds=30))
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.queue_age.count, 1)
+        self.assertEqual(self.worker.metrics.queue_age.sum, 30)
+
+    def test_send_duration_is_observed_for_every_attempt(self) -> None:
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.send_duration.count, 1)
+
+    def test_failed_attempts_are_counted(self) -> None:
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.send_failures.value, 1)
+        self.assertEqual(self.worker.metrics.emails_sent.value, 0)
+
+    def test_attempts_needed_to_send_an_email_are_observed(self) -> None:
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.mail_service.fail_with = None
+        self.datetime_service.advance_time(DEFAULT_RETRY_DELAY)
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.attempts.sum, 2)
+
+    def test_emails_moved_to_dead_letters_are_counted(self) -> None:
+        self.worker.max_attempts = 1
+        self._create_email()
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.dead_letters_created.value, 1)
+
+    def test_polls_are_counted(self) -> None:
+        self.worker.run_once()
+        self.worker.run_once()
+        self.assertEqual(self.worker.metrics.polls.value, 2)
+
+
+class ConcurrentEmailWorkerTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.mail_service = CapturingMailService()
+        self.database = self.injector.get(MockDatabase)
+        self.worker = EmailWorker(
+            mail_service=self.mail_service,
+            database_gateway=self.database_gateway,
+            datetime_service=self.datetime_service,
+            commit=lambda: None,
+            batch_size=5,
+            concurrency=3,
+        )
+
+    def _create_email(self, recipient: str) -> UUID:
+        return self.database_gateway.create_email(
+            created_at=self.datetime_service.now(),
+            recipient=recipient,
+            sender="from@example.org",
+            subject="hello",
+            html="<p>hi</p>",
+        ).id
+
+    def test_all_emails_of_a_batch_are_sent_once(self) -> None:
+        for i in range(5):
+            self._create_email(recipient=f"to{i}@example.org")
+        self.assertEqual(self.worker.run_once(), 5)
+        recipients = [args[1][0] for args in self.mail_service.sent]
+        self.assertEqual(sorted(recipients), [f"to{i}@example.org" for i in range(5)])
+
+    def test_all_emails_of_a_batch_are_marked_sent(self) -> None:
+        email_ids = [self._create_email(f"to{i}@example.org") for i in range(5)]
+        self.worker.run_once()
+        for email_id in email_ids:
+            self.assertIsNotNone(self.database.email_outbox_status[email_id].sent_at)
+
+    def test_failures_are_recorded_for_every_email(self) -> None:
+        email_ids = [self._create_email(f"to{i}@example.org") for i in range(3)]
+        self.mail_service.fail_with = RuntimeError("smtp boom")
+        self.worker.run_once()
+        for email_id in email_ids:
+            self.assertEqual(self.database.email_outbox_status[email_id].retry_count, 1)
+
+
+class NotifiedEmailWorkerTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            self.addCleanup(signal.signal, signum, signal.getsignal(signum))
+        self.mail_service = CapturingMailService()
+        self.notifications = FakeNotifications()
+        self.worker = EmailWorker(
+            mail_service=self.mail_service,
+            database_gateway=self.database_gateway,
+            datetime_service=self.datetime_service,
+            commit=lambda: None,
+            poll_interval_seconds=60,
+            notifications=self.notifications,
+        )
+
+    def _create_email(self) -> None:
+        self.database_gateway.create_email(
+            created_at=self.datetime_service.now(),
+            recipient="to@example.org",
+            sender="from@example.org",
+            subject="hello",
+            html="<p>hi</p>",
+        )
+
+    def _stop_after_waits(self, count: int) -> None:
+        def on_wait() -> None:
+            if len(self.notifications.waits) >= count:
+                self.worker.stop()
+
+        self.notifications.on_wait = on_wait
+
+    def test_notifications_are_started_and_closed_with_the_worker(self) -> None:
+        self._stop_after_waits(1)
+        self.worker.run()
+        self.assertEqual(self.notifications.started, 1)
+        self.assertEqual(self.notifications.closed, 1)
+
+    def test_worker_waits_for_notifications_in_short_intervals(self) -> None:
+        self._stop_after_waits(1)
+        self.worker.run()
+        self.assertEqual(self.notifications.waits, [0.5])
+
+    def test_worker_polls_again_right_after_being_notified(self) -> None:
+        def on_wait() -> None:
+            if len(self.notifications.waits) == 1:
+                self._create_email()
+            else:
+                self.worker.stop()
+
+        self.notifications.on_wait = on_wait
+        self.notifications.wakeups = 1
+        self.worker.run()
+        self.assertEqual(len(self.mail_service.sent), 1)
+        self.assertEqual(len(self.notifications.waits), 2)
+
+    def test_wakeups_are_counted(self) -> None:
+        self._stop_after_waits(1)
+        self.notifications.wakeups = 1
+        self.worker.run()
+        self.assertEqual(self.worker.metrics.wakeups.value, 1)
+
+    def test_metrics_exporters_are_started_updated_and_closed(self) -> None:
+        exporter = CapturingMetricsExporter(self.worker.metrics)
+        self.worker.metrics_exporters = [exporter]
+        self._stop_after_waits(1)
+        self.worker.run()
+        self.assertEqual(exporter.started, 1)
+        self.assertEqual(exporter.updates, 1)
+        self.assertEqual(exporter.closed, 1)
+
+    def test_backlog_of_due_emails_is_exported_after_every_poll(self) -> None:
+        exporter = CapturingMetricsExporter(self.worker.metrics)
+        self.worker.metrics_exporters = [exporter]
+        self.worker.batch_size = 1
+        for _ in range(3):
+            self._create_email()
+        self._stop_after_waits(1)
+        self.worker.run()
+        self.assertEqual(exporter.backlogs, [2, 1, 0, 0])
@@ -36,6 +36,7 @@ class FlaskTestConfiguration(dict):
                 "MAIL_PORT": 0,
                 "MAIL_USERNAME": "",
                 "MAIL_PASSWORD": "",
+                "MAIL_MAX_MESSAGES_PER_CONNECTION": 100,
                 "LANGUAGES": {"en": "English", "de": "Deutsch", "es": "Español"},
                 "WOCO_PASSWORD_HASHER": "tests.password_hasher:PasswordHasherImpl",
                 "AUTO_MIGRATE": False,
@@ -44,6 +45,12 @@ class FlaskTestConfiguration(dict):
                 "ALLOWED_OVERDRAW_MEMBER": "unlimited",
                 "ACCEPTABLE_RELATIVE_ACCOUNT_DEVIATION": 33,
                 "PAYOUT_FACTOR_CALCULATION_WINDOW": 180,
+                "LINE_PLOT_MAX_POINTS": 2000,
+                "PLOT_CACHE_SIZE": 256,
+                "PLOT_CACHE_DIRECTORY": "",
+                "PLOT_CACHE_DIRECTORY_SIZE": 10000,
+                "PLOT_RENDERING_PROCESSES": 0,
+                "PLOT_RENDERING_TIMEOUT": 30,
                 "FORCE_HTTPS": True,
             }
         )
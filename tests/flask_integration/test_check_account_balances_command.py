@@ -0,0 +1,11 @@
+from workers_control.flask.commands import check_account_balances
+
+from .base_test_case import FlaskTestCase
+
+
+class CheckAccountBalancesTests(FlaskTestCase):
+    def test_can_check_account_balances_without_crashing(self) -> None:
+        check_account_balances(repair=False)
+
+    def test_can_repair_account_balances_without_crashing(self) -> None:
+        check_account_balances(repair=True)
@@ -0,0 +1,26 @@
+from tests.flask_integration.base_test_case import FlaskTestCase
+from workers_control.flask.context_processors import add_template_variables
+
+
+class AddTemplateVariablesTests(FlaskTestCase):
+    def test_all_configured_languages_are_listed(self) -> None:
+        with self.app.test_request_context():
+            languages = add_template_variables()["languages"]
+        self.assertEqual(
+            [item.label for item in languages.languages_listing],
+            ["English", "Deutsch", "Español"],
+        )
+
+    def test_language_listing_is_presented_once_per_app(self) -> None:
+        with self.app.test_request_context():
+            first = add_template_variables()["languages"]
+        with self.app.test_request_context():
+            second = add_template_variables()["languages"]
+        self.assertIs(first, second)
+
+    def test_language_change_urls_are_relative_inside_of_requests(self) -> None:
+        add_template_variables()
+        with self.app.test_request_context():
+            languages = add_template_variables()["languages"]
+        for item in languages.languages_listing:
+            self.assertTrue(item.change_url.startswith("/"))
@@ -0,0 +1,24 @@
+from tests.flask_integration.base_test_case import FlaskTestCase
+from workers_control.core.services.price_calculator import PriceCalculator
+from workers_control.flask.dependency_injection import get_dependency_injector
+
+
+class GetDependencyInjectorTests(FlaskTestCase):
+    def test_injector_is_shared_between_requests(self) -> None:
+        with self.app.test_request_context():
+            first = get_dependency_injector()
+        with self.app.test_request_context():
+            second = get_dependency_injector()
+        self.assertIs(first, second)
+
+    def test_request_scoped_services_are_shared_within_a_request(self) -> None:
+        with self.app.app_context():
+            injector = get_dependency_injector()
+            self.assertIs(injector.get(PriceCalculator), injector.get(PriceCalculator))
+
+    def test_request_scoped_services_are_not_shared_between_requests(self) -> None:
+        with self.app.app_context():
+            first = get_dependency_injector().get(PriceCalculator)
+        with self.app.app_context():
+            second = get_dependency_injector().get(PriceCalculator)
+        self.assertIsNot(first, second)
@@ -0,0 +1,50 @@
+from unittest import TestCase
+
+import numpy as np
+from parameterized import parameterized
+
+from workers_control.flask.downsampling import largest_triangle_three_buckets
+
+
+class LargestTriangleThreeBucketsTests(TestCase):
+    @parameterized.expand([(0,), (1,), (3,), (10,)])
+    def test_that_series_within_budget_are_kept_entirely(self, length: int) -> None:
+        x = np.arange(length)
+        indices = largest_triangle_three_buckets(x, x, max_points=10)
+        assert list(indices) == list(range(length))
+
+    @parameterized.expand([(3,), (10,), (1000,)])
+    def test_that_long_series_are_reduced_to_the_budget(self, max_points: int) -> None:
+        x = np.arange(10_000)
+        indices = largest_triangle_three_buckets(x, np.sin(x), max_points)
+        assert len(indices) == max_points
+
+    def test_that_first_and_last_point_are_kept(self) -> None:
+        x = np.arange(1000)
+        indices = largest_triangle_three_buckets(x, np.cos(x), max_points=50)
+        assert indices[0] == 0
+        assert indices[-1] == 999
+
+    def test_that_selected_indices_are_strictly_ascending(self) -> None:
+        x = np.arange(1000)
+        indices = largest_triangle_three_buckets(x, np.cos(x), max_points=50)
+        assert np.all(np.diff(indices) > 0)
+
+    def test_that_a_single_spike_is_kept(self) -> None:
+        x = np.arange(1000)
+        y = np.zeros(1000)
+        y[567] = 100
+        indices = largest_triangle_three_buckets(x, y, max_points=10)
+        assert 567 in indices
+
+    def test_that_scaling_x_does_not_change_the_selection(self) -> None:
+        x = np.arange(1000)
+        y = np.random.default_rng(0).normal(size=1000).cumsum()
+        indices = largest_triangle_three_buckets(x, y, max_points=20)
+        scaled_indices = largest_triangle_three_buckets(x * 86400.0, y, max_points=20)
+        assert list(indices) == list(scaled_indices)
+
+    def test_that_fewer_than_three_points_cannot_be_selected(self) -> None:
+        x = np.arange(10)
+        with self.assertRaises(ValueError):
+            largest_triangle_three_buckets(x, x, max_points=2)
@@ -0,0 +1,326 @@
+import hashlib
+import os
+import tempfile
+from unittest import TestCase
+from uuid import UUID
+
+from parameterized import parameterized
+
+from tests.datetime_service import datetime_utc
+from tests.flask_integration.base_test_case import ViewTestCase
+from workers_control.core.injector import Binder, CallableProvider, Module
+from workers_control.flask.plot_cache import PLOT_CACHE_SUBDIRECTORY, PlotStore
+
+from .dependency_injection import FlaskTestConfiguration
+
+PNG_MAGIC_BYTES = b"\x89PNG"
+ACCOUNT_KINDS = [("prd",), ("r",), ("p",), ("a",)]
+
+
+class LinePlotCacheTests(ViewTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.login_company()
+        self.company = self.company_generator.create_company_record()
+
+    @parameterized.expand(ACCOUNT_KINDS)
+    def test_that_plot_is_returned_with_an_etag(self, kind: str) -> None:
+        response = self.client.get(self.create_url(kind))
+        assert response.status_code == 200
+        assert response.data.startswith(PNG_MAGIC_BYTES)
+        assert response.headers["ETag"]
+
+    @parameterized.expand(ACCOUNT_KINDS)
+    def test_that_clients_have_to_revalidate_the_plot(self, kind: str) -> None:
+        response = self.client.get(self.create_url(kind))
+        assert response.cache_control.private
+        assert response.cache_control.no_cache
+
+    @parameterized.expand(ACCOUNT_KINDS)
+    def test_that_304_is_returned_if_client_has_the_current_plot(
+        self, kind: str
+    ) -> None:
+        etag = self.client.get(self.create_url(kind)).headers["ETag"]
+        response = self.client.get(
+            self.create_url(kind), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+        assert not response.data
+
+    @parameterized.expand(ACCOUNT_KINDS)
+    def test_that_plot_is_returned_after_a_transfer_to_the_account(
+        self, kind: str
+    ) -> None:
+        etag = self.client.get(self.create_url(kind)).headers["ETag"]
+        self.transfer_generator.create_transfer(credit_account=self.get_account(kind))
+        response = self.client.get(
+            self.create_url(kind), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    def test_that_transfers_to_other_accounts_of_the_company_keep_the_plot(
+        self,
+    ) -> None:
+        etag = self.client.get(self.create_url("prd")).headers["ETag"]
+        self.transfer_generator.create_transfer(
+            credit_account=self.company.means_account
+        )
+        response = self.client.get(
+            self.create_url("prd"), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 304
+
+    def test_that_plots_of_different_accounts_have_different_etags(self) -> None:
+        etags = {
+            self.client.get(self.create_url(kind)).headers["ETag"]
+            for kind, in ACCOUNT_KINDS
+        }
+        assert len(etags) == len(ACCOUNT_KINDS)
+
+    def test_that_plot_in_another_timezone_has_a_different_etag(self) -> None:
+        etag = self.client.get(self.create_url("prd")).headers["ETag"]
+        self.client.set_cookie(
+            "user_timezone", "Asia/Tokyo", domain=self.app.config["SERVER_NAME"]
+        )
+        response = self.client.get(
+            self.create_url("prd"), headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.headers["ETag"] != etag
+
+    @parameterized.expand(
+        [("png", "image/png"), ("svg", "image/svg+xml"), ("json", "application/json")]
+    )
+    def test_that_plot_is_returned_in_the_requested_format(
+        self, plot_format: str, mimetype: str
+    ) -> None:
+        response = self.client.get(self.create_url("prd") + f"&format={plot_format}")
+        assert response.status_code == 200
+        assert response.mimetype == mimetype
+
+    def test_that_plots_in_different_formats_have_different_etags(self) -> None:
+        etag = self.client.get(self.create_url("prd")).headers["ETag"]
+        response = self.client.get(
+            self.create_url("prd") + "&format=svg", headers={"If-None-Match": etag}
+        )
+        assert response.status_code == 200
+        assert response.mimetype == "image/svg+xml"
+
+    def test_that_json_plot_contains_a_point_per_transfer(self) -> None:
+        self.transfer_generator.create_transfer(
+            credit_account=self.company.product_account
+        )
+        self.transfer_generator.create_transfer(
+            credit_account=self.company.product_account
+        )
+        response = self.client.get(self.create_url("prd") + "&format=json")
+        assert response.json
+        assert len(response.json["x"]) == 2
+        assert len(response.json["y"]) == 2
+
+    def test_that_plot_without_transfers_has_no_last_modified_date(self) -> None:
+        response = self.client.get(self.create_url("prd"))
+        assert response.last_modified is None
+
+    def test_that_last_modified_date_is_the_date_of_the_last_transfer(self) -> None:
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2021, 3, 4, 5, 6, 7),
+            credit_account=self.company.product_account,
+        )
+        response = self.client.get(self.create_url("prd"))
+        assert response.last_modified == datetime_utc(2021, 3, 4, 5, 6, 7)
+
+    def create_url(self, kind: str) -> str:
+        return (
+            f"/plots/line_plot_of_company_{kind}_account?company_id={self.company.id}"
+        )
+
+    def get_account(self, kind: str) -> UUID:
+        return {
+            "prd": self.company.product_account,
+            "r": self.company.raw_material_account,
+            "p": self.company.means_account,
+            "a": self.company.work_account,
+        }[kind]
+
+
+class LinePlotCacheDirectoryTests(ViewTestCase):
+    def setUp(self) -> None:
+        self.directory = tempfile.TemporaryDirectory()
+        super().setUp()
+        self.login_company()
+        self.company = self.company_generator.create_company()
+
+    def tearDown(self) -> None:
+        super().tearDown()
+        self.directory.cleanup()
+
+    def get_injection_modules(self) -> list[Module]:
+        directory = self.directory.name
+
+        class _Module(Module):
+            def configure(self, binder: Binder) -> None:
+                super().configure(binder)
+                binder[FlaskTestConfiguration] = CallableProvider(
+                    _Module.provide_flask_configuration
+                )
+
+            @staticmethod
+            def provide_flask_configuration() -> FlaskTestConfiguration:
+                configuration = FlaskTestConfiguration.default()
+                configuration["PLOT_CACHE_DIRECTORY"] = directory
+                return configuration
+
+        modules = super().get_injection_modules()
+        modules.append(_Module())
+        return modules
+
+    def test_that_rendered_plot_is_stored_in_the_directory(self) -> None:
+        response = self.client.get(
+            f"/plots/line_plot_of_company_prd_account?company_id={self.company}"
+        )
+        etag = response.headers["ETag"].strip('"')
+        path = os.path.join(self.directory.name, PLOT_CACHE_SUBDIRECTORY, f"{etag}.png")
+        with open(path, "rb") as file:
+            assert file.read() == response.data
+
+    def test_that_other_files_in_the_directory_are_kept(self) -> None:
+        other_file = os.path.join(self.directory.name, create_key("other"))
+        with open(other_file, "wb") as file:
+            file.write(b"other data")
+        self.client.get(
+            f"/plots/line_plot_of_company_prd_account?company_id={self.company}"
+        )
+        assert os.path.exists(other_file)
+
+
+def create_key(name: str, extension: str = "png") -> str:
+    return f"{hashlib.sha256(name.encode()).hexdigest()}.{extension}"
+
+
+A = create_key("a")
+B = create_key("b")
+C = create_key("c")
+
+
+class PlotStoreTests(TestCase):
+    def test_that_nothing_is_found_in_an_empty_store(self) -> None:
+        store = PlotStore(max_entries=2, directory=None, max_files=10)
+        assert store.get(A) is None
+
+    def test_that_stored_plot_is_found(self) -> None:
+        store = PlotStore(max_entries=2, directory=None, max_files=10)
+        store.put(A, b"plot a")
+        assert store.get(A) == b"plot a"
+
+    def test_that_least_recently_used_plot_is_evicted(self) -> None:
+        store = PlotStore(max_entries=2, directory=None, max_files=10)
+        store.put(A, b"plot a")
+        store.put(B, b"plot b")
+        store.get(A)
+        store.put(C, b"plot c")
+        assert store.get(A) == b"plot a"
+        assert store.get(B) is None
+        assert store.get(C) == b"plot c"
+
+    def test_that_plot_stored_on_disk_is_found_by_another_store(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            PlotStore(max_entries=2, directory=directory, max_files=10).put(
+                A, b"plot a"
+            )
+            store = PlotStore(max_entries=2, directory=directory, max_files=10)
+            assert store.get(A) == b"plot a"
+
+    def test_that_evicted_plot_is_found_on_disk(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = PlotStore(max_entries=1, directory=directory, max_files=10)
+            store.put(A, b"plot a")
+            store.put(B, b"plot b")
+            assert store.get(A) == b"plot a"
+
+    def test_that_missing_directory_is_created(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            plots = os.path.join(directory, "plots")
+            PlotStore(max_entries=1, directory=plots, max_files=10).put(A, b"plot a")
+            assert os.listdir(plots) == [A]
+
+    def test_that_least_recently_stored_file_is_deleted_beyond_the_limit(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = PlotStore(max_entries=1, directory=directory, max_files=2)
+            store.put(A, b"plot a")
+            store.put(B, b"plot b")
+            os.utime(os.path.join(directory, A), (1, 1))
+            os.utime(os.path.join(directory, B), (2, 2))
+            store.put(C, b"plot c")
+            assert sorted(os.listdir(directory)) == sorted([B, C])
+
+    def test_that_reading_a_file_keeps_it_from_being_deleted(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = PlotStore(max_entries=1, directory=directory, max_files=2)
+            store.put(A, b"plot a")
+            store.put(B, b"plot b")
+            os.utime(os.path.join(directory, A), (1, 1))
+            os.utime(os.path.join(directory, B), (2, 2))
+            PlotStore(max_entries=1, directory=directory, max_files=2).get(A)
+            store.put(C, b"plot c")
+            assert sorted(os.listdir(directory)) == sorted([A, C])
+
+    @parameterized.expand([("notes.txt",), ("a",), (create_key("a", "tmp"),)])
+    def test_that_files_not_named_like_plots_are_not_deleted(
+        self, file_name: str
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, file_name)
+            with open(path, "wb") as file:
+                file.write(b"other data")
+            os.utime(path, (1, 1))
+            store = PlotStore(max_entries=1, directory=directory, max_files=1)
+            store.put(A, b"plot a")
+            store.put(B, b"plot b")
+            assert sorted(os.listdir(directory)) == sorted([file_name, B])
+
+    def test_that_directory_is_checked_after_every_tenth_of_the_limit(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            store = PlotStore(max_entries=1, directory=directory, max_files=10)
+            store.put(A, b"plot a")
+            for n in range(10):
+                with open(os.path.join(directory, create_key(str(n))), "wb") as file:
+                    file.write(b"plot")
+            store.put(B, b"plot b")
+            assert len(os.listdir(directory)) == 12
+            store.put(C, b"plot c")
+            assert len(os.listdir(directory)) == 10
+
+    def test_that_plot_is_kept_in_memory_if_directory_cannot_be_created(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            not_a_directory = os.path.join(directory, "file")
+            with open(not_a_directory, "wb"):
+                pass
+            store = PlotStore(max_entries=1, directory=not_a_directory, max_files=10)
+            with self.assertLogs("workers_control.flask.plot_cache", "WARNING"):
+                store.put(A, b"plot a")
+            assert store.get(A) == b"plot a"
+
+    def test_that_temporary_file_is_removed_if_plot_cannot_be_written(
+        self,
+    ) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, A))
+            store = PlotStore(max_entries=1, directory=directory, max_files=10)
+            with self.assertLogs("workers_control.flask.plot_cache", "WARNING"):
+                store.put(A, b"plot a")
+            assert os.listdir(directory) == [A]
+
+    def test_that_nothing_is_found_if_plot_cannot_be_read(self) -> None:
+        with tempfile.TemporaryDirectory() as directory:
+            os.mkdir(os.path.join(directory, A))
+            store = PlotStore(max_entries=1, directory=directory, max_files=10)
+            with self.assertLogs("workers_control.flask.plot_cache", "WARNING"):
+                assert store.get(A) is None
@@ -0,0 +1,148 @@
+import os
+import time
+
+from tests.flask_integration.base_test_case import FlaskTestCase, ViewTestCase
+from workers_control.core.injector import Binder, CallableProvider, Module
+from workers_control.flask.plot_rendering import (
+    PLOT_RENDERING_POOL_EXTENSION_KEY,
+    FlaskPlotRenderer,
+    PlotRenderingUnavailable,
+)
+from workers_control.flask.plotter import render_bar_plot
+
+from .dependency_injection import FlaskTestConfiguration
+
+PNG_MAGIC_BYTES = b"\x89PNG"
+
+
+def get_process_id() -> bytes:
+    return str(os.getpid()).encode()
+
+
+def get_process_id_slowly(seconds: float) -> bytes:
+    time.sleep(seconds)
+    return get_process_id()
+
+
+def crash_outside_of(process_id: int) -> bytes:
+    if os.getpid() != process_id:
+        os._exit(1)
+    return get_process_id()
+
+
+class RendererTestCase(FlaskTestCase):
+    processes: int = 0
+    timeout: float = 30
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.renderer = self.injector.get(FlaskPlotRenderer)
+        self.process_id = get_process_id()
+
+    def tearDown(self) -> None:
+        # Apps are shared between tests with the same configuration.
+        pool = self.app.extensions.pop(PLOT_RENDERING_POOL_EXTENSION_KEY, None)
+        if pool is not None:
+            pool.shutdown(cancel_futures=True)
+        super().tearDown()
+
+    def get_injection_modules(self) -> list[Module]:
+        processes = self.processes
+        timeout = self.timeout
+
+        class _Module(Module):
+            def configure(self, binder: Binder) -> None:
+                super().configure(binder)
+                binder[FlaskTestConfiguration] = CallableProvider(
+                    _Module.provide_flask_configuration
+                )
+
+            @staticmethod
+            def provide_flask_configuration() -> FlaskTestConfiguration:
+                configuration = FlaskTestConfiguration.default()
+                configuration["PLOT_RENDERING_PROCESSES"] = processes
+                configuration["PLOT_RENDERING_TIMEOUT"] = timeout
+                return configuration
+
+        modules = super().get_injection_modules()
+        modules.append(_Module())
+        return modules
+
+
+class RenderingInRequestThreadTests(RendererTestCase):
+    def test_that_plot_is_rendered_in_the_current_process(self) -> None:
+        assert self.renderer.render(get_process_id) == self.process_id
+
+    def test_that_no_pool_is_created(self) -> None:
+        self.renderer.render(get_process_id)
+        assert PLOT_RENDERING_POOL_EXTENSION_KEY not in self.app.extensions
+
+
+class NegativeNumberOfProcessesTests(RendererTestCase):
+    processes = -1
+
+    def test_that_negative_number_of_processes_is_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            self.renderer.render(get_process_id)
+
+
+class RenderingInProcessPoolTests(RendererTestCase):
+    processes = 1
+
+    def test_that_plot_is_rendered_in_another_process(self) -> None:
+        assert self.renderer.render(get_process_id) != self.process_id
+
+    def test_that_bar_plot_is_rendered_as_png(self) -> None:
+        png = self.renderer.render(
+            render_bar_plot,
+            ["a", "b"],
+            [1.0, 3.0],
+            ["red", "blue"],
+            (5, 4),
+            None,
+            False,
+        )
+        assert png.startswith(PNG_MAGIC_BYTES)
+
+    def test_that_plot_is_rendered_in_the_current_process_if_pool_broke(
+        self,
+    ) -> None:
+        assert self.renderer.render(crash_outside_of, os.getpid()) == self.process_id
+
+    def test_that_broken_pool_is_replaced(self) -> None:
+        self.renderer.render(crash_outside_of, os.getpid())
+        assert self.renderer.render(get_process_id) != self.process_id
+
+    def test_that_plot_is_rendered_in_the_current_process_if_pool_was_shut_down(
+        self,
+    ) -> None:
+        self.renderer.render(get_process_id)
+        self.app.extensions[PLOT_RENDERING_POOL_EXTENSION_KEY].shutdown()
+        assert self.renderer.render(get_process_id) == self.process_id
+
+    def test_that_pool_that_was_shut_down_is_replaced(self) -> None:
+        self.renderer.render(get_process_id)
+        self.app.extensions[PLOT_RENDERING_POOL_EXTENSION_KEY].shutdown()
+        self.renderer.render(get_process_id)
+        assert self.renderer.render(get_process_id) != self.process_id
+
+
+class RenderingTimeoutTests(RendererTestCase):
+    processes = 1
+    timeout = 0.01
+
+    def test_that_rendering_is_unavailable_after_timeout(self) -> None:
+        with self.assertRaises(PlotRenderingUnavailable):
+            self.renderer.render(get_process_id_slowly, 0.2)
+
+
+class PlotRoutesWithRenderingTimeoutTests(RendererTestCase, ViewTestCase):
+    processes = 1
+    timeout = 0
+
+    def test_that_plot_is_answered_with_503_after_timeout(self) -> None:
+        self.login_company()
+        response = self.client.get(
+            "/plots/global_barplot_for_plans?productive_plans=1&public_plans=2"
+        )
+        assert response.status_code == 503
@@ -1,8 +1,10 @@
+import json
 from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
 
 import matplotlib.dates as mdates
+import numpy as np
 from matplotlib.axes import Axes
 from matplotlib.backends.backend_agg import FigureCanvasAgg
 from matplotlib.colors import to_rgba
@@ -12,15 +14,21 @@ from parameterized import parameterized
 
 from tests.base_test_case import BaseTestCase
 from tests.datetime_service import datetime_utc
+from tests.web.plotting import FakeLinePlotConfiguration
 from workers_control.core.interactors.show_payout_factor_details import (
     BasicServiceConsumptionData,
     PlanData,
     Response,
 )
-from workers_control.flask.plotter import GeneralPlotter, PayoutFactorDetailsPlotter
+from workers_control.flask.plotter import (
+    GeneralPlotter,
+    PayoutFactorDetailsPlotter,
+    PlotFormat,
+)
 from workers_control.web.colors import HexColors
 
 PNG_MAGIC_BYTES = b"\x89PNG"
+SVG_ROOT_ELEMENT = b"<svg"
 
 
 class PlotterTestCase(BaseTestCase):
@@ -49,6 +57,7 @@ class GeneralPlotterTests(PlotterTestCase):
     def setUp(self) -> None:
         super().setUp()
         self.plotter = self.injector.get(GeneralPlotter)
+        self.line_plot_configuration = self.injector.get(FakeLinePlotConfiguration)
 
     def test_that_line_plot_is_rendered_as_png(self) -> None:
         png = self.plotter.create_line_plot(
@@ -57,6 +66,54 @@ class GeneralPlotterTests(PlotterTestCase):
         )
         assert png.startswith(PNG_MAGIC_BYTES)
 
+    def test_that_line_plot_is_rendered_as_svg(self) -> None:
+        svg = self.plotter.create_line_plot(
+            x=[datetime_utc(2026, 8, 4), datetime_utc(2026, 8, 6)],
+            y=[Decimal(1), Decimal(5)],
+            plot_format=PlotFormat.svg,
+        )
+        assert SVG_ROOT_ELEMENT in svg
+
+    def test_that_json_line_plot_has_dates_in_milliseconds_since_the_epoch(
+        self,
+    ) -> None:
+        data = json.loads(
+            self.plotter.create_line_plot(
+                x=[datetime_utc(2026, 8, 4), datetime_utc(2026, 8, 6)],
+                y=[Decimal(1), Decimal(5)],
+                plot_format=PlotFormat.json,
+            )
+        )
+        assert data["x"] == [
+            datetime_utc(2026, 8, 4).timestamp() * 1000,
+            datetime_utc(2026, 8, 6).timestamp() * 1000,
+        ]
+        assert data["y"] == [1, 5]
+
+    def test_that_json_line_plot_names_the_timezone_of_the_user(self) -> None:
+        self.timezone_configuration.set_timezone_of_current_user("Asia/Tokyo")
+        data = json.loads(
+            self.plotter.create_line_plot(
+                x=[datetime_utc(2026, 8, 4)],
+                y=[Decimal(1)],
+                plot_format=PlotFormat.json,
+            )
+        )
+        assert data["timezone"] == "Asia/Tokyo"
+
+    def test_that_json_line_plot_is_downsampled_to_the_point_budget(self) -> None:
+        self.line_plot_configuration.set_max_points_of_line_plot(10)
+        start = datetime_utc(2026, 1, 1)
+        data = json.loads(
+            self.plotter.create_line_plot(
+                x=[start + timedelta(hours=n) for n in range(100)],
+                y=[Decimal(n % 7) for n in range(100)],
+                plot_format=PlotFormat.json,
+            )
+        )
+        assert len(data["x"]) == 10
+        assert len(data["y"]) == 10
+
     def test_that_days_are_labelled_in_utc_for_a_user_in_utc(self) -> None:
         self.timezone_configuration.set_timezone_of_current_user("UTC")
         axes = self.render(self.create_two_day_figure())
@@ -90,6 +147,23 @@ class GeneralPlotterTests(PlotterTestCase):
         for tick in ticks:
             assert (tick.hour, tick.minute) == (0, 0)
 
+    def test_that_line_plot_draws_every_point_within_the_point_budget(self) -> None:
+        self.line_plot_configuration.set_max_points_of_line_plot(10)
+        figure = self.create_line_plot_figure(number_of_points=10)
+        assert len(self.get_plotted_x_data(figure)) == 10
+
+    def test_that_line_plot_is_downsampled_to_the_point_budget(self) -> None:
+        self.line_plot_configuration.set_max_points_of_line_plot(10)
+        figure = self.create_line_plot_figure(number_of_points=100)
+        assert len(self.get_plotted_x_data(figure)) == 10
+
+    def test_that_downsampled_line_plot_keeps_first_and_last_point(self) -> None:
+        self.line_plot_configuration.set_max_points_of_line_plot(10)
+        figure = self.create_line_plot_figure(number_of_points=100)
+        x_data = self.get_plotted_x_data(figure)
+        assert x_data[0] == datetime_utc(2026, 1, 1)
+        assert x_data[-1] == datetime_utc(2026, 1, 1) + timedelta(hours=99)
+
     def test_that_bar_plot_is_rendered_as_png(self) -> None:
         png = self.plotter.create_bar_plot(
             x_coordinates=["a", "b"],
@@ -100,6 +174,35 @@ class GeneralPlotterTests(PlotterTestCase):
         )
         assert png.startswith(PNG_MAGIC_BYTES)
 
+    def test_that_bar_plot_is_rendered_as_svg(self) -> None:
+        svg = self.plotter.create_bar_plot(
+            x_coordinates=["a", "b"],
+            height_of_bars=[Decimal(1), Decimal(3)],
+            colors_of_bars=["red", "blue"],
+            fig_size=(5, 4),
+            y_label="Amount",
+            plot_format=PlotFormat.svg,
+        )
+        assert SVG_ROOT_ELEMENT in svg
+
+    def test_that_json_bar_plot_contains_labels_heights_and_colors(self) -> None:
+        data = json.loads(
+            self.plotter.create_bar_plot(
+                x_coordinates=["a", "b"],
+                height_of_bars=[Decimal(1), Decimal("3.5")],
+                colors_of_bars=["red", "blue"],
+                fig_size=(5, 4),
+                y_label="Amount",
+                integer_y_ticks=True,
+                plot_format=PlotFormat.json,
+            )
+        )
+        assert data["labels"] == ["a", "b"]
+        assert data["heights"] == [1, 3.5]
+        assert data["colors"] == ["red", "blue"]
+        assert data["y_label"] == "Amount"
+        assert data["integer_y_ticks"]
+
     def test_that_bar_plot_y_axis_is_labelled_with_fractions_by_default(self) -> None:
         axes = self.render(self.create_bar_plot_figure(integer_y_ticks=False))
         assert any("." in label for label in self.get_y_tick_labels(axes))
@@ -125,6 +228,17 @@ class GeneralPlotterTests(PlotterTestCase):
             integer_y_ticks=integer_y_ticks,
         )
 
+    def get_plotted_x_data(self, figure: Figure) -> list[datetime]:
+        x_data = np.asarray(figure.axes[0].lines[-1].get_xdata())
+        return [mdates.num2date(x) for x in x_data]
+
+    def create_line_plot_figure(self, number_of_points: int) -> Figure:
+        start = datetime_utc(2026, 1, 1)
+        return self.plotter._create_line_plot_figure(
+            x=[start + timedelta(hours=n) for n in range(number_of_points)],
+            y=[Decimal(n % 7) for n in range(number_of_points)],
+        )
+
     def create_two_day_figure(self) -> Figure:
         # In Tokyo (UTC+9) both timestamps fall on the following day.
         return self.plotter._create_line_plot_figure(
@@ -155,6 +269,58 @@ class PayoutFactorDetailsPlotterTests(PlotterTestCase):
         png = self.plotter.plot(self.create_response())
         assert png.startswith(PNG_MAGIC_BYTES)
 
+    def test_that_plot_is_rendered_as_svg(self) -> None:
+        svg = self.plotter.plot(
+            self.create_response(plans=[self.create_plan()]), PlotFormat.svg
+        )
+        assert SVG_ROOT_ELEMENT in svg
+
+    def test_that_json_plot_contains_a_bar_per_plan_from_approval_to_expiration(
+        self,
+    ) -> None:
+        data = json.loads(
+            self.plotter.plot(
+                self.create_response(
+                    plans=[self.create_plan(), self.create_plan(is_public_service=True)]
+                ),
+                PlotFormat.json,
+            )
+        )
+        assert data["plans"] == [
+            {
+                "start": datetime_utc(2026, 7, 5).timestamp() * 1000,
+                "end": datetime_utc(2026, 9, 5).timestamp() * 1000,
+                "color": self.colors.primary,
+            },
+            {
+                "start": datetime_utc(2026, 7, 5).timestamp() * 1000,
+                "end": datetime_utc(2026, 9, 5).timestamp() * 1000,
+                "color": self.colors.warning,
+            },
+        ]
+
+    def test_that_json_plot_contains_the_dates_of_basic_service_consumptions(
+        self,
+    ) -> None:
+        data = json.loads(
+            self.plotter.plot(
+                self.create_response(
+                    basic_service_consumptions=[self.create_basic_service_consumption()]
+                ),
+                PlotFormat.json,
+            )
+        )
+        assert data["basic_services"] == [datetime_utc(2026, 8, 1).timestamp() * 1000]
+
+    def test_that_json_plot_contains_the_calculation_window(self) -> None:
+        response = self.create_response()
+        data = json.loads(self.plotter.plot(response, PlotFormat.json))
+        assert data["window"] == {
+            "start": response.window_start.timestamp() * 1000,
+            "end": response.window_end.timestamp() * 1000,
+        }
+        assert data["now"] == response.window_center.timestamp() * 1000
+
     @parameterized.expand([("UTC",), ("Asia/Tokyo",), ("America/New_York",)])
     def test_that_month_ticks_fall_on_the_first_of_the_month_in_the_users_timezone(
         self, timezone: str
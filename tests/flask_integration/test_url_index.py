@@ -69,6 +69,39 @@ class PlotUrlIndexTests(ViewTestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response.mimetype, "image/png")
 
+    @parameterized.expand(
+        [("png", "image/png"), ("svg", "image/svg+xml"), ("json", "application/json")]
+    )
+    def test_url_for_payout_factor_details_bar_plot_returns_requested_format(
+        self, plot_format: str, mimetype: str
+    ) -> None:
+        url = self.url_index.get_payout_factor_details_bar_plot_url()
+        response = self.client.get(f"{url}?format={plot_format}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, mimetype)
+
+    @parameterized.expand(
+        [("png", "image/png"), ("svg", "image/svg+xml"), ("json", "application/json")]
+    )
+    def test_url_for_barplot_for_plans_returns_requested_format(
+        self, plot_format: str, mimetype: str
+    ) -> None:
+        url = self.url_index.get_global_barplot_for_plans_url(
+            productive_plans=10, public_plans=5
+        )
+        response = self.client.get(f"{url}&format={plot_format}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, mimetype)
+
+    def test_url_for_barplot_for_plans_with_unknown_format_returns_400(
+        self,
+    ) -> None:
+        url = self.url_index.get_global_barplot_for_plans_url(
+            productive_plans=10, public_plans=5
+        )
+        response = self.client.get(f"{url}&format=gif")
+        self.assertEqual(response.status_code, 400)
+
 
 class GeneralUrlIndexTests(ViewTestCase):
     def setUp(self) -> None:
@@ -42,6 +42,7 @@ from workers_control.core.records import (
     SocialAccounting,
     Transfer,
 )
+from workers_control.core.repositories import CountStrategy
 from workers_control.core.transfers import TransferType
 
 Many = TypeVar("Many", bound=Hashable)
@@ -88,6 +89,9 @@ class QueryResultImpl(Generic[T]):
     def __len__(self) -> int:
         return len(list(self.items()))
 
+    def count(self, strategy: CountStrategy = CountStrategy.exact) -> int:
+        return len(self)
+
     def _filter_elements(self, condition: Callable[[T], bool]) -> Self:
         return replace(
             self,
@@ -1033,12 +1037,41 @@ class TransferResult(QueryResultImpl[records.Transfer]):
             database=self.database,
         )
 
+    def accumulated_volumes_of_account(
+        self, account: UUID
+    ) -> QueryResultImpl[Tuple[datetime, Decimal]]:
+        transfers = self.where_account_is_debtor_or_creditor(account).ordered_by_date()
+
+        def items() -> Iterable[Tuple[datetime, Decimal]]:
+            accumulated_volume = Decimal(0)
+            for transfer in transfers:
+                if transfer.debit_account == account:
+                    accumulated_volume -= transfer.value
+                else:
+                    accumulated_volume += transfer.value
+                yield transfer.date, accumulated_volume
+
+        return QueryResultImpl(
+            items=items,
+            database=self.database,
+        )
+
     def ordered_by_date(self, *, ascending: bool = True) -> Self:
-        def transfer_sorting_key(transfer: records.Transfer) -> datetime:
-            return transfer.date
+        def transfer_sorting_key(transfer: records.Transfer) -> Tuple[datetime, UUID]:
+            return transfer.date, transfer.id
 
         return self.sorted_by(key=transfer_sorting_key, reverse=not ascending)
 
+    def after(self, cursor: records.Cursor) -> Self:
+        return self._filter_elements(
+            lambda transfer: (transfer.date, transfer.id) > (cursor.date, cursor.id)
+        )
+
+    def before(self, cursor: records.Cursor) -> Self:
+        return self._filter_elements(
+            lambda transfer: (transfer.date, transfer.id) < (cursor.date, cursor.id)
+        )
+
 
 class PrivateConsumptionResult(QueryResultImpl[records.PrivateConsumption]):
     def with_id(self, id_: UUID) -> Self:
@@ -1147,6 +1180,22 @@ class PrivateConsumptionOfBasicServiceResult(
 
         return self.from_iterable(items=filtered_items)
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        return self._filter_elements(
+            lambda consumption: start
+            <= self.database.transfers[consumption.transfer_of_consumption].date
+            <= end
+        )
+
+    def get_total_value(self) -> Decimal:
+        return sum(
+            (
+                self.database.transfers[consumption.transfer_of_consumption].value
+                for consumption in self.items()
+            ),
+            Decimal(0),
+        )
+
     def joined_with_transfer(
         self,
     ) -> QueryResultImpl[
@@ -1206,6 +1255,22 @@ class ProductiveConsumptionOfBasicServiceResult(
 
         return self.from_iterable(items=filtered_items)
 
+    def that_were_made_between(self, start: datetime, end: datetime) -> Self:
+        return self._filter_elements(
+            lambda consumption: start
+            <= self.database.transfers[consumption.transfer_of_consumption].date
+            <= end
+        )
+
+    def get_total_value(self) -> Decimal:
+        return sum(
+            (
+                self.database.transfers[consumption.transfer_of_consumption].value
+                for consumption in self.items()
+            ),
+            Decimal(0),
+        )
+
     def joined_with_transfer(
         self,
     ) -> QueryResultImpl[
@@ -1441,6 +1506,21 @@ class AccountResult(QueryResultImpl[Account]):
 
         return QueryResultImpl(items=items, database=self.database)
 
+    def joined_with_last_transfer(
+        self,
+    ) -> QueryResultImpl[Tuple[Account, Optional[records.Cursor]]]:
+        def items() -> Iterable[Tuple[Account, Optional[records.Cursor]]]:
+            for account in self.items():
+                last_transfer: Optional[records.Cursor] = None
+                for transfer in self.database.transfers.values():
+                    if account.id in (transfer.debit_account, transfer.credit_account):
+                        last_transfer = records.Cursor(
+                            date=transfer.date, id=transfer.id
+                        )
+                yield account, last_transfer
+
+        return QueryResultImpl(items=items, database=self.database)
+
 
 class CompanyWorkInviteResult(QueryResultImpl[CompanyWorkInvite]):
     def issued_by(self, company: UUID) -> Self:
@@ -1868,8 +1948,8 @@ class AccountCredentialsUpdate:
 
 
 class BasicServiceResult(QueryResultImpl[BasicService]):
-    def with_id(self, id_: UUID) -> Self:
-        return self._filter_elements(lambda s: s.id == id_)
+    def with_id(self, *id_: UUID) -> Self:
+        return self._filter_elements(lambda s: s.id in id_)
 
     def of_provider(self, member: UUID) -> Self:
         return self._filter_elements(lambda s: s.provider == member)
@@ -1912,6 +1992,28 @@ class BasicServiceResult(QueryResultImpl[BasicService]):
         )
 
 
+class OfferResult(QueryResultImpl[records.Offer]):
+    def ordered_by_activation_date(self, *, ascending: bool = True) -> Self:
+        def activation_date(offer: records.Offer) -> datetime:
+            if offer.is_basic_service:
+                return self.database.basic_services[offer.id].created_on
+            approval_date = self.database.plans[offer.id].approval_date
+            assert approval_date
+            return approval_date
+
+        return self.sorted_by(key=activation_date, reverse=not ascending)
+
+    def ordered_by_provider_name(self, *, ascending: bool = True) -> Self:
+        def provider_name(offer: records.Offer) -> str:
+            if offer.is_basic_service:
+                provider = self.database.basic_services[offer.id].provider
+                return self.database.members[provider].name.lower()
+            planner = self.database.plans[offer.id].planner
+            return self.database.companies[planner].name.lower()
+
+        return self.sorted_by(key=provider_name, reverse=not ascending)
+
+
 @dataclass
 class BasicServiceUpdate:
     items: Callable[[], Iterable[BasicService]]
@@ -1940,6 +2042,8 @@ class EmailOutboxStatus:
     sent_at: Optional[datetime] = None
     retry_count: int = 0
     last_error: Optional[str] = None
+    claimed_until: Optional[datetime] = None
+    next_attempt_at: Optional[datetime] = None
 
 
 class EmailResult(QueryResultImpl[records.Email]):
@@ -1951,9 +2055,47 @@ class EmailResult(QueryResultImpl[records.Email]):
             lambda email: self.database.email_outbox_status[email.id].sent_at is None
         )
 
+    def that_are_due_at(self, timestamp: datetime) -> Self:
+        def is_due(email: records.Email) -> bool:
+            next_attempt_at = self.database.email_outbox_status[
+                email.id
+            ].next_attempt_at
+            return next_attempt_at is not None and next_attempt_at <= timestamp
+
+        return self._filter_elements(is_due)
+
+    def that_are_dead_letters(self) -> Self:
+        def is_dead_letter(email: records.Email) -> bool:
+            status = self.database.email_outbox_status[email.id]
+            return status.sent_at is None and status.next_attempt_at is None
+
+        return self._filter_elements(is_dead_letter)
+
+    def that_are_not_claimed_at(self, timestamp: datetime) -> Self:
+        def is_not_claimed(email: records.Email) -> bool:
+            claimed_until = self.database.email_outbox_status[email.id].claimed_until
+            return claimed_until is None or claimed_until <= timestamp
+
+        return self._filter_elements(is_not_claimed)
+
     def ordered_by_creation_date(self, ascending: bool = True) -> Self:
         return self.sorted_by(key=lambda email: email.created_at, reverse=not ascending)
 
+    def ordered_by_next_attempt(self) -> Self:
+        def next_attempt(email: records.Email) -> Tuple[datetime, datetime]:
+            next_attempt_at = self.database.email_outbox_status[
+                email.id
+            ].next_attempt_at
+            return (next_attempt_at or datetime.max, email.created_at)
+
+        return self.sorted_by(key=next_attempt)
+
+    def claim(self, *, until: datetime, limit: int) -> list[records.Email]:
+        claimed = list(self.limit(limit))
+        for email in claimed:
+            self.database.email_outbox_status[email.id].claimed_until = until
+        return claimed
+
     def update(self) -> EmailUpdate:
         return EmailUpdate(
             database=self.database,
@@ -1986,6 +2128,24 @@ class EmailUpdate:
 
         return self._add_update(update)
 
+    def release_claim(self) -> Self:
+        def update(status: EmailOutboxStatus) -> None:
+            status.claimed_until = None
+
+        return self._add_update(update)
+
+    def schedule_next_attempt(self, timestamp: datetime) -> Self:
+        def update(status: EmailOutboxStatus) -> None:
+            status.next_attempt_at = timestamp
+
+        return self._add_update(update)
+
+    def move_to_dead_letters(self) -> Self:
+        def update(status: EmailOutboxStatus) -> None:
+            status.next_attempt_at = None
+
+        return self._add_update(update)
+
     def perform(self) -> int:
         items_affected = 0
         for email in self.items():
@@ -2052,6 +2212,8 @@ class MockDatabase:
         self.registered_hours_worked: list[records.RegisteredHoursWorked] = list()
         self.plan_approvals: List[records.PlanApproval] = list()
         self.basic_services: Dict[UUID, BasicService] = dict()
+        # Changes whenever data relevant for the payout factor is created.
+        self.payout_factor_version: UUID = uuid4()
         self.indices = Indices()
         self.relationships = Relationships()
 
@@ -2534,6 +2696,7 @@ class MockDatabase:
         plan = self.get_plans().with_id(plan_id).first()
         assert plan
         plan.approval_date = record.date
+        self.payout_factor_version = uuid4()
         return record
 
     def get_plan_approvals(self) -> PlanApprovalResult:
@@ -2580,6 +2743,18 @@ class MockDatabase:
             items=self.basic_services.values,
         )
 
+    def get_offers(
+        self, plans: PlanResult, basic_services: Optional[BasicServiceResult]
+    ) -> OfferResult:
+        def items() -> Iterator[records.Offer]:
+            for plan in plans:
+                if plan.approval_date is not None:
+                    yield records.Offer(id=plan.id, is_basic_service=False)
+            for basic_service in basic_services or []:
+                yield records.Offer(id=basic_service.id, is_basic_service=True)
+
+        return OfferResult(database=self, items=items)
+
     def create_email(
         self, created_at: datetime, recipient: str, sender: str, subject: str, html: str
     ) -> records.Email:
@@ -2592,13 +2767,20 @@ class MockDatabase:
             html=html,
         )
         self.emails.append(record)
-        self.email_outbox_status[record.id] = EmailOutboxStatus()
+        self.email_outbox_status[record.id] = EmailOutboxStatus(
+            next_attempt_at=created_at
+        )
         return record
 
     def get_emails(self) -> EmailResult:
         return EmailResult(
             database=self,
-            items=lambda: list(self.emails),
+            items=lambda: [
+                replace(
+                    email, retry_count=self.email_outbox_status[email.id].retry_count
+                )
+                for email in self.emails
+            ],
         )
 
 
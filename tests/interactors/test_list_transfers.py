@@ -13,7 +13,7 @@ from workers_control.core.interactors.list_transfers import (
     Request,
     Response,
 )
-from workers_control.core.records import ProductionCosts, SocialAccounting
+from workers_control.core.records import Cursor, ProductionCosts, SocialAccounting
 from workers_control.core.transfers import TransferType
 
 
@@ -135,6 +135,147 @@ class LimitAndOffsetTests(TransferTestBase):
         assert len(response.transfers) == expected_results
 
 
+class CursorTests(TransferTestBase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.transfers = [
+            self.transfer_generator.create_transfer(
+                date=datetime_utc(2025, 1, day), value=Decimal(day)
+            )
+            for day in range(1, 6)
+        ]
+
+    def test_that_first_page_has_no_previous_page(self) -> None:
+        response = self.interactor.list_transfers(self.create_request(limit=2))
+        assert response.previous_page is None
+
+    def test_that_first_page_has_next_page_if_more_transfers_exist(self) -> None:
+        response = self.interactor.list_transfers(self.create_request(limit=2))
+        assert response.next_page == Cursor(
+            date=datetime_utc(2025, 1, 4), id=self.transfers[3].id
+        )
+
+    def test_that_single_page_has_no_next_page(self) -> None:
+        response = self.interactor.list_transfers(self.create_request(limit=5))
+        assert response.next_page is None
+
+    def test_that_following_pages_can_be_listed_with_cursors(self) -> None:
+        response = self.interactor.list_transfers(self.create_request(limit=2))
+        values = [t.value for t in response.transfers]
+        while response.next_page:
+            response = self.interactor.list_transfers(
+                Request(limit=2, offset=None, older_than=response.next_page)
+            )
+            values += [t.value for t in response.transfers]
+        assert values == [Decimal(day) for day in range(5, 0, -1)]
+
+    def test_that_preceding_page_can_be_listed_with_cursor(self) -> None:
+        second_page = self.interactor.list_transfers(
+            self.create_request(limit=2, offset=2)
+        )
+        assert second_page.previous_page
+        first_page = self.interactor.list_transfers(
+            Request(limit=2, offset=None, newer_than=second_page.previous_page)
+        )
+        assert [t.value for t in first_page.transfers] == [Decimal(5), Decimal(4)]
+        assert first_page.previous_page is None
+        assert first_page.next_page
+
+    def test_that_offset_is_ignored_when_cursor_is_given(self) -> None:
+        response = self.interactor.list_transfers(
+            Request(
+                limit=1,
+                offset=3,
+                older_than=Cursor(
+                    date=datetime_utc(2025, 1, 5), id=self.transfers[4].id
+                ),
+            )
+        )
+        assert [t.value for t in response.transfers] == [Decimal(4)]
+
+    def test_that_transfers_made_at_the_same_time_are_not_skipped(self) -> None:
+        for _ in range(3):
+            self.transfer_generator.create_transfer(
+                date=datetime_utc(2025, 2, 1), value=Decimal(0)
+            )
+        response = self.interactor.list_transfers(self.create_request(limit=1))
+        listed = 1
+        while response.next_page:
+            response = self.interactor.list_transfers(
+                Request(limit=1, offset=None, older_than=response.next_page)
+            )
+            listed += len(response.transfers)
+        assert listed == 8
+
+    def test_that_cursors_of_following_pages_are_returned_on_first_page(
+        self,
+    ) -> None:
+        response = self.interactor.list_transfers(
+            Request(limit=1, offset=None, neighbouring_pages=2)
+        )
+        assert response.preceding_pages == []
+        assert response.following_pages == [
+            self.cursor_of(5),
+            self.cursor_of(4),
+        ]
+
+    def test_that_cursors_of_neighbouring_pages_are_returned_on_middle_page(
+        self,
+    ) -> None:
+        response = self.interactor.list_transfers(
+            Request(limit=1, offset=2, neighbouring_pages=2)
+        )
+        assert response.preceding_pages == [self.cursor_of(3), self.cursor_of(4)]
+        assert response.following_pages == [self.cursor_of(3), self.cursor_of(2)]
+
+    def test_that_only_existing_pages_are_returned_on_last_page(self) -> None:
+        response = self.interactor.list_transfers(
+            Request(limit=1, offset=4, neighbouring_pages=2)
+        )
+        assert response.preceding_pages == [self.cursor_of(1), self.cursor_of(2)]
+        assert response.following_pages == []
+
+    def test_that_cursors_of_neighbouring_pages_are_returned_when_paging_backwards(
+        self,
+    ) -> None:
+        response = self.interactor.list_transfers(
+            Request(
+                limit=1,
+                offset=None,
+                newer_than=self.cursor_of(2),
+                neighbouring_pages=2,
+            )
+        )
+        assert [t.value for t in response.transfers] == [Decimal(3)]
+        assert response.preceding_pages == [self.cursor_of(3), self.cursor_of(4)]
+        assert response.following_pages == [self.cursor_of(3), self.cursor_of(2)]
+
+    def test_that_second_following_page_can_be_listed_with_its_cursor(
+        self,
+    ) -> None:
+        response = self.interactor.list_transfers(
+            Request(limit=2, offset=None, neighbouring_pages=2)
+        )
+        third_page = self.interactor.list_transfers(
+            Request(limit=2, offset=None, older_than=response.following_pages[1])
+        )
+        assert [t.value for t in third_page.transfers] == [Decimal(1)]
+
+    def test_that_second_preceding_page_can_be_listed_with_its_cursor(
+        self,
+    ) -> None:
+        response = self.interactor.list_transfers(
+            Request(limit=2, offset=4, neighbouring_pages=2)
+        )
+        first_page = self.interactor.list_transfers(
+            Request(limit=2, offset=None, newer_than=response.preceding_pages[1])
+        )
+        assert [t.value for t in first_page.transfers] == [Decimal(5), Decimal(4)]
+
+    def cursor_of(self, day: int) -> Cursor:
+        return Cursor(date=datetime_utc(2025, 1, day), id=self.transfers[day - 1].id)
+
+
 class ListTransfersOfApprovedProductivePlanTests(TransferTestBase):
     def test_that_three_transfers_are_returned_after_approval_of_plan(self) -> None:
         self.plan_generator.create_plan()
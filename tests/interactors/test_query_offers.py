@@ -508,12 +508,48 @@ class BasicServiceInteractorTests(BaseTestCase):
         response = self.interactor.execute(self._make_request())
         assert response.total_results == 1
 
+    def test_sort_by_activation_interleaves_plans_and_basic_services(self) -> None:
+        self.datetime_service.freeze_time(datetime_utc(2025, 1, 1))
+        older_plan = self.plan_generator.create_plan()
+        self.datetime_service.advance_time(timedelta(days=1))
+        basic_service = self.basic_service_generator.create_basic_service()
+        self.datetime_service.advance_time(timedelta(days=1))
+        newer_plan = self.plan_generator.create_plan()
+        response = self.interactor.execute(self._make_request())
+        assert [r.id for r in response.results] == [
+            newer_plan,
+            basic_service,
+            older_plan,
+        ]
+
+    def test_page_can_span_plans_and_basic_services(self) -> None:
+        self.datetime_service.freeze_time(datetime_utc(2025, 1, 1))
+        self.plan_generator.create_plan()
+        self.datetime_service.advance_time(timedelta(days=1))
+        basic_service = self.basic_service_generator.create_basic_service()
+        self.datetime_service.advance_time(timedelta(days=1))
+        plan = self.plan_generator.create_plan()
+        response = self.interactor.execute(self._make_request(offset=1, limit=1))
+        assert [r.id for r in response.results] == [basic_service]
+        response = self.interactor.execute(self._make_request(offset=0, limit=1))
+        assert [r.id for r in response.results] == [plan]
+
+    def test_total_results_is_independent_of_page(self) -> None:
+        self.plan_generator.create_plan()
+        self.basic_service_generator.create_basic_service()
+        self.basic_service_generator.create_basic_service()
+        response = self.interactor.execute(self._make_request(offset=1, limit=1))
+        assert response.total_results == 3
+        assert len(response.results) == 1
+
     def _make_request(
         self,
         query: str | None = None,
         filter_category: OfferFilter = OfferFilter.by_offer_name,
         sorting: OfferSorting = OfferSorting.by_activation,
         include_basic_services: bool = True,
+        offset: int | None = None,
+        limit: int | None = None,
     ) -> QueryOffersRequest:
         return QueryOffersRequest(
             query_string=query,
@@ -521,4 +557,6 @@ class BasicServiceInteractorTests(BaseTestCase):
             sorting_category=sorting,
             include_expired_plans=False,
             include_basic_services=include_basic_services,
+            offset=offset,
+            limit=limit,
         )
@@ -250,11 +250,11 @@ class InteractorTester(BaseTestCase):
 
     def test_that_plotting_info_is_empty_when_no_transfers_occurred(self) -> None:
         company = self.company_generator.create_company()
-        response = self.interactor.show_details(
+        plot_details = self.interactor.get_plot_details(
             self.create_interactor_request(company_id=company)
         )
-        assert not response.plot.timestamps
-        assert not response.plot.accumulated_volumes
+        assert not plot_details.timestamps
+        assert not plot_details.accumulated_volumes
 
     def test_that_plotting_info_is_generated_after_private_consumption(
         self,
@@ -262,11 +262,11 @@ class InteractorTester(BaseTestCase):
         planner = self.company_generator.create_company()
         plan = self.plan_generator.create_plan(planner=planner)
         self.consumption_generator.create_private_consumption(plan=plan)
-        response = self.interactor.show_details(
+        plot_details = self.interactor.get_plot_details(
             self.create_interactor_request(company_id=planner)
         )
-        assert response.plot.timestamps
-        assert response.plot.accumulated_volumes
+        assert plot_details.timestamps
+        assert plot_details.accumulated_volumes
 
     def test_that_correct_plotting_info_is_generated_after_one_plan_approval_and_two_private_consumptions(
         self,
@@ -284,17 +284,18 @@ class InteractorTester(BaseTestCase):
         self.consumption_generator.create_private_consumption(plan=plan, amount=1)
         transfer_2_timestamp = self.datetime_service.advance_time(timedelta(days=1))
         self.consumption_generator.create_private_consumption(plan=plan, amount=2)
-        response = self.interactor.show_details(
+        plot_details = self.interactor.get_plot_details(
             self.create_interactor_request(company_id=planner)
         )
-        assert len(response.plot.timestamps) == 5
-        assert len(response.plot.accumulated_volumes) == 5
-        assert transfer_1_timestamp in response.plot.timestamps
-        assert transfer_2_timestamp in response.plot.timestamps
-        assert response.plot.accumulated_volumes == [
-            Decimal(0),  # credit for p
-            Decimal(0),  # credit for r
-            Decimal(-1),  # credit for a (-1)
+        assert len(plot_details.timestamps) == 5
+        assert len(plot_details.accumulated_volumes) == 5
+        assert transfer_1_timestamp in plot_details.timestamps
+        assert transfer_2_timestamp in plot_details.timestamps
+        # The three credits of the plan approval are made at the same time
+        # and are ordered by their ids, so only the volume accumulated after
+        # all three of them is known.
+        assert plot_details.accumulated_volumes[2:] == [
+            Decimal(-1),  # credits for p, r and a (-1)
             Decimal(0),  # consumption (+1)
             Decimal(2),  # consumption (+2)
         ]
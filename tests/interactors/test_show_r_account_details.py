@@ -146,11 +146,11 @@ class RawMaterialAccountTransferTests(InteractorTestBase):
 
 class WorkAccountPlottingTests(InteractorTestBase):
     def test_that_plotting_info_is_empty_when_no_transfers_occurred(self) -> None:
-        response = self.interactor.show_details(
+        plot_details = self.interactor.get_plot_details(
             self.create_interactor_request(self.company.id)
         )
-        assert not response.plot.timestamps
-        assert not response.plot.accumulated_volumes
+        assert not plot_details.timestamps
+        assert not plot_details.accumulated_volumes
 
     def test_that_plotting_info_is_generated_after_transfer_took_place(
         self,
@@ -158,8 +158,8 @@ class WorkAccountPlottingTests(InteractorTestBase):
         self.transfer_generator.create_transfer(
             credit_account=self.raw_material_account
         )
-        response = self.interactor.show_details(
+        plot_details = self.interactor.get_plot_details(
             self.create_interactor_request(self.company.id)
         )
-        assert response.plot.timestamps
-        assert response.plot.accumulated_volumes
+        assert plot_details.timestamps
+        assert plot_details.accumulated_volumes
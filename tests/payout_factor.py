@@ -1,4 +1,9 @@
+from typing import Callable
+from uuid import UUID
+
+from tests.interactors.repositories import MockDatabase
 from workers_control.core.injector import singleton
+from workers_control.core.services.payout_factor import PayoutFactorInputs
 
 
 @singleton
@@ -11,3 +16,20 @@ class PayoutFactorConfigTestImpl:
 
     def set_window_length(self, days: int) -> None:
         self._window_length = days
+
+
+@singleton
+class PayoutFactorInputsCacheTestImpl:
+    def __init__(self, database: MockDatabase) -> None:
+        self._database = database
+        self._cached: tuple[UUID, PayoutFactorInputs] | None = None
+        self.load_count = 0
+
+    def get_or_load(self, load: Callable[[], PayoutFactorInputs]) -> PayoutFactorInputs:
+        version = self._database.payout_factor_version
+        if self._cached is not None and self._cached[0] == version:
+            return self._cached[1]
+        self.load_count += 1
+        inputs = load()
+        self._cached = (version, inputs)
+        return inputs
@@ -10,10 +10,7 @@ from workers_control.core.anonymization import ANONYMIZED_STR, ANONYMIZED_UUID
 from workers_control.core.records import SocialAccounting
 from workers_control.core.services.account_details import (
     AccountDetailsService,
-    AccountTransfer,
-    TransferParty,
     TransferPartyType,
-    construct_plot_data,
 )
 from workers_control.core.transfers import TransferType
 
@@ -411,59 +408,68 @@ class AccountBalanceTests(ServiceBase):
         assert self.service.get_account_balance(account) == Decimal(expected_balance)
 
 
+class LastTransferTests(ServiceBase):
+    def test_that_account_without_transfers_has_no_last_transfer(self) -> None:
+        account = self.create_company_product_account()
+        assert self.service.get_last_transfer(account) is None
+
+    def test_that_last_transfer_is_the_transfer_made_last(self) -> None:
+        account = self.create_company_product_account()
+        self.transfer_generator.create_transfer(credit_account=account)
+        transfer = self.transfer_generator.create_transfer(debit_account=account)
+        last_transfer = self.service.get_last_transfer(account)
+        assert last_transfer
+        assert last_transfer.id == transfer.id
+        assert last_transfer.date == transfer.date
+
+
 class PlotDataTests(ServiceBase):
-    def test_that_plotting_info_is_empty_when_empty_list_is_passed_in(self) -> None:
-        plot_data = construct_plot_data([])
+    def test_that_plotting_info_is_empty_when_no_transfers_took_place(self) -> None:
+        account = self.create_company_product_account()
+        plot_data = self.service.get_plot_details(account)
         assert not plot_data.accumulated_volumes
         assert not plot_data.timestamps
 
-    def test_that_timestamps_are_extracted_from_list_of_transfers_and_sorted_ascending(
-        self,
-    ) -> None:
+    def test_that_timestamps_of_transfers_are_sorted_ascending(self) -> None:
+        account = self.create_company_product_account()
         timestamps = [
             datetime_utc(2000, 1, 1),
             datetime_utc(1999, 1, 1),
             datetime_utc(2001, 1, 1),
         ]
-        transfers = [self.create_account_transfer(date=date) for date in timestamps]
-        plot_data = construct_plot_data(transfers)
+        for date in timestamps:
+            self.transfer_generator.create_transfer(date=date, credit_account=account)
+        plot_data = self.service.get_plot_details(account)
         assert plot_data.timestamps == sorted(timestamps)
 
-    def test_that_volumes_are_extracted_from_list_of_transfers_and_accumulated(
-        self,
-    ) -> None:
-        transfers = [self.create_account_transfer(volume=Decimal(1)) for _ in range(3)]
-        plot_data = construct_plot_data(transfers)
+    def test_that_volumes_of_transfers_are_accumulated(self) -> None:
+        account = self.create_company_product_account()
+        for _ in range(3):
+            self.transfer_generator.create_transfer(
+                credit_account=account, value=Decimal(1)
+            )
+        plot_data = self.service.get_plot_details(account)
         assert plot_data.accumulated_volumes == [Decimal(1), Decimal(2), Decimal(3)]
 
-    def test_that_volumes_are_extracted_from_list_of_transfers_in_ascending_order_by_date(
-        self,
-    ) -> None:
-        transfer1 = self.create_account_transfer(
-            date=datetime_utc(2000, 1, 1), volume=Decimal(10)
+    def test_that_volumes_are_accumulated_in_ascending_order_by_date(self) -> None:
+        account = self.create_company_product_account()
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2000, 1, 1), credit_account=account, value=Decimal(10)
         )
-        transfer2 = self.create_account_transfer(
-            date=datetime_utc(1999, 1, 1), volume=Decimal(-10)
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(1999, 1, 1), debit_account=account, value=Decimal(10)
         )
-        transfer3 = self.create_account_transfer(
-            date=datetime_utc(2001, 1, 1), volume=Decimal(10)
+        self.transfer_generator.create_transfer(
+            date=datetime_utc(2001, 1, 1), credit_account=account, value=Decimal(10)
         )
-        transfers = [transfer1, transfer2, transfer3]
-        plot_data = construct_plot_data(transfers)
+        plot_data = self.service.get_plot_details(account)
         assert plot_data.accumulated_volumes == [Decimal(-10), Decimal(0), Decimal(10)]
 
-    def create_account_transfer(
-        self, date: datetime = datetime(2025, 5, 1), volume: Decimal = Decimal(10)
-    ) -> AccountTransfer:
-        return AccountTransfer(
-            type=TransferType.credit_p,
-            date=date,
-            is_debit_transfer=False,
-            volume=volume,
-            transfer_party=TransferParty(
-                type=TransferPartyType.company,
-                id=uuid4(),
-                name="Some counter party name",
-            ),
-            debtor_equals_creditor=False,
+    def test_that_transfers_of_other_accounts_are_ignored(self) -> None:
+        account = self.create_company_product_account()
+        self.transfer_generator.create_transfer(value=Decimal(5))
+        self.transfer_generator.create_transfer(
+            credit_account=account, value=Decimal(1)
         )
+        plot_data = self.service.get_plot_details(account)
+        assert plot_data.accumulated_volumes == [Decimal(1)]
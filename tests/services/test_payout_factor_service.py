@@ -6,7 +6,10 @@ from decimal import Decimal
 from parameterized import parameterized
 
 from tests.base_test_case import BaseTestCase
-from tests.payout_factor import PayoutFactorConfigTestImpl
+from tests.payout_factor import (
+    PayoutFactorConfigTestImpl,
+    PayoutFactorInputsCacheTestImpl,
+)
 from workers_control.core.records import ProductionCosts
 from workers_control.core.services.payout_factor import PayoutFactorService
 
@@ -654,3 +657,70 @@ class CoverageTests(BaseTestCase):
             plan_expiration,
         )
         assert coverage == Decimal(0)
+
+
+class InputsCacheTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = self.injector.get(PayoutFactorService)
+        self.inputs_cache = self.injector.get(PayoutFactorInputsCacheTestImpl)
+        self.now = datetime(2025, 12, 1)
+        self.datetime_service.freeze_time(self.now)
+
+    def test_that_inputs_are_loaded_once_for_repeated_calculations(self) -> None:
+        self.plan_generator.create_plan(costs=DEFAULT_COSTS, is_public_service=True)
+        self.service.calculate_current_payout_factor()
+        self.service.calculate_current_payout_factor()
+        assert self.inputs_cache.load_count == 1
+
+    def test_that_inputs_are_reused_when_time_advances(self) -> None:
+        self.plan_generator.create_plan(costs=DEFAULT_COSTS, is_public_service=True)
+        self.service.calculate_current_payout_factor()
+        self.datetime_service.advance_time(timedelta(days=3))
+        self.service.calculate_current_payout_factor()
+        assert self.inputs_cache.load_count == 1
+
+    def test_that_plan_approval_after_calculation_is_considered(self) -> None:
+        self.plan_generator.create_plan(costs=DEFAULT_COSTS, is_public_service=True)
+        assert self.service.calculate_current_payout_factor() == Decimal(0)
+        self.plan_generator.create_plan(costs=HIGHER_COSTS, is_public_service=False)
+        assert self.service.calculate_current_payout_factor() > Decimal(0)
+
+    def test_that_bs_consumption_after_calculation_is_considered(self) -> None:
+        self.plan_generator.create_plan(costs=DEFAULT_COSTS, is_public_service=True)
+        pf_before = self.service.calculate_current_payout_factor()
+        self.consumption_generator.create_private_consumption_of_basic_service(
+            amount=Decimal(100)
+        )
+        assert self.service.calculate_current_payout_factor() > pf_before
+
+    def test_that_bs_consumption_does_not_reload_inputs(self) -> None:
+        self.plan_generator.create_plan(costs=DEFAULT_COSTS, is_public_service=True)
+        self.service.calculate_current_payout_factor()
+        self.consumption_generator.create_private_consumption_of_basic_service()
+        self.service.calculate_current_payout_factor()
+        assert self.inputs_cache.load_count == 1
+
+    def test_that_expired_plan_is_ignored_with_cached_inputs(self) -> None:
+        self.plan_generator.create_plan(
+            costs=DEFAULT_COSTS, is_public_service=True, timeframe=1
+        )
+        assert self.service.calculate_current_payout_factor() == Decimal(0)
+        window_size = self.payout_factor_config.get_window_length_in_days()
+        self.datetime_service.advance_time(timedelta(days=window_size))
+        assert self.service.calculate_current_payout_factor() == Decimal(1)
+        assert self.inputs_cache.load_count == 1
+
+    def test_that_calculation_is_correct_when_time_is_set_back(self) -> None:
+        window_size = self.payout_factor_config.get_window_length_in_days()
+        self.plan_generator.create_plan(
+            costs=DEFAULT_COSTS, is_public_service=True, timeframe=1
+        )
+        self.datetime_service.advance_time(timedelta(days=window_size))
+        assert self.service.calculate_current_payout_factor() == Decimal(1)
+        self.datetime_service.freeze_time(self.now)
+        assert self.service.calculate_current_payout_factor() == Decimal(0)
+
+    @property
+    def payout_factor_config(self) -> PayoutFactorConfigTestImpl:
+        return self.injector.get(PayoutFactorConfigTestImpl)
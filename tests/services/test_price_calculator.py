@@ -1,3 +1,4 @@
+from datetime import datetime, timedelta
 from decimal import Decimal
 from uuid import uuid4
 
@@ -146,9 +147,9 @@ class PriceCalculatorTests(BaseTestCase):
         self.cooperation_generator.create_cooperation(
             plans=[plan_1, plan_2, plan_3],
         )
-        price1 = self.service._calculate_cooperative_price(plan_1)
-        price2 = self.service._calculate_cooperative_price(plan_2)
-        price3 = self.service._calculate_cooperative_price(plan_3)
+        price1 = self.service.calculate_price(plan_1)
+        price2 = self.service.calculate_price(plan_2)
+        price3 = self.service.calculate_price(plan_3)
         assert price1 == price2 == price3 == expected_price
 
     @parameterized.expand(
@@ -179,6 +180,85 @@ class PriceCalculatorTests(BaseTestCase):
         self.cooperation_generator.create_cooperation(
             plans=[plan_1, plan_2],
         )
-        price1 = self.service._calculate_cooperative_price(plan_1)
-        price2 = self.service._calculate_cooperative_price(plan_2)
+        price1 = self.service.calculate_price(plan_1)
+        price2 = self.service.calculate_price(plan_2)
         assert price1 == price2 == expected_price
+
+
+class CalculatePricesTests(BaseTestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.service = self.injector.get(PriceCalculator)
+
+    def test_that_no_prices_are_returned_for_no_plans(self) -> None:
+        assert self.service.calculate_prices([]) == dict()
+
+    def test_that_price_of_nonexisting_plan_is_zero(self) -> None:
+        plan = uuid4()
+        assert self.service.calculate_prices([plan]) == {plan: Decimal(0)}
+
+    def test_that_prices_of_public_and_productive_plans_are_returned(self) -> None:
+        public_plan = self.plan_generator.create_plan(
+            is_public_service=True,
+            costs=ProductionCosts(Decimal(1), Decimal(1), Decimal(1)),
+        )
+        productive_plan = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(6), Decimal(0), Decimal(0)),
+            amount=2,
+        )
+        assert self.service.calculate_prices([public_plan, productive_plan]) == {
+            public_plan: Decimal(0),
+            productive_plan: Decimal(3),
+        }
+
+    def test_that_plans_of_different_cooperations_get_their_cooperative_prices(
+        self,
+    ) -> None:
+        plan_1 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(10), Decimal(0), Decimal(0)), amount=1
+        )
+        plan_2 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(20), Decimal(0), Decimal(0)), amount=1
+        )
+        plan_3 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(30), Decimal(0), Decimal(0)), amount=1
+        )
+        plan_4 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(50), Decimal(0), Decimal(0)), amount=1
+        )
+        self.cooperation_generator.create_cooperation(plans=[plan_1, plan_2])
+        self.cooperation_generator.create_cooperation(plans=[plan_3, plan_4])
+        prices = self.service.calculate_prices([plan_1, plan_2, plan_3, plan_4])
+        assert prices[plan_1] == prices[plan_2] == Decimal(15)
+        assert prices[plan_3] == prices[plan_4] == Decimal(40)
+
+    def test_that_cooperative_price_includes_plans_that_were_not_requested(
+        self,
+    ) -> None:
+        plan_1 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(10), Decimal(0), Decimal(0)), amount=1
+        )
+        plan_2 = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(20), Decimal(0), Decimal(0)), amount=1
+        )
+        self.cooperation_generator.create_cooperation(plans=[plan_1, plan_2])
+        assert self.service.calculate_prices([plan_1]) == {plan_1: Decimal(15)}
+
+    def test_that_expired_plans_do_not_count_towards_cooperative_price(
+        self,
+    ) -> None:
+        self.datetime_service.freeze_time(datetime(2025, 1, 1))
+        expired_plan = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(10), Decimal(0), Decimal(0)),
+            amount=1,
+            timeframe=1,
+        )
+        active_plan = self.plan_generator.create_plan(
+            costs=ProductionCosts(Decimal(20), Decimal(0), Decimal(0)),
+            amount=1,
+            timeframe=10,
+        )
+        self.cooperation_generator.create_cooperation(plans=[expired_plan, active_plan])
+        self.datetime_service.advance_time(timedelta(days=2))
+        prices = self.service.calculate_prices([expired_plan, active_plan])
+        assert prices[expired_plan] == prices[active_plan] == Decimal(20)
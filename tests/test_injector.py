@@ -0,0 +1,142 @@
+from dataclasses import dataclass
+from typing import Any, Dict, Optional, Type
+from unittest import TestCase
+
+from workers_control.core.injector import (
+    AliasProvider,
+    Binder,
+    CallableProvider,
+    ClassProvider,
+    Injector,
+    InstanceProvider,
+    Module,
+    Scope,
+    singleton,
+)
+
+
+class Dependency:
+    pass
+
+
+class OtherDependency(Dependency):
+    pass
+
+
+@dataclass
+class Service:
+    dependency: Dependency
+
+
+@singleton
+class SingletonService:
+    pass
+
+
+@dataclass
+class OtherService:
+    dependency: Dependency
+
+
+class FakeRequestScope:
+    def __init__(self) -> None:
+        self.instances: Optional[Dict[Type, Any]] = None
+
+    def start_request(self) -> None:
+        self.instances = dict()
+
+    def get_instances(self) -> Optional[Dict[Type, Any]]:
+        return self.instances
+
+
+class InjectorTests(TestCase):
+    def test_dependencies_are_created_for_every_instance(self) -> None:
+        injector = Injector([])
+        first = injector.get(Service)
+        second = injector.get(Service)
+        self.assertIsNot(first, second)
+        self.assertIsNot(first.dependency, second.dependency)
+
+    def test_singletons_are_created_once(self) -> None:
+        injector = Injector([])
+        self.assertIs(injector.get(SingletonService), injector.get(SingletonService))
+
+    def test_singletons_provided_by_callables_are_created_once(self) -> None:
+        class _Module(Module):
+            def configure(self, binder: Binder) -> None:
+                binder[Dependency] = CallableProvider(
+                    self.provide_dependency, is_singleton=True
+                )
+
+            @staticmethod
+            def provide_dependency() -> Dependency:
+                return Dependency()
+
+        injector = Injector([_Module()])
+        self.assertIs(injector.get(Service).dependency, injector.get(Dependency))
+
+    def test_factories_are_reused(self) -> None:
+        injector = Injector([])
+        self.assertIs(
+            injector.binder.get_factory(Service), injector.binder.get_factory(Service)
+        )
+
+    def test_changing_bindings_after_resolving_a_type_takes_effect(self) -> None:
+        injector = Injector([])
+        injector.get(Service)
+        injector.binder[Dependency] = AliasProvider(OtherDependency)
+        self.assertIsInstance(injector.get(Service).dependency, OtherDependency)
+
+    def test_instance_provider_provides_bound_instance(self) -> None:
+        dependency = Dependency()
+        injector = Injector([])
+        injector.binder.bind(Dependency, to=InstanceProvider(dependency))
+        self.assertIs(injector.get(Service).dependency, dependency)
+
+    def test_call_with_injection_injects_parameters_not_given_by_the_caller(
+        self,
+    ) -> None:
+        def f(value: int, dependency: Dependency) -> tuple[int, Dependency]:
+            return value, dependency
+
+        injector = Injector([])
+        value, dependency = injector.call_with_injection(f, args=[1])
+        self.assertEqual(value, 1)
+        self.assertIsInstance(dependency, Dependency)
+
+
+class RequestScopeTests(TestCase):
+    def setUp(self) -> None:
+        self.request_scope = FakeRequestScope()
+        self.injector = Injector([])
+        self.injector.binder.request_scope = self.request_scope
+        self.injector.binder[Dependency] = ClassProvider(
+            Dependency, scope=Scope.request
+        )
+
+    def test_instances_are_shared_within_a_request(self) -> None:
+        self.request_scope.start_request()
+        self.assertIs(
+            self.injector.get(Service).dependency,
+            self.injector.get(OtherService).dependency,
+        )
+
+    def test_instances_are_not_shared_between_requests(self) -> None:
+        self.request_scope.start_request()
+        first = self.injector.get(Dependency)
+        self.request_scope.start_request()
+        self.assertIsNot(first, self.injector.get(Dependency))
+
+    def test_instances_are_not_shared_outside_of_requests(self) -> None:
+        self.assertIsNot(self.injector.get(Dependency), self.injector.get(Dependency))
+
+    def test_callables_can_provide_request_scoped_instances(self) -> None:
+        self.injector.binder[Dependency] = CallableProvider(
+            provide_dependency, scope=Scope.request
+        )
+        self.request_scope.start_request()
+        self.assertIs(self.injector.get(Dependency), self.injector.get(Dependency))
+
+
+def provide_dependency() -> Dependency:
+    return Dependency()
@@ -0,0 +1,20 @@
+from typing import Any, Callable
+
+from workers_control.core.injector import singleton
+
+
+@singleton
+class FakeLinePlotConfiguration:
+    def __init__(self) -> None:
+        self._max_points: int = 2000
+
+    def get_max_points_of_line_plot(self) -> int:
+        return self._max_points
+
+    def set_max_points_of_line_plot(self, max_points: int) -> None:
+        self._max_points = max_points
+
+
+class FakePlotRenderer:
+    def render(self, function: Callable[..., bytes], *args: Any) -> bytes:
+        return function(*args)
@@ -1,7 +1,19 @@
+from datetime import datetime
+from uuid import uuid4
+
 from parameterized import parameterized
 
 from tests.base_test_case import BaseTestCase
-from workers_control.web.pagination import DEFAULT_PAGE_SIZE, PAGE_PARAMETER_NAME
+from tests.datetime_service import datetime_utc
+from workers_control.core.records import Cursor
+from workers_control.web.pagination import (
+    AFTER_PARAMETER_NAME,
+    BEFORE_PARAMETER_NAME,
+    DEFAULT_PAGE_SIZE,
+    PAGE_PARAMETER_NAME,
+    PAGE_WINDOW,
+    encode_cursor,
+)
 from workers_control.web.www.controllers.list_transfers_controller import (
     ListTransfersController,
 )
@@ -31,3 +43,42 @@ class ListTransfersControllerTests(BaseTestCase):
         expected_offset = (page - 1) * DEFAULT_PAGE_SIZE
         interactor_request = self.controller.create_interactor_request()
         assert interactor_request.offset == expected_offset
+
+    def test_that_pages_of_the_page_window_are_requested(self) -> None:
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.neighbouring_pages == PAGE_WINDOW
+
+    def test_that_no_cursors_are_requested_by_default(self) -> None:
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.older_than is None
+        assert interactor_request.newer_than is None
+
+    def test_that_after_token_is_requested_as_older_than_cursor(self) -> None:
+        cursor = Cursor(date=datetime_utc(2024, 5, 1, 10, 30), id=uuid4())
+        self.request.set_arg(AFTER_PARAMETER_NAME, encode_cursor(cursor))
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.older_than == cursor
+
+    def test_that_before_token_is_requested_as_newer_than_cursor(self) -> None:
+        cursor = Cursor(date=datetime_utc(2024, 5, 1, 10, 30), id=uuid4())
+        self.request.set_arg(BEFORE_PARAMETER_NAME, encode_cursor(cursor))
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.newer_than == cursor
+
+    @parameterized.expand(
+        [
+            ("",),
+            ("not a token",),
+            ("bm90IGEgY3Vyc29y",),
+        ]
+    )
+    def test_that_malformed_token_is_ignored(self, token: str) -> None:
+        self.request.set_arg(AFTER_PARAMETER_NAME, token)
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.older_than is None
+
+    def test_that_token_with_a_date_without_timezone_is_ignored(self) -> None:
+        cursor = Cursor(date=datetime(2024, 5, 1, 10, 30), id=uuid4())
+        self.request.set_arg(AFTER_PARAMETER_NAME, encode_cursor(cursor))
+        interactor_request = self.controller.create_interactor_request()
+        assert interactor_request.older_than is None
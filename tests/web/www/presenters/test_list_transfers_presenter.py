@@ -1,5 +1,6 @@
 from datetime import datetime
 from decimal import Decimal
+from urllib.parse import parse_qs, urlparse
 from uuid import UUID, uuid4
 
 from parameterized import parameterized
@@ -7,8 +8,16 @@ from parameterized import parameterized
 from tests.base_test_case import BaseTestCase
 from tests.datetime_service import datetime_utc
 from workers_control.core.interactors import list_transfers
+from workers_control.core.records import Cursor
 from workers_control.core.transfers import TransferType
-from workers_control.web.pagination import DEFAULT_PAGE_SIZE
+from workers_control.web.pagination import (
+    AFTER_PARAMETER_NAME,
+    BEFORE_PARAMETER_NAME,
+    DEFAULT_PAGE_SIZE,
+    PAGE_PARAMETER_NAME,
+    decode_cursor,
+    encode_cursor,
+)
 from workers_control.web.www.presenters.list_transfers_presenter import (
     ListTransfersPresenter,
 )
@@ -51,43 +60,164 @@ class ListTransfersPresenterBase(BaseTestCase):
         self,
         transfers: list[list_transfers.TransferEntry] | None = None,
         total_results: int = 10,
+        preceding_pages: list[Cursor] | None = None,
+        following_pages: list[Cursor] | None = None,
     ) -> list_transfers.Response:
         if transfers is None:
             transfers = []
+        if preceding_pages is None:
+            preceding_pages = []
+        if following_pages is None:
+            following_pages = []
         return list_transfers.Response(
             transfers=transfers,
             total_results=total_results,
+            previous_page=preceding_pages[0] if preceding_pages else None,
+            next_page=following_pages[0] if following_pages else None,
+            preceding_pages=preceding_pages,
+            following_pages=following_pages,
         )
 
+    def create_cursor(self) -> Cursor:
+        return Cursor(date=datetime_utc(2024, 1, 1, 12, 0), id=uuid4())
+
 
 class PaginationTests(ListTransfersPresenterBase):
-    @parameterized.expand(
-        [
-            (DEFAULT_PAGE_SIZE - 1, False),
-            (DEFAULT_PAGE_SIZE, False),
-            (DEFAULT_PAGE_SIZE + 1, True),
+    def test_pagination_is_not_visible_without_neighbouring_pages(self) -> None:
+        uc_response = self.create_interactor_response(total_results=100)
+        view_model = self.presenter.present(uc_response)
+        assert not view_model.pagination.is_visible
+
+    def test_pagination_is_visible_with_next_page_cursor(self) -> None:
+        uc_response = self.create_interactor_response(
+            total_results=1, following_pages=[self.create_cursor()]
+        )
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.is_visible
+
+    def test_that_next_link_is_shown_if_estimated_total_results_fit_on_one_page(
+        self,
+    ) -> None:
+        uc_response = self.create_interactor_response(
+            total_results=DEFAULT_PAGE_SIZE, following_pages=[self.create_cursor()]
+        )
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.next
+
+    def test_that_no_next_link_is_shown_without_next_page_cursor(self) -> None:
+        uc_response = self.create_interactor_response(
+            total_results=20 * DEFAULT_PAGE_SIZE
+        )
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.next is None
+
+    def test_that_no_previous_link_is_shown_without_previous_page_cursor(
+        self,
+    ) -> None:
+        uc_response = self.create_interactor_response(total_results=100)
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.previous is None
+
+    def test_that_next_link_carries_next_page_cursor(self) -> None:
+        cursor = self.create_cursor()
+        uc_response = self.create_interactor_response(
+            total_results=100, following_pages=[cursor]
+        )
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.next
+        query = parse_qs(urlparse(view_model.pagination.next).query)
+        assert query[PAGE_PARAMETER_NAME] == ["2"]
+        assert decode_cursor(query[AFTER_PARAMETER_NAME][0]) == cursor
+
+    def test_that_previous_link_carries_previous_page_cursor(self) -> None:
+        self.request.set_arg(PAGE_PARAMETER_NAME, 3)
+        cursor = self.create_cursor()
+        uc_response = self.create_interactor_response(
+            total_results=100, preceding_pages=[cursor]
+        )
+        view_model = self.presenter.present(uc_response)
+        assert view_model.pagination.previous
+        query = parse_qs(urlparse(view_model.pagination.previous).query)
+        assert query[PAGE_PARAMETER_NAME] == ["2"]
+        assert decode_cursor(query[BEFORE_PARAMETER_NAME][0]) == cursor
+
+    @parameterized.expand([(1,), (DEFAULT_PAGE_SIZE,), (20 * DEFAULT_PAGE_SIZE,)])
+    def test_that_found_neighbouring_pages_are_numbered_regardless_of_total_results(
+        self, total_results: int
+    ) -> None:
+        self.request.set_arg(PAGE_PARAMETER_NAME, 3)
+        uc_response = self.create_interactor_response(
+            total_results=total_results,
+            preceding_pages=[self.create_cursor(), self.create_cursor()],
+            following_pages=[self.create_cursor(), self.create_cursor()],
+        )
+        view_model = self.presenter.present(uc_response)
+        assert [page.label for page in view_model.pagination.pages] == [
+            "1",
+            "2",
+            "3",
+            "4",
+            "5",
         ]
-    )
-    def test_pagination_is_visible_if_total_results_is_greater_than_default_page_size(
-        self, total_results: int, is_visible: bool
+
+    def test_that_only_current_page_is_numbered_without_neighbouring_pages(
+        self,
     ) -> None:
-        uc_response = self.create_interactor_response(total_results=total_results)
+        uc_response = self.create_interactor_response(total_results=100)
         view_model = self.presenter.present(uc_response)
-        assert view_model.pagination.is_visible is is_visible
+        pages = view_model.pagination.pages
+        assert [page.label for page in pages] == ["1"]
+        assert pages[0].is_current
 
-    @parameterized.expand(
-        [
-            (DEFAULT_PAGE_SIZE - 1, 1),
-            (DEFAULT_PAGE_SIZE, 1),
-            (DEFAULT_PAGE_SIZE + 1, 2),
+    def test_that_following_pages_carry_their_cursors(self) -> None:
+        cursors = [self.create_cursor(), self.create_cursor()]
+        uc_response = self.create_interactor_response(following_pages=cursors)
+        view_model = self.presenter.present(uc_response)
+        queries = [
+            parse_qs(urlparse(page.href).query)
+            for page in view_model.pagination.pages[1:]
         ]
-    )
-    def test_number_of_pages_is_correct_based_on_total_results_and_page_size(
-        self, total_results: int, num_of_pages: int
+        assert [query[PAGE_PARAMETER_NAME] for query in queries] == [["2"], ["3"]]
+        assert [
+            decode_cursor(query[AFTER_PARAMETER_NAME][0]) for query in queries
+        ] == cursors
+
+    def test_that_preceding_pages_carry_their_cursors(self) -> None:
+        self.request.set_arg(PAGE_PARAMETER_NAME, 3)
+        cursors = [self.create_cursor(), self.create_cursor()]
+        uc_response = self.create_interactor_response(preceding_pages=cursors)
+        view_model = self.presenter.present(uc_response)
+        queries = [
+            parse_qs(urlparse(page.href).query)
+            for page in view_model.pagination.pages[:2]
+        ]
+        assert [query[PAGE_PARAMETER_NAME] for query in queries] == [["1"], ["2"]]
+        assert [
+            decode_cursor(query[BEFORE_PARAMETER_NAME][0]) for query in queries
+        ] == list(reversed(cursors))
+
+    def test_that_preceding_pages_before_the_first_page_are_not_numbered(
+        self,
     ) -> None:
-        uc_response = self.create_interactor_response(total_results=total_results)
+        self.request.set_arg(PAGE_PARAMETER_NAME, 2)
+        uc_response = self.create_interactor_response(
+            preceding_pages=[self.create_cursor(), self.create_cursor()]
+        )
+        view_model = self.presenter.present(uc_response)
+        assert [page.label for page in view_model.pagination.pages] == ["1", "2"]
+
+    def test_that_current_page_link_keeps_the_cursor_of_the_request(self) -> None:
+        cursor = self.create_cursor()
+        self.request.set_arg(PAGE_PARAMETER_NAME, 2)
+        self.request.set_arg(AFTER_PARAMETER_NAME, encode_cursor(cursor))
+        uc_response = self.create_interactor_response(
+            preceding_pages=[self.create_cursor()]
+        )
         view_model = self.presenter.present(uc_response)
-        assert len(view_model.pagination.pages) == num_of_pages
+        current_page = view_model.pagination.pages[-1]
+        assert current_page.is_current
+        query = parse_qs(urlparse(current_page.href).query)
+        assert decode_cursor(query[AFTER_PARAMETER_NAME][0]) == cursor
 
 
 class ShosResultsTests(ListTransfersPresenterBase):
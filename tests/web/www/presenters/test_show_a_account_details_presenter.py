@@ -8,7 +8,6 @@ from tests.base_test_case import BaseTestCase
 from workers_control.core.interactors import show_a_account_details
 from workers_control.core.services.account_details import (
     AccountTransfer,
-    PlotDetails,
     TransferParty,
     TransferPartyType,
 )
@@ -144,12 +143,7 @@ class ShowAAccountDetailsPresenterTests(BaseTestCase):
         company_id: UUID = uuid4(),
         transfers: list[AccountTransfer] | None = None,
         account_balance: Decimal = Decimal(0),
-        plot: PlotDetails | None = None,
     ) -> show_a_account_details.Response:
         if transfers is None:
             transfers = []
-        if plot is None:
-            plot = PlotDetails([], [])
-        return show_a_account_details.Response(
-            company_id, transfers, account_balance, plot
-        )
+        return show_a_account_details.Response(company_id, transfers, account_balance)
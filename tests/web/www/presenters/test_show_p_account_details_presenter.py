@@ -11,7 +11,6 @@ from workers_control.core.interactors.show_p_account_details import (
 )
 from workers_control.core.services.account_details import (
     AccountTransfer,
-    PlotDetails,
     TransferParty,
     TransferPartyType,
 )
@@ -147,15 +146,11 @@ class ShowPAccountDetailsPresenterTests(BaseTestCase):
         company_id: UUID = uuid4(),
         transfers: list[AccountTransfer] | None = None,
         account_balance: Decimal = Decimal(0),
-        plot: PlotDetails | None = None,
     ) -> Interactor.Response:
         if transfers is None:
             transfers = []
-        if plot is None:
-            plot = PlotDetails([], [])
         return Interactor.Response(
             company_id=company_id,
             transfers=transfers,
             account_balance=account_balance,
-            plot=plot,
         )
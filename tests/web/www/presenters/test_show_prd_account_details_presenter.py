@@ -265,15 +265,10 @@ class ShowPRDAccountDetailsPresenterTests(BaseTestCase):
         company_id: UUID = uuid4(),
         transfers: List[AccountTransfer] | None = None,
         account_balance: Decimal = Decimal(0),
-        plot: show_prd_account_details.PlotDetails | None = None,
     ) -> show_prd_account_details.Response:
         if transfers is None:
             transfers = []
-        if plot is None:
-            plot = show_prd_account_details.PlotDetails([], [])
-        return show_prd_account_details.Response(
-            company_id, transfers, account_balance, plot
-        )
+        return show_prd_account_details.Response(company_id, transfers, account_balance)
 
     def _get_transfer_info(
         self,
@@ -11,7 +11,6 @@ from tests.web.www.translator import FakeTranslator
 from workers_control.core.interactors import show_r_account_details
 from workers_control.core.services.account_details import (
     AccountTransfer,
-    PlotDetails,
     TransferParty,
     TransferPartyType,
 )
@@ -152,12 +151,7 @@ class ShowRAccountDetailsPresenterTests(BaseTestCase):
         company_id: UUID = uuid4(),
         transfers: List[show_r_account_details.AccountTransfer] | None = None,
         account_balance: Decimal = Decimal(0),
-        plot: PlotDetails | None = None,
     ) -> show_r_account_details.Response:
         if transfers is None:
             transfers = []
-        if plot is None:
-            plot = PlotDetails([], [])
-        return show_r_account_details.Response(
-            company_id, transfers, account_balance, plot
-        )
+        return show_r_account_details.Response(company_id, transfers, account_balance)